@@ -0,0 +1,141 @@
+"""Drive ``bibapp-server`` with concurrent keep-alive clients and report throughput and latency.
+
+    python -m benchmarks.api_load --size 100000 --clients 1 4 16 --requests 2000
+    python -m benchmarks.api_load --url http://127.0.0.1:8765 --clients 8     # an already running server
+
+Without ``--url`` a synthetic library is built and served from a subprocess (``--readers`` pooled
+connections). Each client thread sends a mix of searches, list pages, single entries, set pages and
+the occasional full BibTeX export; the server's own /metrics are printed after every run.
+"""
+from __future__ import annotations
+import argparse
+import http.client
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import quote, urlsplit
+
+from benchmarks.db_bench import build_library
+from benchmarks.synthetic import SURNAMES, WORDS
+from src.features.refsets_services.refsets_service import RefsetsService
+
+SET_NAME = "Load test"
+SET_SIZE = 2000
+MIX = [("search", 50), ("list", 20), ("get", 20), ("set_entries", 9), ("export", 1)]
+
+def _paths(n: int, max_id: int, seed: int) -> list[tuple[str, str]]:
+    rng = random.Random(seed)
+    ops = rng.choices([op for op, _ in MIX], [w for _, w in MIX], k=n)
+    paths = []
+    for op in ops:
+        if op == "search":
+            q = f"author:{rng.choice(SURNAMES)}" if rng.random() < 0.3 else " ".join(rng.sample(WORDS, rng.randint(1, 2)))
+            paths.append((op, f"/search?q={quote(q)}&limit=50"))
+        elif op == "list":
+            sort = rng.choice(["", "&sort=title", "&sort=year&desc=1"])
+            paths.append((op, f"/entries?offset={rng.randrange(0, 5000, 50)}&limit=50{sort}"))
+        elif op == "get":
+            paths.append((op, f"/entries/{rng.randint(1, max_id)}"))
+        elif op == "set_entries":
+            paths.append((op, f"/sets/{quote(SET_NAME)}/entries?offset={rng.randrange(0, SET_SIZE, 100)}&limit=100"))
+        else:
+            paths.append((op, f"/sets/{quote(SET_NAME)}/export.bib"))
+    return paths
+
+def _client(host: str, port: int, paths: list[tuple[str, str]], out: list, lock: threading.Lock):
+    conn = http.client.HTTPConnection(host, port, timeout=60)
+    local = []
+    for op, path in paths:
+        start = time.perf_counter()
+        conn.request("GET", path)
+        response = conn.getresponse()
+        size = len(response.read())
+        local.append((op, response.status, size, (time.perf_counter() - start) * 1000))
+    conn.close()
+    with lock:
+        out.extend(local)
+
+def run(host: str, port: int, clients: int, paths: list[tuple[str, str]]) -> dict:
+    results: list = []
+    lock = threading.Lock()
+    threads = [threading.Thread(target=_client, args=(host, port, paths[c::clients], results, lock)) for c in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    seconds = time.perf_counter() - start
+    ops = {}
+    for op in sorted({r[0] for r in results}):
+        ordered = sorted(r[3] for r in results if r[0] == op)
+        ops[op] = {"n": len(ordered), "p50_ms": round(statistics.median(ordered), 2),
+                   "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2)}
+    return {
+        "benchmark": "api_load", "clients": clients, "requests": len(results), "seconds": round(seconds, 3),
+        "per_s": round(len(results) / seconds), "errors": sum(r[1] >= 400 for r in results),
+        "mb": round(sum(r[2] for r in results) / 1e6, 2), "ops": ops,
+    }
+
+def _server_metrics(host: str, port: int) -> dict:
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    conn.request("GET", "/metrics")
+    metrics = json.loads(conn.getresponse().read())
+    conn.close()
+    return metrics
+
+def _spawn(path: str, readers: int) -> tuple[subprocess.Popen, str, int]:
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "src.main.server", "--db", path, "--port", "0", "--readers", str(readers)],
+        stdout=subprocess.PIPE, text=True,
+    )
+    line = proc.stdout.readline()
+    if not line.startswith("listening on"):
+        proc.kill()
+        raise RuntimeError("server did not start")
+    url = urlsplit(line.split()[-1])
+    return proc, url.hostname, url.port
+
+def _library(path: str, size: int, seed: int) -> int:
+    db = build_library(path, size, seed)
+    refsets = RefsetsService(db)
+    refsets.add_entries(refsets.create(SET_NAME), range(1, min(size, SET_SIZE) + 1))
+    db.close()
+    return size
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="benchmark a running server instead of spawning one")
+    parser.add_argument("--size", type=int, default=100_000, help="synthetic library size when spawning")
+    parser.add_argument("--readers", type=int, default=4, help="reader pool of the spawned server")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=2000, help="requests per run, split across the clients")
+    parser.add_argument("--max-id", type=int, help="highest entry id for /entries/<id> (default: --size)")
+    parser.add_argument("--seed", type=int, default=201)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        proc = None
+        if args.url:
+            url = urlsplit(args.url)
+            host, port = url.hostname, url.port
+        else:
+            _library(os.path.join(tmp, "library.db"), args.size, args.seed)
+            proc, host, port = _spawn(os.path.join(tmp, "library.db"), args.readers)
+        try:
+            paths = _paths(args.requests, args.max_id or args.size, args.seed)
+            for clients in args.clients:
+                print(json.dumps(run(host, port, clients, paths)))
+            print(json.dumps({"benchmark": "api_load", "server": _server_metrics(host, port)}))
+        finally:
+            if proc is not None:
+                proc.terminate()
+                proc.wait()
+
+if __name__ == "__main__":
+    main()
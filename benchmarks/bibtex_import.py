@@ -0,0 +1,46 @@
+"""Benchmark BibTeX parsing and import on a generated corpus.
+
+    python -m benchmarks.bibtex_import --records 50000
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import write_bibtex_corpus
+from src.features.bibtex.parser import import_bibtex_path, parse_bibtex
+from src.features.database.db import BibliographyDB
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=50_000)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bib_path = os.path.join(tmp, "corpus.bib")
+        with open(bib_path, "w", encoding="utf-8") as f:
+            write_bibtex_corpus(f, args.records)
+        size_mb = os.path.getsize(bib_path) / 1e6
+
+        start = time.perf_counter()
+        with open(bib_path, encoding="utf-8") as f:
+            parsed = sum(1 for _ in parse_bibtex(f))
+        parse_s = time.perf_counter() - start
+
+        db = BibliographyDB(os.path.join(tmp, "bench.db"))
+        start = time.perf_counter()
+        results = import_bibtex_path(db, bib_path)
+        import_s = time.perf_counter() - start
+        db.close()
+
+    inserted = sum(1 for status, _ in results if status == "inserted")
+    for name, seconds, count in [("bibtex_parse", parse_s, parsed), ("bibtex_import", import_s, inserted)]:
+        print(json.dumps({
+            "benchmark": name, "records": count, "corpus_mb": round(size_mb, 2),
+            "seconds": round(seconds, 3), "records_per_s": round(count / seconds) if seconds else None,
+        }))
+
+if __name__ == "__main__":
+    main()
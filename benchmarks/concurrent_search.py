@@ -0,0 +1,89 @@
+"""Throughput of concurrent searches sharing one BibliographyDB, with and without the reader pool.
+
+    python -m benchmarks.concurrent_search --size 100000 --threads 1 2 4 8
+
+For each thread count the library is reopened with ``readers=threads`` (pooled) and ``readers=0``
+(every query on the single writer connection); each thread runs uncached quick and advanced searches
+through the services, fetching the first page of rows. Reports queries/s and median/p95 latency.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+from benchmarks.db_bench import build_library
+from benchmarks.synthetic import SURNAMES, WORDS
+from src.features.database.db import BibliographyDB
+from src.features.entries_services.entries_service import EntriesService
+from src.features.search import SearchService
+
+def _queries(n: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    queries = []
+    for i in range(n):
+        if i % 3 == 2:
+            queries.append(f"author:{rng.choice(SURNAMES)} {rng.choice(WORDS)}")
+        else:
+            queries.append(" ".join(rng.sample(WORDS, rng.randint(1, 2))))
+    return queries
+
+def run(path: str, threads: int, readers: int, queries: list[str], page: int) -> dict:
+    db = BibliographyDB(path, readers=readers)
+    entries = EntriesService(db)
+    # max_results=0 keeps nothing cached, so every call goes to SQLite.
+    search = SearchService(db, max_results=0)
+    latencies: list[float] = []
+    lock = threading.Lock()
+
+    def worker(chunk: list[str]):
+        local = []
+        for i, q in enumerate(chunk):
+            start = time.perf_counter()
+            if i % 2:
+                search.page(q, limit=page)
+            else:
+                entries.search(q, limit=page)
+            local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=worker, args=(queries[t::threads],)) for t in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    seconds = time.perf_counter() - start
+    opened = db.pool.opened if db.pool else 0
+    db.close()
+    ordered = sorted(latencies)
+    return {
+        "benchmark": "concurrent_search", "threads": threads, "readers": readers, "opened": opened,
+        "queries": len(ordered), "seconds": round(seconds, 3), "per_s": round(len(ordered) / seconds),
+        "median_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+    }
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--queries", type=int, default=800, help="searches per run, split across the threads")
+    parser.add_argument("--page", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=201)
+    args = parser.parse_args(argv)
+    queries = _queries(args.queries, args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "library.db")
+        build_library(path, args.size, args.seed).close()
+        for threads in args.threads:
+            for readers in (threads, 0):
+                print(json.dumps(run(path, threads, readers, queries, args.page)))
+
+if __name__ == "__main__":
+    main()
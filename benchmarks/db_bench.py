@@ -0,0 +1,168 @@
+"""Time the database operations behind the GUI on synthetic libraries of realistic size.
+
+    python -m benchmarks.db_bench --sizes 10000 100000 1000000 -o bench.json
+    python -m benchmarks.db_bench compare before.json after.json
+
+Each library is generated once per size (bulk profile, skewed authors/titles/tags, created_at
+spread over five years); every operation is then repeated and reported as median/p95 latency.
+"""
+from __future__ import annotations
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable
+
+from benchmarks.synthetic import SURNAMES, created_timestamps, generate_entries
+from src.features.bibtex.export import export_set
+from src.features.database.db import BibliographyDB
+from src.features.database.operation import entry_ops
+from src.features.entries_services.entries_service import EntriesService
+from src.features.refsets_services.refsets_service import RefsetsService
+from src.features.search import SearchService
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+def build_library(path: str, size: int, seed: int = 201) -> BibliographyDB:
+    db = BibliographyDB(path, profile="bulk")
+    results = EntriesService(db).add_many(generate_entries(size, seed))
+    ids = [eid for status, eid in results if status == "inserted"]
+    with db.transaction():
+        db.conn.executemany("UPDATE entries SET created_at = ? WHERE id = ?", zip(created_timestamps(len(ids), seed), ids))
+    db.conn.execute("ANALYZE")
+    db.conn.commit()
+    return db
+
+def _timed(fn: Callable[[], object], repeat: int) -> tuple[list[float], int]:
+    samples, rows = [], 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+        rows = len(result) if isinstance(result, list) else 0
+    return samples, rows
+
+def _summary(size: int, op: str, samples: list[float], rows: int) -> dict:
+    ordered = sorted(samples)
+    return {
+        "size": size, "op": op, "n": len(samples), "rows": rows,
+        "median_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "total_ms": round(sum(ordered), 3),
+    }
+
+def run_size(size: int, tmp: str, repeat: int, seed: int) -> list[dict]:
+    start = time.perf_counter()
+    db = build_library(os.path.join(tmp, f"lib_{size}.db"), size, seed)
+    results = [{"size": size, "op": "build_library", "n": 1, "rows": size,
+                "total_ms": round((time.perf_counter() - start) * 1000, 1)}]
+    entries, refsets = EntriesService(db), RefsetsService(db)
+    rng = random.Random(seed)
+    sample = db.conn.execute("SELECT id, authors, title, publication_date FROM entries ORDER BY random() LIMIT ?",
+                             (max(repeat, 1),)).fetchall()
+
+    def record(op: str, fn: Callable[[], object], n: int = repeat):
+        samples, rows = _timed(fn, n)
+        results.append(_summary(size, op, samples, rows))
+
+    fresh = iter(generate_entries(repeat, seed + 1))
+    record("add_entry", lambda: entries.add(**{**next(fresh), "title": f"Fresh {rng.random()}"}))
+
+    hits = iter(sample * 2)
+    record("find_duplicate_id_hit", lambda: entry_ops.find_duplicate_id(db, *next(hits)[1:]))
+    record("find_duplicate_id_miss", lambda: entry_ops.find_duplicate_id(db, "Nobody", f"Missing {rng.random()}", None))
+
+    record("list_first_page", lambda: entries.list(limit=200))
+    record("list_all", lambda: entries.list(), n=max(1, repeat // 10))
+
+    surname = SURNAMES[3].lower()
+    search = SearchService(db)
+    # The quick-search forms BibliographyApp.on_search accepts: cold (cache cleared) and repeated.
+    search_forms = {
+        "search_tag": "tag:ml",
+        "search_author": f"author:{surname}",
+        "search_created": "created:2023-05",
+        "search_pub": "pub:2021-03",
+        "search_year": "2019",
+        "search_text": "graph learning",
+    }
+    for op, query in search_forms.items():
+        record(op, lambda: (search.clear(), search.page(query, 0, 200)[0])[1], n=max(1, repeat // 5))
+        record(f"{op}_cached", lambda: search.page(query, 0, 200)[0], n=max(1, repeat // 5))
+
+    set_id = refsets.create("bench")
+    member_ids = [r[0] for r in db.conn.execute("SELECT id FROM entries ORDER BY random() LIMIT ?",
+                                                (min(10_000, size // 10),))]
+    refsets.add_entries(set_id, member_ids)
+    record("list_entries_in_set", lambda: refsets.list_entries(set_id), n=max(1, repeat // 5))
+
+    targets = iter(sample * 2)
+    record("update_entry", lambda: entries.update(next(targets)[0], venue=f"Venue {rng.random()}"))
+
+    record("export_set_bibtex", lambda: export_set(db, set_id, io.StringIO()), n=max(1, repeat // 20))
+    db.close()
+    return results
+
+def _git_revision() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(before_path: str, after_path: str):
+    with open(before_path) as f:
+        before = {(r["size"], r["op"]): r for r in json.load(f)["results"]}
+    with open(after_path) as f:
+        after = json.load(f)["results"]
+    print(f"{'size':>8}  {'op':<24}{'before':>11}{'after':>11}{'ratio':>8}")
+    for r in after:
+        old = before.get((r["size"], r["op"]))
+        metric = "median_ms" if "median_ms" in r else "total_ms"
+        if old is None or not old.get(metric):
+            continue
+        ratio = r[metric] / old[metric]
+        flag = "  <-- slower" if ratio > 1.2 else ""
+        print(f"{r['size']:>8}  {r['op']:<24}{old[metric]:>11.3f}{r[metric]:>11.3f}{ratio:>8.2f}{flag}")
+
+def main(argv: list[str] | None = None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["compare"]:
+        parser = argparse.ArgumentParser(prog="db_bench compare")
+        parser.add_argument("before")
+        parser.add_argument("after")
+        args = parser.parse_args(argv[1:])
+        compare(args.before, args.after)
+        return
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=201)
+    parser.add_argument("-o", "--output", help="write the JSON report here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    report = {
+        "revision": _git_revision(), "python": platform.python_version(), "sqlite": sqlite3.sqlite_version,
+        "repeat": args.repeat, "seed": args.seed, "results": [],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            report["results"] += run_size(size, tmp, args.repeat, args.seed)
+            print(f"size {size}: done", file=sys.stderr)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Compare insert and search throughput under each BibliographyDB profile.
+
+    python -m benchmarks.db_profiles --entries 2000 --bulk-entries 50000
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import generate_entries
+from src.features.database.db import PROFILES, BibliographyDB
+from src.features.entries_services.entries_service import EntriesService
+
+SEARCHES = ["learning", "graph neural", "smith", "data*", "privacy federated"]
+
+def run_profile(name: str, tmp: str, entries: int, bulk_entries: int, searches: int) -> list[dict]:
+    db = BibliographyDB(os.path.join(tmp, f"{name}.db"), profile=name)
+    service = EntriesService(db)
+    results = []
+
+    start = time.perf_counter()
+    for entry in generate_entries(entries, seed=1):
+        service.add(**entry)
+    seconds = time.perf_counter() - start
+    results.append({"op": "add_entry", "count": entries, "seconds": seconds})
+
+    start = time.perf_counter()
+    service.add_many(generate_entries(bulk_entries, seed=2))
+    seconds = time.perf_counter() - start
+    results.append({"op": "add_many", "count": bulk_entries, "seconds": seconds})
+
+    start = time.perf_counter()
+    for i in range(searches):
+        service.search(SEARCHES[i % len(SEARCHES)], limit=200)
+    seconds = time.perf_counter() - start
+    results.append({"op": "search", "count": searches, "seconds": seconds})
+
+    db.close()
+    for r in results:
+        r.update(benchmark="db_profiles", profile=name, seconds=round(r["seconds"], 4),
+                 per_s=round(r["count"] / r["seconds"]) if r["seconds"] else None)
+    return results
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=2000, help="rows inserted one add_entry (one commit) at a time")
+    parser.add_argument("--bulk-entries", type=int, default=50_000, help="rows inserted through add_many")
+    parser.add_argument("--searches", type=int, default=500)
+    parser.add_argument("--profiles", nargs="*", default=list(PROFILES))
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in args.profiles:
+            for result in run_profile(name, tmp, args.entries, args.bulk_entries, args.searches):
+                print(json.dumps(result))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+from __future__ import annotations
+import random
+from datetime import datetime, timedelta
+from typing import Iterator, TextIO
+
+from src.features.bibtex.bibtex import entry_to_bibtex
+
+SURNAMES = [
+    "Smith", "Wang", "Zhang", "Li", "Kim", "Müller", "Garcia", "Nguyen", "Chen", "Johnson",
+    "Brown", "Liu", "Singh", "Kumar", "Yamamoto", "Rossi", "Silva", "Ivanov", "Novak", "Dubois",
+    "Okafor", "Hansen", "Kowalski", "Sato", "Lopez", "Martin", "Jensen", "O'Brien", "Schmidt", "Patel",
+]
+WORDS = [
+    "learning", "deep", "neural", "networks", "graph", "analysis", "efficient", "robust", "model",
+    "models", "data", "towards", "via", "approach", "optimization", "bayesian", "inference", "large",
+    "scale", "language", "vision", "transformers", "attention", "reinforcement", "policy", "sparse",
+    "representation", "adaptive", "distributed", "systems", "query", "database", "index", "search",
+    "retrieval", "embedding", "contrastive", "self-supervised", "federated", "privacy", "causal",
+    "generative", "diffusion", "benchmark", "evaluation", "survey", "theory", "algorithms", "fast",
+]
+VENUES = [
+    "NeurIPS", "ICML", "ICLR", "ACL", "EMNLP", "CVPR", "SIGMOD", "VLDB", "KDD", "WWW",
+    "Journal of Machine Learning Research", "Nature", "Communications of the ACM", None,
+]
+TAGS = ["ml", "nlp", "cv", "db", "theory", "survey", "rl", "systems", "ir", "privacy", "graphs", "to-read"]
+
+def _zipf_choice(rng: random.Random, items: list, s: float = 1.1):
+    # Cheap Zipf-like pick: low ranks are much more likely, the tail is still reachable.
+    idx = int(len(items) * (rng.random() ** (1 + s)))
+    return items[min(idx, len(items) - 1)]
+
+def generate_entries(n: int, seed: int = 201) -> Iterator[dict]:
+    """Yield ``n`` synthetic entry dicts with skewed author, word, venue and tag distributions."""
+    rng = random.Random(seed)
+    for i in range(n):
+        authors = " and ".join(
+            f"{_zipf_choice(rng, SURNAMES)}, {chr(65 + rng.randrange(26))}."
+            for _ in range(1 + int(rng.random() ** 2 * 6))
+        )
+        words = [_zipf_choice(rng, WORDS) for _ in range(rng.randint(3, 10))]
+        title = " ".join(words).capitalize() + f" {i}"
+        year = rng.randint(1990, 2025)
+        precision = rng.random()
+        if precision < 0.4:
+            pub = str(year)
+        elif precision < 0.7:
+            pub = f"{year}-{rng.randint(1, 12):02d}"
+        else:
+            pub = f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        tags = sorted({_zipf_choice(rng, TAGS) for _ in range(rng.randint(0, 3))})
+        first_page = rng.randint(1, 900)
+        yield {
+            "authors": authors,
+            "title": title,
+            "venue": _zipf_choice(rng, VENUES),
+            "year": year,
+            "publication_date": pub,
+            "volume": rng.randint(1, 60) if rng.random() < 0.6 else None,
+            "number": rng.randint(1, 12) if rng.random() < 0.4 else None,
+            "pages": f"{first_page}-{first_page + rng.randint(5, 30)}",
+            "doi": f"10.{rng.randint(1000, 9999)}/{i:08d}" if rng.random() < 0.7 else None,
+            "url": f"https://example.org/papers/{i}" if rng.random() < 0.3 else None,
+            "tags": ", ".join(tags) or None,
+        }
+
+def created_timestamps(n: int, seed: int = 201) -> list[str]:
+    """Spread ``n`` created_at values over the last five years, oldest first."""
+    rng = random.Random(seed)
+    start = datetime(2021, 1, 1)
+    offsets = sorted(rng.randrange(5 * 365 * 24 * 3600) for _ in range(n))
+    return [(start + timedelta(seconds=s)).isoformat() for s in offsets]
+
+def write_bibtex_corpus(fileobj: TextIO, n: int, seed: int = 201) -> int:
+    fileobj.write('@comment{ synthetic corpus }\n@string{ jmlr = "Journal of Machine Learning Research" }\n\n')
+    for i, entry in enumerate(generate_entries(n, seed)):
+        bib = entry_to_bibtex(entry, bibkey=f"entry{i}")
+        if entry["venue"] == "Journal of Machine Learning Research":
+            bib = bib.replace("journal = {Journal of Machine Learning Research}", "journal = jmlr")
+        fileobj.write(bib + "\n\n")
+    return n
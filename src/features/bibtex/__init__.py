@@ -1,4 +1,17 @@
-# src/features/bibtex/__init__.py
-from .bibtex import entry_to_bibtex, escape_bibtex
+from importlib import import_module
 
-__all__ = ['entry_to_bibtex', 'escape_bibtex']
\ No newline at end of file
+# Submodules load on first use, so importing the package (e.g. for citation_key_base) stays cheap.
+_EXPORTS = {
+    'entry_to_bibtex': 'bibtex', 'escape_bibtex': 'bibtex',
+    'export_set': 'export', 'export_set_to_path': 'export',
+    'import_bibtex': 'parser', 'import_bibtex_path': 'parser', 'parse_bibtex': 'parser', 'record_to_entry': 'parser',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
@@ -1,22 +1,31 @@
 
 import re
+import unicodedata
 from typing import Dict, Optional
 
+_KEY_WORD = re.compile(r"[A-Za-z][A-Za-z'-]*")
+
 def escape_bibtex(s: str) -> str:
     if s is None:
         return ""
     # Minimal escaping for braces, percent, and backslashes
     return s.replace('\\', '\\\\').replace('{', r'\{').replace('}', r'\}').replace('%', r'\%')
 
-def entry_to_bibtex(entry: Dict, bibkey: Optional[str] = None) -> str:
+def _ascii(s: str) -> str:
+    return unicodedata.normalize('NFKD', s).encode('ascii', 'ignore').decode('ascii')
+
+def citation_key_base(entry: Dict) -> str:
     # Heuristic key: authorLastNameYearTitleword
+    author = _ascii(entry.get('authors', '') or '')
+    year = entry.get('year') or 'n.d.'
+    m = _KEY_WORD.search(author)
+    last = re.sub(r"[^A-Za-z]", '', m.group(0)) if m else 'anon'
+    titleword = re.sub(r"[^A-Za-z]", '', _ascii(entry.get('title') or 'untitled'))[:6]
+    return f"{last}{year}{titleword}".lower()
+
+def entry_to_bibtex(entry: Dict, bibkey: Optional[str] = None) -> str:
     if bibkey is None:
-        author = entry.get('authors', '') or ''
-        year = entry.get('year') or 'n.d.'
-        m = re.search(r"([A-Za-z'-]+)(?:\s|$)", author)
-        last = m.group(1) if m else 'anon'
-        titleword = re.sub(r"[^A-Za-z]", '', (entry.get('title') or 'untitled'))[:6]
-        bibkey = f"{last}{year}{titleword}".lower()
+        bibkey = entry.get('citation_key') or citation_key_base(entry)
 
     bibtype = 'article' if entry.get('venue') else 'misc'
     fields = {
@@ -0,0 +1,81 @@
+from __future__ import annotations
+import argparse
+import sys
+from typing import Iterator, TextIO
+
+from src.features.bibtex.bibtex import entry_to_bibtex
+from src.features.database.records import ENTRY_COLUMNS
+
+EXPORT_CHUNK = 500
+_COLUMNS = ", ".join("e." + name for name in ENTRY_COLUMNS)
+
+def iter_set_entries(db, set_id: int, chunk_size: int = EXPORT_CHUNK) -> Iterator:
+    c = db.conn.cursor()
+    c.execute(
+        f"""SELECT {_COLUMNS} FROM entries e JOIN set_entries s ON e.id = s.entry_id
+           WHERE s.set_id = ? ORDER BY e.created_at DESC, e.id DESC""",
+        (set_id,),
+    )
+    # Rows are records.Entry, which entry_to_bibtex reads like a dict.
+    while True:
+        rows = c.fetchmany(chunk_size)
+        if not rows:
+            return
+        yield from rows
+
+def iter_bibtex_chunks(db, set_id: int, chunk_size: int = EXPORT_CHUNK) -> Iterator[tuple[str, int]]:
+    """A reference set as BibTeX text, ``chunk_size`` entries at a time: yields (text, entries in it)."""
+    parts = []
+    for entry in iter_set_entries(db, set_id, chunk_size):
+        parts.append(entry_to_bibtex(entry) + "\n\n")
+        if len(parts) >= chunk_size:
+            yield "".join(parts), len(parts)
+            parts.clear()
+    if parts:
+        yield "".join(parts), len(parts)
+
+def export_set(db, set_id: int, fileobj: TextIO, chunk_size: int = EXPORT_CHUNK) -> int:
+    """Write every entry of a reference set as BibTeX; returns the number of entries written."""
+    count = 0
+    for text, n in iter_bibtex_chunks(db, set_id, chunk_size):
+        fileobj.write(text)
+        count += n
+    return count
+
+def export_set_to_path(db, set_id: int, path: str, chunk_size: int = EXPORT_CHUNK) -> int:
+    with open(path, "w", encoding="utf-8", buffering=1 << 16) as f:
+        return export_set(db, set_id, f, chunk_size)
+
+def resolve_set_id(db, ref: str) -> int | None:
+    c = db.conn.cursor()
+    c.execute("SELECT id FROM refsets WHERE name = ?", (ref,))
+    row = c.fetchone()
+    if row:
+        return row[0]
+    return int(ref) if ref.isdigit() else None
+
+def main(argv: list[str] | None = None) -> int:
+    from src.features.database.db import BibliographyDB
+
+    parser = argparse.ArgumentParser(description="Export a reference set to BibTeX.")
+    parser.add_argument("db_file", help="SQLite database file")
+    parser.add_argument("set", help="reference set name or id")
+    parser.add_argument("-o", "--output", help="output .bib file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    db = BibliographyDB(args.db_file)
+    try:
+        set_id = resolve_set_id(db, args.set)
+        if set_id is None:
+            parser.error(f"unknown reference set: {args.set}")
+        if args.output:
+            count = export_set_to_path(db, set_id, args.output)
+        else:
+            count = export_set(db, set_id, sys.stdout)
+    finally:
+        db.close()
+    print(f"exported {count} entries", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
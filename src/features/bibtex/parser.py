@@ -0,0 +1,233 @@
+from __future__ import annotations
+import re
+from typing import Iterator, TextIO
+
+from src.features.database.operation import entry_ops
+
+READ_CHUNK = 1 << 16
+
+_ENTRY_START = re.compile(r"@\s*([A-Za-z]+)\s*([{(])")
+_PARTIAL_START = re.compile(r"@\s*[A-Za-z]*\s*")
+# An '@' starting a line ends whatever entry came before it, closed or not.
+_LINE_START = re.compile(r"\n[ \t]*@")
+_ENTRY_SCAN = re.compile(r'\\.|[{}()"]', re.S)
+_BRACE_SCAN = re.compile(r"\\.|[{}]", re.S)
+_QUOTE_SCAN = re.compile(r'\\.|[{}"]', re.S)
+_NAME = re.compile(r'[^\s,#={}"()]+')
+_WS = re.compile(r"\s*")
+_UNESCAPES = {"\\\\": "\\", "\\{": "{", "\\}": "}", "\\%": "%", "\\&": "&", "\\_": "_", "\\$": "$", "\\#": "#"}
+
+_MONTHS = ["january", "february", "march", "april", "may", "june",
+           "july", "august", "september", "october", "november", "december"]
+_MONTH_MACROS = {m[:3]: m.capitalize() for m in _MONTHS}
+
+def parse_bibtex(fileobj: TextIO, strict: bool = True, chunk_size: int = READ_CHUNK) -> Iterator[dict]:
+    """Yield ``{"type", "key", "fields"}`` records from a BibTeX stream, reading it chunk by chunk.
+
+    ``@string`` macros are expanded, ``@comment``/``@preamble`` blocks and text between
+    entries are skipped. An entry still open at the next line-start ``@`` is malformed: with
+    ``strict=False`` parsing resumes at that ``@`` and every malformed entry is yielded as
+    ``{"type", "key", "fields": {}, "error"}`` instead of raising ValueError.
+    """
+    macros = dict(_MONTH_MACROS)
+    buf, pos, eof = "", 0, False
+    while True:
+        at = buf.find("@", pos)
+        if at < 0:
+            if eof:
+                return
+            buf, pos = "", 0
+            chunk = fileobj.read(chunk_size)
+            eof = not chunk
+            buf = chunk
+            continue
+        m = _ENTRY_START.match(buf, at)
+        following = _LINE_START.search(buf, m.end()) if m else None
+        limit = following.start() if following else len(buf)
+        end = _find_entry_end(buf, m.end(), m.group(2), limit) if m else -1
+        if end < 0 and following is None and not eof and (m or _PARTIAL_START.fullmatch(buf, at)):
+            # Entry (or its header) continues past the buffer: read more and retry from '@'.
+            chunk = fileobj.read(chunk_size)
+            eof = not chunk
+            buf, pos = buf[at:] + chunk, 0
+            continue
+        if m is None:
+            pos = at + 1
+            continue
+        kind = m.group(1).lower()
+        if end < 0:
+            # Resume at the next entry (or stop at the end of the input) instead of letting this one swallow the rest.
+            error = f"Unterminated @{kind} entry"
+            if strict:
+                raise ValueError(error)
+            yield _invalid(kind, buf[m.end():limit], error)
+            if following is None:
+                return
+            pos = limit
+            continue
+        pos = end + 1
+        try:
+            record = _parse_body(kind, buf[m.end():end], macros)
+        except ValueError as e:
+            if strict:
+                raise
+            record = _invalid(kind, buf[m.end():end], str(e))
+        if record is not None:
+            yield record
+
+def _invalid(kind: str, body: str, error: str) -> dict:
+    key = body.split(",", 1)[0].strip() if "," in body else ""
+    return {"type": kind, "key": key, "fields": {}, "error": error}
+
+def _find_entry_end(text: str, start: int, opener: str, limit: int) -> int:
+    depth, in_quote = 0, False
+    for m in _ENTRY_SCAN.finditer(text, start, limit):
+        tok = m.group()
+        if tok == "{":
+            depth += 1
+        elif tok == "}":
+            if depth == 0 and opener == "{":
+                return m.start()
+            depth = max(depth - 1, 0)
+        elif depth == 0 and opener == "(":
+            if tok == '"':
+                in_quote = not in_quote
+            elif tok == ")" and not in_quote:
+                return m.start()
+    return -1
+
+def _parse_body(kind: str, body: str, macros: dict[str, str]) -> dict | None:
+    if kind in ("comment", "preamble"):
+        return None
+    if kind == "string":
+        for name, value in _parse_fields(body, 0, macros).items():
+            macros[name] = value
+        return None
+    comma = body.find(",")
+    key = (body if comma < 0 else body[:comma]).strip()
+    fields = _parse_fields(body, len(body) if comma < 0 else comma + 1, macros)
+    return {"type": kind, "key": key, "fields": {k: _clean(v) for k, v in fields.items()}}
+
+def _parse_fields(body: str, i: int, macros: dict[str, str]) -> dict[str, str]:
+    fields: dict[str, str] = {}
+    n = len(body)
+    while True:
+        while i < n and (body[i].isspace() or body[i] == ","):
+            i += 1
+        if i >= n:
+            return fields
+        m = _NAME.match(body, i)
+        if not m:
+            raise ValueError(f"Expected a field name near {body[i:i + 20]!r}")
+        name = m.group().lower()
+        i = _WS.match(body, m.end()).end()
+        if i >= n or body[i] != "=":
+            raise ValueError(f"Expected '=' after field {name!r}")
+        value, i = _parse_value(body, i + 1, macros)
+        fields[name] = value
+
+def _parse_value(body: str, i: int, macros: dict[str, str]) -> tuple[str, int]:
+    parts = []
+    n = len(body)
+    while True:
+        i = _WS.match(body, i).end()
+        if i >= n:
+            raise ValueError("Missing field value")
+        ch = body[i]
+        if ch == "{":
+            end = _find_closing(body, i + 1, _BRACE_SCAN, "}")
+            parts.append(body[i + 1:end])
+            i = end + 1
+        elif ch == '"':
+            end = _find_closing(body, i + 1, _QUOTE_SCAN, '"')
+            parts.append(body[i + 1:end])
+            i = end + 1
+        else:
+            m = _NAME.match(body, i)
+            if not m:
+                raise ValueError(f"Unexpected {ch!r} in field value")
+            word = m.group()
+            parts.append(word if word.isdigit() else macros.get(word.lower(), ""))
+            i = m.end()
+        i = _WS.match(body, i).end()
+        if i < n and body[i] == "#":
+            i += 1
+            continue
+        return "".join(parts), i
+
+def _find_closing(text: str, start: int, scanner: re.Pattern, closer: str) -> int:
+    depth = 0
+    for m in scanner.finditer(text, start):
+        tok = m.group()
+        if tok == closer and depth == 0:
+            return m.start()
+        if tok == "{":
+            depth += 1
+        elif tok == "}":
+            depth -= 1
+    raise ValueError(f"Unbalanced value, expected {closer!r}")
+
+def _clean(value: str) -> str:
+    # Drop grouping braces, undo escape_bibtex-style escapes and fold line breaks.
+    value = _BRACE_SCAN.sub(lambda m: _UNESCAPES.get(m.group(), m.group()) if len(m.group()) == 2 else "", value)
+    return " ".join(value.split())
+
+def _publication_date(year: str, month: str | None, day: str | None) -> str | None:
+    if not re.fullmatch(r"\d{4}", year):
+        return None
+    month = (month or "").strip().lower()
+    if month.isdigit() and 1 <= int(month) <= 12:
+        mm = int(month)
+    elif month[:3] in _MONTH_MACROS:
+        mm = [m[:3] for m in _MONTHS].index(month[:3]) + 1
+    else:
+        return year
+    day = (day or "").strip()
+    if day.isdigit() and 1 <= int(day) <= 31:
+        return f"{year}-{mm:02d}-{int(day):02d}"
+    return f"{year}-{mm:02d}"
+
+def _int_or_text(value: str | None):
+    if not value:
+        return None
+    return int(value) if value.isdigit() else value
+
+def record_to_entry(record: dict) -> dict:
+    """Map a parsed BibTeX record onto ``entries`` columns."""
+    f = record["fields"]
+    year = f.get("year", "").strip()
+    tags = [t.strip() for t in re.split(r"[,;]", f.get("keywords", "")) if t.strip()]
+    return {
+        "authors": f.get("author") or f.get("editor"),
+        "title": f.get("title"),
+        "venue": f.get("journal") or f.get("booktitle") or None,
+        "year": int(year) if re.fullmatch(r"\d{4}", year) else None,
+        "publication_date": _publication_date(year, f.get("month"), f.get("day")),
+        "volume": _int_or_text(f.get("volume")),
+        "number": _int_or_text(f.get("number")),
+        "pages": f.get("pages") or None,
+        "doi": f.get("doi") or None,
+        "url": f.get("url") or None,
+        "tags": ", ".join(tags) or None,
+        "citation_key": record["key"] or None,
+    }
+
+def import_bibtex(db, fileobj: TextIO, chunk_size: int = 1000) -> list[tuple[str, object]]:
+    """Parse a BibTeX stream and bulk-insert it; returns add_entries' per-record results, with
+    ``("invalid", error)`` in the place of each entry that could not be parsed."""
+    invalid: dict[int, str] = {}
+
+    def entries():
+        for i, record in enumerate(parse_bibtex(fileobj, strict=False)):
+            if "error" in record:
+                invalid[i] = f"{record['key'] or '@' + record['type']}: {record['error']}"
+            else:
+                yield record_to_entry(record)
+
+    added = entry_ops.add_entries(db, entries(), chunk_size)
+    rest = iter(added)
+    return [("invalid", invalid[i]) if i in invalid else next(rest) for i in range(len(added) + len(invalid))]
+
+def import_bibtex_path(db, path: str, chunk_size: int = 1000) -> list[tuple[str, object]]:
+    with open(path, encoding="utf-8") as f:
+        return import_bibtex(db, f, chunk_size)
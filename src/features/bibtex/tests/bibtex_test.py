@@ -1,5 +1,6 @@
 
 import features.bibtex.bibtex as bibtex
+from features.database.operation import entry_ops
 
 # create entry set tests
 def test_export_bibtex(temp_db):
@@ -8,10 +9,10 @@ def test_export_bibtex(temp_db):
         "authors": "Test Set",
         "title": "A test entry set"
     }
-    entry_set_id = database.add_entry(**kwargs)
+    entry_set_id = entry_ops.add_entry(database, **kwargs)
     assert isinstance(entry_set_id, int)
     assert entry_set_id > 0
-    entry = database.get_entry(entry_set_id)
+    entry = entry_ops.get_entry(database, entry_set_id)
     bibtex_str = bibtex.entry_to_bibtex(entry)
     
     assert isinstance(bibtex_str, str)
@@ -0,0 +1,39 @@
+import io
+
+from features.bibtex.export import export_set, main
+from features.database.operation import refset_ops, set_entries_ops
+from features.entries_services.entries_service import EntriesService
+
+def _make_set(database, n):
+    service = EntriesService(database)
+    results = service.add_many({"authors": f"Author{i} Smith", "title": f"Exported Title {i}", "venue": "Venue"}
+                               for i in range(n))
+    set_id = refset_ops.create_refset(database, "Export Set")
+    for _, entry_id in results:
+        set_entries_ops.add_entry_to_set(database, set_id, entry_id)
+    return set_id
+
+# Set export tests
+def test_export_set_streams_all_entries(temp_db):
+    set_id = _make_set(temp_db, 23)
+    statements = []
+    temp_db.conn.set_trace_callback(statements.append)
+    out = io.StringIO()
+    count = export_set(temp_db, set_id, out, chunk_size=5)
+    temp_db.conn.set_trace_callback(None)
+    assert count == 23
+    assert out.getvalue().count("@article{") == 23
+    assert "title = {Exported Title 7}" in out.getvalue()
+    assert len([s for s in statements if s.lstrip().upper().startswith("SELECT")]) == 1
+
+def test_export_empty_set(temp_db):
+    set_id = refset_ops.create_refset(temp_db, "Empty")
+    out = io.StringIO()
+    assert export_set(temp_db, set_id, out) == 0
+    assert out.getvalue() == ""
+
+def test_export_cli(temp_db, tmp_path):
+    _make_set(temp_db, 3)
+    target = tmp_path / "out.bib"
+    assert main([temp_db.db_file, "Export Set", "-o", str(target)]) == 0
+    assert target.read_text(encoding="utf-8").count("@article{") == 3
@@ -0,0 +1,89 @@
+import io
+
+import pytest
+
+from features.bibtex.bibtex import entry_to_bibtex
+from features.bibtex.parser import import_bibtex, parse_bibtex, record_to_entry
+from features.entries_services.entries_service import EntriesService
+
+SAMPLE = r"""
+This line is outside any entry and is ignored.
+@comment{ exported by someone, with {braces} }
+@string{ neurips = "Advances in Neural Information Processing Systems" }
+@String(acm = {ACM})
+
+@inproceedings{vaswani2017,
+  author    = {Vaswani, Ashish and Shazeer, Noam},
+  title     = "Attention Is {All} You Need",
+  booktitle = neurips # " 30",
+  year      = 2017,
+  month     = dec,
+  pages     = {5998--6008},
+  keywords  = {nlp; transformers}
+}
+
+@article(knuth84,
+  author = {Knuth, Donald E.},
+  title = {Literate Programming (revisited) 100\% \{sic\}},
+  journal = acm,
+  year = {1984},
+  volume = {27}, number = {2}
+)
+"""
+
+# BibTeX parser tests
+def test_parse_records_and_macros():
+    records = list(parse_bibtex(io.StringIO(SAMPLE)))
+    assert [r["key"] for r in records] == ["vaswani2017", "knuth84"]
+    first, second = records
+    assert first["type"] == "inproceedings"
+    assert first["fields"]["title"] == "Attention Is All You Need"
+    assert first["fields"]["booktitle"] == "Advances in Neural Information Processing Systems 30"
+    assert first["fields"]["month"] == "December"
+    assert second["fields"]["title"] == "Literate Programming (revisited) 100% {sic}"
+    assert second["fields"]["journal"] == "ACM"
+
+def test_parse_across_small_read_chunks():
+    whole = list(parse_bibtex(io.StringIO(SAMPLE)))
+    assert list(parse_bibtex(io.StringIO(SAMPLE), chunk_size=7)) == whole
+
+def test_record_to_entry_mapping():
+    entry = record_to_entry(next(parse_bibtex(io.StringIO(SAMPLE))))
+    assert entry["authors"] == "Vaswani, Ashish and Shazeer, Noam"
+    assert entry["venue"].startswith("Advances in Neural")
+    assert entry["year"] == 2017
+    assert entry["publication_date"] == "2017-12"
+    assert entry["tags"] == "nlp, transformers"
+
+def test_round_trip_with_exporter():
+    original = {"authors": "O'Neil, P.", "title": "Braces {and} 50% \\ slashes", "venue": "J", "year": 2001,
+                "volume": 3, "pages": "1-9"}
+    record = next(parse_bibtex(io.StringIO(entry_to_bibtex(original))))
+    entry = record_to_entry(record)
+    for key, value in original.items():
+        assert entry[key] == value
+
+def test_malformed_entries_are_reported_when_not_strict():
+    text = "@article{bad, title = }\n@misc{good, author = {A}, title = {Fine}}\n@misc{cut, title = {x"
+    records = list(parse_bibtex(io.StringIO(text), strict=False))
+    assert [(r["key"], "error" in r) for r in records] == [("bad", True), ("good", False), ("cut", True)]
+
+def test_unterminated_entry_does_not_swallow_the_rest():
+    good = "".join(f"@misc{{k{i}, author = {{A {i}}}, title = {{T {i}}}}}\n" for i in range(2000))
+    text = good + "@article{broken, title = {Missing brace,\n  year = 2020\n\n" + good
+    records = list(parse_bibtex(io.StringIO(text), strict=False, chunk_size=256))
+    assert len(records) == 4001 and records[2000]["key"] == "broken" and "error" in records[2000]
+    with pytest.raises(ValueError, match="Unterminated"):
+        list(parse_bibtex(io.StringIO(text)))
+
+def test_import_reports_unparsable_entries_in_place(temp_db):
+    text = "@misc{a, author = {A}, title = {One}\n@misc{b, author = {B}, title = {Two}}\n"
+    results = import_bibtex(temp_db, io.StringIO(text))
+    assert [status for status, _ in results] == ["invalid", "inserted"] and "a: Unterminated" in results[0][1]
+
+def test_import_bibtex_batches_into_database(temp_db):
+    results = import_bibtex(temp_db, io.StringIO(SAMPLE + SAMPLE))
+    assert [status for status, _ in results] == ["inserted", "inserted", "duplicate", "duplicate"]
+    service = EntriesService(temp_db)
+    assert len(service.list()) == 2
+    assert service.tag_counts() == [("nlp", 1), ("transformers", 1)]
@@ -0,0 +1,37 @@
+from __future__ import annotations
+import threading
+
+from src.features.database.operation import changelog_ops
+from src.features.database.operation.changelog_ops import Change
+
+class ChangeFeed:
+    """Follows the changelog from a position: ``poll()`` returns the events committed since the last call.
+
+    ``poll()`` returns None when the consumer should reload everything instead: the events it needed
+    were pruned, or more than ``limit`` are pending. The feed then jumps to the newest seq.
+    Safe to share between threads.
+    """
+
+    def __init__(self, db, seq: int | None = None):
+        self.db = db
+        if seq is None:
+            with db.read() as view:
+                seq = changelog_ops.current_seq(view)
+        self.seq = seq
+        self._lock = threading.Lock()
+
+    def poll(self, limit: int | None = None) -> list[Change] | None:
+        with self._lock, self.db.read() as db:
+            if db is self.db and self.db.conn.in_transaction:
+                # Uncommitted seqs are handed out again if the transaction rolls back; only follow committed ones.
+                return None
+            try:
+                changes = changelog_ops.changes_since(db, self.seq, None if limit is None else limit + 1)
+            except changelog_ops.ChangesPruned:
+                changes = None
+            if changes is None or (limit is not None and len(changes) > limit):
+                self.seq = changelog_ops.current_seq(db)
+                return None
+            if changes:
+                self.seq = changes[-1].seq
+            return changes
@@ -0,0 +1,62 @@
+from __future__ import annotations
+import re
+from datetime import date
+
+# Date filters for the entries table. created_at is always a full ISO timestamp, so a calendar range on
+# idx_entries_created works. publication_date may be YYYY, YYYY-MM or YYYY-MM-DD; pub_sort pads it to a
+# fixed-width "YYYY-MM-DD" with "00" for missing parts (2021-03 -> 2021-03-00) and idx_entries_pub_sort
+# indexes that, so a prefix becomes a plain lexical range.
+DATE_PREFIX = re.compile(r"^\d{4}(?:-\d{2}){0,2}$")
+PUB_SORT_SQL = "substr(trim(publication_date) || '-00-00', 1, 10)"
+
+def prefix_to_range(prefix: str) -> tuple[str, str]:
+    if not DATE_PREFIX.match(prefix):
+        raise ValueError('Date must be YYYY, YYYY-MM, or YYYY-MM-DD')
+    parts = prefix.split('-')
+    if len(parts) == 1:
+        y = int(parts[0]); start = f"{y:04d}-01-01"; end = f"{y+1:04d}-01-01"
+    elif len(parts) == 2:
+        y, m = int(parts[0]), int(parts[1])
+        start = f"{y:04d}-{m:02d}-01"
+        end = f"{(y if m < 12 else y+1):04d}-{(m+1 if m < 12 else 1):02d}-01"
+    else:
+        y, m, d = int(parts[0]), int(parts[1]), int(parts[2])
+        start = f"{y:04d}-{m:02d}-{d:02d}"
+        ne = date.fromordinal(date(y, m, d).toordinal() + 1)
+        end = ne.strftime('%Y-%m-%d')
+    return start, end
+
+def pub_sort_range(prefix: str) -> tuple[str, str]:
+    """Half-open pub_sort bounds matching every publication_date that starts with ``prefix``."""
+    if not DATE_PREFIX.match(prefix):
+        raise ValueError('Date must be YYYY, YYYY-MM, or YYYY-MM-DD')
+    parts = [int(p) for p in prefix.split('-')]
+    # Bumping the last given part is enough: bounds only need to sort, not be real dates.
+    return _pad(parts), _pad(parts[:-1] + [parts[-1] + 1])
+
+def _pad(parts: list[int]) -> str:
+    return "-".join([f"{parts[0]:04d}"] + [f"{p:02d}" for p in parts[1:]] + ["00"] * (3 - len(parts)))
+
+def prefix_clause(column: str, prefix: str) -> tuple[str, tuple]:
+    """WHERE clause for ``column`` starting with a YYYY[-MM[-DD]] prefix, as an index range scan."""
+    if column == "publication_date":
+        return "(pub_sort >= ? AND pub_sort < ?)", pub_sort_range(prefix)
+    if column == "created_at":
+        try:
+            return "(created_at >= ? AND created_at < ?)", prefix_to_range(prefix)
+        except ValueError:
+            pass  # not a calendar date (e.g. 2023-02-31): nothing is indexed for it
+    return f"{column} LIKE ?", (f"{prefix}%",)
+
+def range_clause(column: str, start: str | None, end: str | None) -> tuple[str, tuple]:
+    """WHERE clause for ``start <= column <= end`` by prefix; a lone start covers its whole period."""
+    if column == "publication_date":
+        column, bounds = "pub_sort", pub_sort_range
+    else:
+        bounds = prefix_to_range
+    parts, params = [], []
+    if start:
+        parts.append(f"{column} >= ?"); params.append(bounds(start)[0])
+    if start or end:
+        parts.append(f"{column} < ?"); params.append(bounds(end or start)[1])
+    return f"({' AND '.join(parts)})", tuple(params)
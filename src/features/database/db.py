@@ -1,18 +1,98 @@
 from __future__ import annotations
+import os
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime
+from typing import Iterator
+
+from .dates import PUB_SORT_SQL
+from .pool import DEFAULT_READERS, ReaderPool, ReadView
+from .profiler import QueryProfiler, connect as profiled_connect, resolve_profiler
+from .records import row_factory
 
 DB_FILE = "bibliography.db"
 
+# Connection tuning presets. cache_size is in KiB when negative, mmap_size in bytes,
+# busy_timeout in milliseconds. Pick one with BibliographyDB(profile=...) or BIBAPP_DB_PROFILE.
+PROFILE_ENV = "BIBAPP_DB_PROFILE"
+DEFAULT_PROFILE = "safe"
+PROFILES = {
+    "safe": {
+        "journal_mode": "WAL", "synchronous": "FULL", "cache_size": -16_000,
+        "mmap_size": 0, "temp_store": "DEFAULT", "busy_timeout": 5_000,
+    },
+    "balanced": {
+        "journal_mode": "WAL", "synchronous": "NORMAL", "cache_size": -64_000,
+        "mmap_size": 256 * 1024 * 1024, "temp_store": "MEMORY", "busy_timeout": 5_000,
+    },
+    "bulk": {
+        "journal_mode": "WAL", "synchronous": "OFF", "cache_size": -256_000,
+        "mmap_size": 1024 * 1024 * 1024, "temp_store": "MEMORY", "busy_timeout": 30_000,
+    },
+}
+
+def resolve_profile(profile: str | dict | None = None) -> dict:
+    if isinstance(profile, dict):
+        return {**PROFILES[DEFAULT_PROFILE], **profile}
+    name = (profile or os.environ.get(PROFILE_ENV) or DEFAULT_PROFILE).strip().lower()
+    if name not in PROFILES:
+        raise ValueError(f"Unknown database profile {name!r} (expected one of {', '.join(PROFILES)})")
+    return dict(PROFILES[name])
+
 class BibliographyDB:
-    def __init__(self, db_file: str = DB_FILE):
-        self.conn = sqlite3.connect(db_file)
+    """The writer connection (``conn``) plus a pool of up to ``readers`` read-only connections.
+
+    Services run their reads inside ``read()`` so several threads can query at once; writes and
+    transactions stay on ``conn``, one thread at a time: every write runs inside ``transaction()``, which
+    holds a lock for its whole block.
+    ``readers=0`` keeps everything on ``conn``.
+    """
+
+    def __init__(self, db_file: str = DB_FILE, profile: str | dict | None = None,
+                 profiler: QueryProfiler | bool | str | None = None, readers: int = DEFAULT_READERS):
+        self.db_file = db_file
+        self.profile = resolve_profile(profile)
+        self.profiler, self._owns_profiler = resolve_profiler(profiler)
+        # Transaction depth is per thread: only the thread inside transaction() reads its uncommitted rows.
+        self._local = threading.local()
+        self._write_lock = threading.RLock()
+        # Not tied to the opening thread: services shared between threads write through it.
+        self.conn = self._connect(db_file, check_same_thread=False)
+        self._apply_profile(self.conn)
         self.conn.execute("PRAGMA foreign_keys = ON")
         self._create_tables()
         self._migrate_columns()
+        # The pool reopens db_file as a read-only URI, which needs a real file path.
+        no_pool = readers <= 0 or db_file == ":memory:" or db_file.startswith("file:")
+        self.pool = None if no_pool else ReaderPool(db_file, readers, self._connect, self._setup_reader)
+
+    def _connect(self, database: str, **kwargs) -> sqlite3.Connection:
+        conn = profiled_connect(database, self.profiler, **kwargs) if self.profiler else sqlite3.connect(database, **kwargs)
+        # Rows of entries come back as records.Entry; everything else stays a plain tuple.
+        conn.row_factory = row_factory()
+        return conn
+
+    def _setup_reader(self, conn: sqlite3.Connection):
+        # journal_mode and synchronous belong to the writer; mode=ro connections only tune their own reads.
+        self._apply_profile(conn, reader=True)
+        conn.execute("PRAGMA query_only = ON")
+
+    def _apply_profile(self, conn: sqlite3.Connection, reader: bool = False):
+        p = self.profile
+        # busy_timeout first so switching the journal mode waits for other connections.
+        conn.execute(f"PRAGMA busy_timeout = {int(p['busy_timeout'])}")
+        if not reader:
+            conn.execute(f"PRAGMA journal_mode = {p['journal_mode']}")
+            conn.execute(f"PRAGMA synchronous = {p['synchronous']}")
+        conn.execute(f"PRAGMA cache_size = {int(p['cache_size'])}")
+        conn.execute(f"PRAGMA mmap_size = {int(p['mmap_size'])}")
+        conn.execute(f"PRAGMA temp_store = {p['temp_store']}")
 
     def _create_tables(self):
         c = self.conn.cursor()
+        c.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        existing = {row[0] for row in c.fetchall()}
         c.execute("""
             CREATE TABLE IF NOT EXISTS entries (
                 id INTEGER PRIMARY KEY,
@@ -46,17 +126,216 @@ class BibliographyDB:
                 FOREIGN KEY(entry_id) REFERENCES entries(id) ON DELETE CASCADE
             )
         """)
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS entry_tags (
+                entry_id INTEGER NOT NULL,
+                tag TEXT NOT NULL,
+                PRIMARY KEY(entry_id, tag),
+                FOREIGN KEY(entry_id) REFERENCES entries(id) ON DELETE CASCADE
+            ) WITHOUT ROWID
+        """)
+        c.execute("CREATE INDEX IF NOT EXISTS idx_entry_tags_tag ON entry_tags(tag, entry_id)")
+        # MinHash signatures and LSH buckets for near-duplicate detection (features/dedupe), filled lazily.
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS entry_minhash (
+                entry_id INTEGER PRIMARY KEY,
+                version INTEGER NOT NULL,
+                signature BLOB NOT NULL,
+                FOREIGN KEY(entry_id) REFERENCES entries(id) ON DELETE CASCADE
+            )
+        """)
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS entry_lsh (
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                entry_id INTEGER NOT NULL,
+                PRIMARY KEY(band, bucket, entry_id),
+                FOREIGN KEY(entry_id) REFERENCES entries(id) ON DELETE CASCADE
+            ) WITHOUT ROWID
+        """)
+        c.execute("CREATE INDEX IF NOT EXISTS idx_entry_lsh_entry ON entry_lsh(entry_id)")
+        # Editing authors or title makes the signature stale; the next scan recomputes it.
+        c.execute("""
+            CREATE TRIGGER IF NOT EXISTS entries_minhash_au AFTER UPDATE OF authors, title ON entries BEGIN
+                DELETE FROM entry_lsh WHERE entry_id = old.id;
+                DELETE FROM entry_minhash WHERE entry_id = old.id;
+            END
+        """)
+        self._create_changelog(c)
+        self._new_tables = {"entry_tags", "entries_fts"} - existing
+        self.has_fts = self._create_fts(c)
         self.conn.commit()
 
+    def _create_changelog(self, c: sqlite3.Cursor):
+        # Every insert, update and delete on entries, refsets and set_entries, in commit order (see changelog_ops).
+        # AUTOINCREMENT keeps seq monotonic even after the newest events are pruned.
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS changelog (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                tbl TEXT NOT NULL,
+                op TEXT NOT NULL,
+                row_id INTEGER NOT NULL,
+                entry_id INTEGER
+            )
+        """)
+        # Highest seq removed by prune_changes; readers behind it have to reload from scratch.
+        c.execute("CREATE TABLE IF NOT EXISTS changelog_floor (id INTEGER PRIMARY KEY CHECK (id = 1), seq INTEGER NOT NULL)")
+        def log(table: str, op: str, row: str, key: str, entry: str | None = None) -> str:
+            member = f"{row}.{entry}" if entry else "NULL"
+            return f"INSERT INTO changelog (tbl, op, row_id, entry_id) VALUES ('{table}', '{op}', {row}.{key}, {member});"
+
+        for table, key, entry in (("entries", "id", None), ("refsets", "id", None), ("set_entries", "set_id", "entry_id")):
+            update = log(table, "U", "new", key)
+            if entry:
+                # A membership row is nothing but its keys: log an update as leaving one set and joining another.
+                update = log(table, "D", "old", key, entry) + log(table, "I", "new", key, entry)
+            for suffix, event, body in (("ai", "INSERT", log(table, "I", "new", key, entry)), ("au", "UPDATE", update),
+                                        ("ad", "DELETE", log(table, "D", "old", key, entry))):
+                c.execute(f"CREATE TRIGGER IF NOT EXISTS {table}_changelog_{suffix} AFTER {event} ON {table} BEGIN {body} END")
+
+    def _create_fts(self, c: sqlite3.Cursor) -> bool:
+        try:
+            c.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+                    authors, title, venue, tags,
+                    content='entries', content_rowid='id', prefix='2 3'
+                )
+            """)
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: callers fall back to LIKE scans.
+            return False
+        c.execute("""
+            CREATE TRIGGER IF NOT EXISTS entries_fts_ai AFTER INSERT ON entries BEGIN
+                INSERT INTO entries_fts(rowid, authors, title, venue, tags)
+                VALUES (new.id, new.authors, new.title, new.venue, new.tags);
+            END
+        """)
+        c.execute("""
+            CREATE TRIGGER IF NOT EXISTS entries_fts_ad AFTER DELETE ON entries BEGIN
+                INSERT INTO entries_fts(entries_fts, rowid, authors, title, venue, tags)
+                VALUES ('delete', old.id, old.authors, old.title, old.venue, old.tags);
+            END
+        """)
+        c.execute("""
+            CREATE TRIGGER IF NOT EXISTS entries_fts_au AFTER UPDATE OF authors, title, venue, tags ON entries BEGIN
+                INSERT INTO entries_fts(entries_fts, rowid, authors, title, venue, tags)
+                VALUES ('delete', old.id, old.authors, old.title, old.venue, old.tags);
+                INSERT INTO entries_fts(rowid, authors, title, venue, tags)
+                VALUES (new.id, new.authors, new.title, new.venue, new.tags);
+            END
+        """)
+        if "entries_fts" in self._new_tables:
+            c.execute("INSERT INTO entries_fts(entries_fts) VALUES ('rebuild')")
+        return True
+
     def _migrate_columns(self):
         c = self.conn.cursor()
-        c.execute("PRAGMA table_info(entries)")
-        _ = {row[1] for row in c.fetchall()}
+        c.execute("PRAGMA table_xinfo(entries)")
+        cols = {row[1] for row in c.fetchall()}
+        if "citation_key" not in cols:
+            c.execute("ALTER TABLE entries ADD COLUMN citation_key TEXT")
+        if "pub_sort" not in cols:
+            # Sortable form of publication_date (see dates.py); virtual, so only the index stores it.
+            c.execute(f"ALTER TABLE entries ADD COLUMN pub_sort TEXT GENERATED ALWAYS AS ({PUB_SORT_SQL}) VIRTUAL")
+        c.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_entries_citation_key ON entries(citation_key)")
+        # Expression index matching find_duplicate_id's normalization; building it backfills existing rows.
+        c.execute("""
+            CREATE INDEX IF NOT EXISTS idx_entries_dedup
+            ON entries(lower(trim(title)), lower(trim(authors)), ifnull(trim(publication_date), ''))
+        """)
+        c.execute("CREATE INDEX IF NOT EXISTS idx_entries_created ON entries(created_at, id)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_entries_pub_sort ON entries(pub_sort)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_entries_year ON entries(year)")
+        if "entry_tags" in self._new_tables:
+            from src.features.database.operation.tag_ops import split_tags
+            c.execute("SELECT id, tags FROM entries WHERE tags IS NOT NULL")
+            pairs = [(eid, tag) for eid, tags in c.fetchall() for tag in split_tags(tags)]
+            c.executemany("INSERT OR IGNORE INTO entry_tags (entry_id, tag) VALUES (?, ?)", pairs)
+        if "citation_key" not in cols:
+            from src.features.database.operation.citation_key_ops import backfill_citation_keys
+            backfill_citation_keys(self)
         self.conn.commit()
 
+    @contextmanager
+    def transaction(self, immediate: bool = False) -> Iterator[BibliographyDB]:
+        """Group operations into one commit; nested blocks become savepoints that roll back on their own."""
+        with self._write_lock:
+            depth = self._tx_depth
+            name = f"bibdb_tx_{depth}"
+            if depth == 0 and immediate and not self.conn.in_transaction:
+                self.conn.execute("BEGIN IMMEDIATE")
+            self.conn.execute(f"SAVEPOINT {name}")
+            self._tx_depth = depth + 1
+            try:
+                yield self
+            except BaseException:
+                # Some errors (SQLITE_FULL, an interrupt, ...) make SQLite roll back the whole transaction
+                # itself; the savepoint is gone then, and the error to surface is the original one.
+                if self.conn.in_transaction:
+                    try:
+                        self.conn.execute(f"ROLLBACK TO {name}")
+                        self.conn.execute(f"RELEASE {name}")
+                        if depth == 0:
+                            self.conn.rollback()
+                    except sqlite3.Error:
+                        pass
+                raise
+            else:
+                self.conn.execute(f"RELEASE {name}")
+                if depth == 0:
+                    self.conn.commit()
+            finally:
+                self._tx_depth = depth
+
+    @property
+    def _tx_depth(self) -> int:
+        return getattr(self._local, "depth", 0)
+
+    @_tx_depth.setter
+    def _tx_depth(self, depth: int):
+        self._local.depth = depth
+
+    @property
+    def in_transaction(self) -> bool:
+        """Whether the calling thread is inside transaction()."""
+        return self._tx_depth > 0
+
+    def commit(self):
+        # Inside transaction() the outermost block commits. The lock keeps this from committing another
+        # thread's open transaction halfway; operations write inside transaction() for the same reason.
+        with self._write_lock:
+            if self._tx_depth == 0:
+                self.conn.commit()
+
+    @contextmanager
+    def read(self) -> Iterator[BibliographyDB | ReadView]:
+        """Something to pass read-only operations: a pooled reader, or this object when there is no pool
+        or the calling thread is inside transaction() (its uncommitted changes are only visible on ``conn``)."""
+        if self.pool is None or self.in_transaction:
+            yield self
+            return
+        with self.pool.connection() as conn:
+            yield ReadView(self, conn)
+
+    def data_version(self) -> int | tuple[str, int]:
+        """Changes whenever any connection commits a write to entries, refsets or set_entries; caches
+        compare it to know when their results went stale. Read on a pooled reader, so it never waits for ``conn``."""
+        with self.read() as view:
+            if view is not self:
+                return view.data_version()
+            if self.conn.in_transaction:
+                # Uncommitted changelog seqs are handed out again after a rollback, so they cannot name a state.
+                return "uncommitted", self.conn.total_changes
+            row = self.conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'changelog'").fetchone()
+            return row[0] if row else 0
+
     @staticmethod
     def utcnow_iso() -> str:
         return datetime.utcnow().isoformat()
 
     def close(self):
+        if self.pool is not None:
+            self.pool.close()
         self.conn.close()
+        if self._owns_profiler:
+            self.profiler.dump()
@@ -0,0 +1,84 @@
+from __future__ import annotations
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+from src.features.database.db import BibliographyDB
+from src.features.database.profiler import QueryProfiler
+
+class QueryExecutor:
+    """Runs database calls on one worker thread that owns its own connection.
+
+    ``submit(fn, *args)`` calls ``fn(context, *args)`` on the worker, where
+    ``context`` is the worker's BibliographyDB or whatever ``setup(db)``
+    returned for it, and hands back a Future.
+    """
+
+    def __init__(self, db_file: str, setup: Callable[[BibliographyDB], Any] | None = None,
+                 profile: str | dict | None = None, profiler: QueryProfiler | None = None):
+        self._db: BibliographyDB | None = None
+        self._context: Any = None
+        self._running: Future | None = None
+        self._closing = False
+        self._abort = False
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="bibdb-query",
+            initializer=self._open, initargs=(db_file, setup, profile, profiler),
+        )
+
+    def _open(self, db_file: str, setup: Callable[[BibliographyDB], Any] | None, profile: str | dict | None,
+              profiler: QueryProfiler | None):
+        # Share the caller's profiler (it owns the dump) instead of letting the env var open a second one.
+        # No reader pool: cancel() aborts through conn's progress handler, so every query must run on conn.
+        self._db = BibliographyDB(db_file, profile, profiler=profiler or False, readers=0)
+        # Checked every 1000 VM steps; returning True aborts the running statement.
+        self._db.conn.set_progress_handler(lambda: self._abort, 1000)
+        self._context = setup(self._db) if setup else self._db
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        future: Future = Future()
+        self._pool.submit(self._run, future, fn, args, kwargs)
+        return future
+
+    def _run(self, future: Future, fn: Callable[..., Any], args: tuple, kwargs: dict):
+        if self._closing:
+            future.cancel()
+        # Mark the future running under the lock: a cancel() that finds it no longer pending then also
+        # finds it in _running, instead of slipping in between and letting the query run to the end.
+        with self._lock:
+            if not future.set_running_or_notify_cancel():
+                return
+            self._running = future
+            self._abort = False
+        try:
+            result = fn(self._context, *args, **kwargs)
+        except BaseException as exc:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                self._running = None
+
+    def cancel(self, future: Future) -> bool:
+        """Drop a queued call, or abort its SQL if it is the call currently running."""
+        if future.cancel():
+            return True
+        with self._lock:
+            if self._running is future:
+                self._abort = True
+                return True
+        return False
+
+    def shutdown(self):
+        with self._lock:
+            self._closing = True
+            self._abort = self._running is not None
+        self._pool.submit(self._close)
+        self._pool.shutdown(wait=True)
+
+    def _close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,81 @@
+from __future__ import annotations
+from typing import Iterable, NamedTuple
+from src.features.database.db import BibliographyDB
+
+class Change(NamedTuple):
+    """One changelog event. ``op`` is 'I', 'U' or 'D'; after compaction an 'I' or 'U' only means
+    "the row exists now, re-read it" and 'D' "the row is gone".
+
+    ``row_id`` is entries.id, refsets.id or set_entries.set_id; ``entry_id`` is set for set_entries only.
+    """
+    seq: int
+    table: str
+    op: str
+    row_id: int
+    entry_id: int | None
+
+class ChangesPruned(ValueError):
+    """Events after the requested seq were pruned; the reader has to reload everything."""
+
+def current_seq(db: BibliographyDB) -> int:
+    c = db.conn.cursor()
+    # sqlite_sequence keeps the highest seq ever handed out, even once those events are pruned.
+    c.execute("SELECT seq FROM sqlite_sequence WHERE name = 'changelog'")
+    row = c.fetchone()
+    return row[0] if row else 0
+
+def pruned_seq(db: BibliographyDB) -> int:
+    c = db.conn.cursor()
+    c.execute("SELECT seq FROM changelog_floor WHERE id = 1")
+    row = c.fetchone()
+    return row[0] if row else 0
+
+def changes_since(db: BibliographyDB, seq: int, limit: int | None = None) -> list[Change]:
+    """Events after ``seq``, oldest first; raises ChangesPruned if some of them were pruned."""
+    floor = pruned_seq(db)
+    if seq < floor:
+        raise ChangesPruned(f"Changes up to {floor} were pruned; cannot read from {seq}")
+    c = db.conn.cursor()
+    c.execute(
+        "SELECT seq, tbl, op, row_id, entry_id FROM changelog WHERE seq > ? ORDER BY seq LIMIT ?",
+        (seq, -1 if limit is None else limit),
+    )
+    return [Change(*row) for row in c.fetchall()]
+
+def compact_changes(db: BibliographyDB, upto_seq: int | None = None) -> int:
+    """Keep only the newest event per row among those up to ``upto_seq`` (default: all).
+
+    Lossless for readers that re-read changed rows, from any position. Returns the number of events removed.
+    """
+    upto = current_seq(db) if upto_seq is None else upto_seq
+    with db.transaction():
+        c = db.conn.cursor()
+        c.execute(
+            """DELETE FROM changelog WHERE seq <= ? AND seq NOT IN (
+                   SELECT max(seq) FROM changelog WHERE seq <= ? GROUP BY tbl, row_id, entry_id
+               )""",
+            (upto, upto),
+        )
+        return c.rowcount
+
+def prune_changes(db: BibliographyDB, upto_seq: int) -> int:
+    """Drop every event up to ``upto_seq``; readers still behind it get ChangesPruned. Returns the number removed."""
+    upto = min(upto_seq, current_seq(db))
+    with db.transaction():
+        c = db.conn.cursor()
+        c.execute("DELETE FROM changelog WHERE seq <= ?", (upto,))
+        removed = c.rowcount
+        c.execute(
+            """INSERT INTO changelog_floor (id, seq) VALUES (1, ?)
+               ON CONFLICT(id) DO UPDATE SET seq = max(seq, excluded.seq)""",
+            (upto,),
+        )
+        return removed
+
+def entry_changes(changes: Iterable[Change]) -> tuple[set[int], set[int]]:
+    """(ids of entries inserted or updated, ids of entries deleted), each by its latest event."""
+    latest = {}
+    for change in changes:
+        if change.table == "entries":
+            latest[change.row_id] = change.op
+    return {eid for eid, op in latest.items() if op != "D"}, {eid for eid, op in latest.items() if op == "D"}
@@ -0,0 +1,35 @@
+from __future__ import annotations
+import itertools
+import string
+from typing import Container, Iterator
+
+from src.features.bibtex.bibtex import citation_key_base
+from src.features.database.db import BibliographyDB
+
+def _suffixes() -> Iterator[str]:
+    yield ""
+    for n in itertools.count(1):
+        for letters in itertools.product(string.ascii_lowercase, repeat=n):
+            yield "".join(letters)
+
+def unique_citation_key(db: BibliographyDB, base: str, reserved: Container[str] = ()) -> str:
+    """First free key among base, base+'a', base+'b', ... from one range scan of the unique index."""
+    c = db.conn.cursor()
+    # Every suffix is lowercase letters, so all candidates sort in [base, base + '{').
+    c.execute("SELECT citation_key FROM entries WHERE citation_key >= ? AND citation_key < ?", (base, base + "{"))
+    taken = {row[0] for row in c.fetchall()}
+    for suffix in _suffixes():
+        key = base + suffix
+        if key not in taken and key not in reserved:
+            return key
+
+def key_for_entry(db: BibliographyDB, entry: dict, reserved: Container[str] = ()) -> str:
+    base = (entry.get("citation_key") or "").strip() or citation_key_base(entry)
+    return unique_citation_key(db, base, reserved)
+
+def backfill_citation_keys(db: BibliographyDB):
+    c = db.conn.cursor()
+    c.execute("SELECT id, authors, title, year FROM entries WHERE citation_key IS NULL ORDER BY id")
+    for entry_id, authors, title, year in c.fetchall():
+        key = key_for_entry(db, {"authors": authors, "title": title, "year": year})
+        c.execute("UPDATE entries SET citation_key = ? WHERE id = ?", (key, entry_id))
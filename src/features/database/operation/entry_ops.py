@@ -1,7 +1,10 @@
 from __future__ import annotations
+import re
 from typing import Any, Iterable
 
 from src.features.database.db import BibliographyDB
+from src.features.database.operation import citation_key_ops, tag_ops
+from src.features.database.records import ENTRY_SELECT, Entry
 
 def _norm_text(s: str | None) -> str:
     return (s or "").strip().lower()
@@ -34,70 +37,285 @@ def find_duplicate_id(db: BibliographyDB, authors: str, title: str, publication_
     row = c.fetchone()
     return row[0] if row else None
 
+def _flush_entries(c, insert_sql: str, batch: list[tuple], tag_pairs: list[tuple[int, str]]):
+    if batch:
+        c.executemany(insert_sql, batch)
+        batch.clear()
+    if tag_pairs:
+        c.executemany("INSERT INTO entry_tags (entry_id, tag) VALUES (?, ?)", tag_pairs)
+        tag_pairs.clear()
+
+def add_entries(db: BibliographyDB, rows: Iterable[dict], chunk_size: int = 1000) -> list[tuple[str, Any]]:
+    c = db.conn.cursor()
+    results: list[tuple[str, Any]] = []
+    batch: list[tuple] = []
+    tag_pairs: list[tuple[int, str]] = []
+    batch_keys: set[str] = set()
+    insert_sql = """INSERT INTO entries
+           (id, authors, title, venue, year, publication_date, volume, number, pages, doi, url, tags, created_at,
+            citation_key)
+           VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)"""
+    with db.transaction(immediate=True):
+        c.execute("""
+            SELECT id, lower(trim(title)), lower(trim(authors)), ifnull(trim(publication_date), '')
+            FROM entries
+        """)
+        known = {(t, a, p): i for i, t, a, p in c}
+        c.execute("SELECT ifnull(max(id), 0) FROM entries")
+        next_id = c.fetchone()[0] + 1
+
+        for kwargs in rows:
+            authors = (kwargs.get("authors") or "").strip()
+            title = (kwargs.get("title") or "").strip()
+            if not authors or not title:
+                results.append(("invalid", "Authors and Title are required"))
+                continue
+            key = (_norm_text(title), _norm_text(authors), _norm_pubdate(kwargs.get("publication_date")))
+            dup_id = known.get(key)
+            if dup_id is not None:
+                results.append(("duplicate", dup_id))
+                continue
+            known[key] = next_id
+            citation_key = citation_key_ops.key_for_entry(db, kwargs, reserved=batch_keys)
+            batch_keys.add(citation_key)
+            batch.append((
+                next_id, authors, title, kwargs.get("venue"), kwargs.get("year"), kwargs.get("publication_date"),
+                kwargs.get("volume"), kwargs.get("number"), kwargs.get("pages"), kwargs.get("doi"),
+                kwargs.get("url"), kwargs.get("tags"), db.utcnow_iso(), citation_key,
+            ))
+            tag_pairs.extend((next_id, tag) for tag in tag_ops.split_tags(kwargs.get("tags")))
+            results.append(("inserted", next_id))
+            next_id += 1
+            if len(batch) >= chunk_size:
+                _flush_entries(c, insert_sql, batch, tag_pairs)
+        _flush_entries(c, insert_sql, batch, tag_pairs)
+    return results
+
 def add_entry(db: BibliographyDB, **kwargs) -> int:
     authors = (kwargs.get("authors") or "").strip()
     title = (kwargs.get("title") or "").strip()
     if not authors or not title:
         raise ValueError("Authors and Title are required")
 
-    dup_id = find_duplicate_id(db, authors, title, kwargs.get("publication_date"))
-    if dup_id is not None:
-        raise ValueError(f"Duplicate entry detected (same Title + Authors + Publication Date) as id {dup_id}")
+    with db.transaction():
+        dup_id = find_duplicate_id(db, authors, title, kwargs.get("publication_date"))
+        if dup_id is not None:
+            raise ValueError(f"Duplicate entry detected (same Title + Authors + Publication Date) as id {dup_id}")
+
+        created_at = db.utcnow_iso()
+        citation_key = citation_key_ops.key_for_entry(db, {**kwargs, "authors": authors, "title": title})
+        c = db.conn.cursor()
+        c.execute(
+            """INSERT INTO entries
+               (authors, title, venue, year, publication_date, volume, number, pages, doi, url, tags, created_at, citation_key)
+               VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)""",                (                    authors,                    title,                    kwargs.get("venue"),                    kwargs.get("year"),                    kwargs.get("publication_date"),                    kwargs.get("volume"),                    kwargs.get("number"),                    kwargs.get("pages"),                    kwargs.get("doi"),                    kwargs.get("url"),                    kwargs.get("tags"),                    created_at,                    citation_key,                ),            )
+        entry_id = c.lastrowid
+        tag_ops.set_entry_tags(db, entry_id, kwargs.get("tags"))
+        return entry_id
 
-    created_at = db.utcnow_iso()
+def find_duplicate_groups(db: BibliographyDB) -> list[list[int]]:
+    """Ids sharing find_duplicate_id's normalized key (e.g. rows saved before duplicates were rejected)."""
     c = db.conn.cursor()
-    c.execute(
-        """INSERT INTO entries
-           (authors, title, venue, year, publication_date, volume, number, pages, doi, url, tags, created_at)
-           VALUES (?,?,?,?,?,?,?,?,?,?,?,?)""",                (                    authors,                    title,                    kwargs.get("venue"),                    kwargs.get("year"),                    kwargs.get("publication_date"),                    kwargs.get("volume"),                    kwargs.get("number"),                    kwargs.get("pages"),                    kwargs.get("doi"),                    kwargs.get("url"),                    kwargs.get("tags"),                    created_at,                ),            )
-    db.conn.commit()
-    return c.lastrowid
+    c.execute("""
+        SELECT group_concat(id) FROM entries
+        GROUP BY lower(trim(title)), lower(trim(authors)), ifnull(trim(publication_date), '')
+        HAVING count(*) > 1
+    """)
+    return [sorted(int(i) for i in ids.split(",")) for (ids,) in c.fetchall()]
+
+def merge_entries(db: BibliographyDB, keep_id: int, duplicate_ids: Iterable[int]):
+    """Move the duplicates' set memberships onto keep_id, then delete them."""
+    ids = [eid for eid in duplicate_ids if eid != keep_id]
+    with db.transaction():
+        c = db.conn.cursor()
+        c.executemany(
+            "INSERT OR IGNORE INTO set_entries (set_id, entry_id) SELECT set_id, ? FROM set_entries WHERE entry_id = ?",
+            [(keep_id, eid) for eid in ids],
+        )
+        delete_entries(db, ids)
 
 def update_entry(db: BibliographyDB, entry_id: int, **kwargs):
     if not kwargs:
         return
-    c = db.conn.cursor()
-    c.execute("SELECT authors, title, publication_date FROM entries WHERE id = ?", (entry_id,))
-    row = c.fetchone()
-    if not row:
-        raise ValueError("Entry not found")
-    cur_authors, cur_title, cur_pubdate = row
-    new_authors = kwargs.get("authors", cur_authors)
-    new_title = kwargs.get("title", cur_title)
-    new_pubdate = kwargs.get("publication_date", cur_pubdate)
-
-    dup_id = find_duplicate_id(db, new_authors, new_title, new_pubdate, exclude_id=entry_id)
-    if dup_id is not None:
-        raise ValueError(f"Update would create a duplicate of id {dup_id} (same Title + Authors + Publication Date)")
-
-    fields, values = [], []
-    for k, v in kwargs.items():
-        fields.append(f"{k} = ?")
-        values.append(v)
-    values.append(entry_id)
-    sql = f"UPDATE entries SET {', '.join(fields)} WHERE id = ?"
-    c.execute(sql, values)
-    db.conn.commit()
+    with db.transaction():
+        c = db.conn.cursor()
+        c.execute("SELECT authors, title, publication_date FROM entries WHERE id = ?", (entry_id,))
+        row = c.fetchone()
+        if not row:
+            raise ValueError("Entry not found")
+        cur_authors, cur_title, cur_pubdate = row
+        new_authors = kwargs.get("authors", cur_authors)
+        new_title = kwargs.get("title", cur_title)
+        new_pubdate = kwargs.get("publication_date", cur_pubdate)
+
+        dup_id = find_duplicate_id(db, new_authors, new_title, new_pubdate, exclude_id=entry_id)
+        if dup_id is not None:
+            raise ValueError(f"Update would create a duplicate of id {dup_id} (same Title + Authors + Publication Date)")
+
+        fields, values = [], []
+        for k, v in kwargs.items():
+            fields.append(f"{k} = ?")
+            values.append(v)
+        values.append(entry_id)
+        sql = f"UPDATE entries SET {', '.join(fields)} WHERE id = ?"
+        c.execute(sql, values)
+        if "tags" in kwargs:
+            tag_ops.set_entry_tags(db, entry_id, kwargs["tags"])
+
+def update_entries(db: BibliographyDB, updates: Iterable[tuple[int, dict]]):
+    with db.transaction():
+        for entry_id, fields in updates:
+            update_entry(db, entry_id, **fields)
+
+def delete_entries(db: BibliographyDB, entry_ids: Iterable[int]):
+    ids = [(entry_id,) for entry_id in entry_ids]
+    with db.transaction():
+        c = db.conn.cursor()
+        c.executemany("DELETE FROM entry_tags WHERE entry_id = ?", ids)
+        c.executemany("DELETE FROM entries WHERE id = ?", ids)
 
 def delete_entry(db: BibliographyDB, entry_id: int):
-    c = db.conn.cursor()
-    c.execute("DELETE FROM entries WHERE id = ?", (entry_id,))
-    db.conn.commit()
+    with db.transaction():
+        c = db.conn.cursor()
+        c.execute("DELETE FROM entry_tags WHERE entry_id = ?", (entry_id,))
+        c.execute("DELETE FROM entries WHERE id = ?", (entry_id,))
+
+# Sortable columns and the expression each one orders by; id breaks ties so paging is stable.
+SORT_COLUMNS = {
+    "authors": "authors COLLATE NOCASE", "title": "title COLLATE NOCASE", "venue": "venue COLLATE NOCASE",
+    "year": "year", "publication_date": "pub_sort", "tags": "tags COLLATE NOCASE", "created_at": "created_at",
+}
+
+def _order_clause(order_by: str | None, descending: bool) -> str:
+    if order_by is None:
+        return " ORDER BY created_at DESC, id DESC"
+    if order_by not in SORT_COLUMNS:
+        raise ValueError(f"Cannot sort by {order_by!r}")
+    direction = "DESC" if descending else "ASC"
+    return f" ORDER BY {SORT_COLUMNS[order_by]} {direction}, id {direction}"
 
-def list_entries(db: BibliographyDB, where_clause: str | None = None, params: Iterable[Any] = ()):
+def list_entries(db: BibliographyDB, where_clause: str | None = None, params: Iterable[Any] = (),
+                 after: tuple[str, int] | None = None, limit: int | None = None,
+                 order_by: str | None = None, descending: bool = False, offset: int = 0):
+    """Entry rows, newest first unless ``order_by`` names a SORT_COLUMNS key.
+
+    ``after`` is a keyset cursor for the default order; sorted listings page with ``offset``.
+    """
     c = db.conn.cursor()
     sql = "SELECT id, authors, title, venue, year, publication_date, tags, created_at FROM entries"
+    clauses, args = [], list(params) if params else []
     if where_clause:
-        sql += " WHERE " + where_clause
-    sql += " ORDER BY created_at DESC"
-    c.execute(sql, tuple(params) if params else ())
+        clauses.append(f"({where_clause})")
+    if after is not None:
+        if order_by is not None:
+            raise ValueError("Keyset cursors only apply to the default order; use offset")
+        # Keyset cursor: resume strictly after the last (created_at, id) already shown.
+        clauses.append("(created_at, id) < (?, ?)")
+        args += [after[0], after[1]]
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += _order_clause(order_by, descending)
+    if limit is not None or offset:
+        sql += " LIMIT ? OFFSET ?"
+        args += [-1 if limit is None else limit, offset]
+    c.execute(sql, args)
     return c.fetchall()
 
-def get_entry(db: BibliographyDB, entry_id: int) -> dict | None:
+def count_entries(db: BibliographyDB, where_clause: str | None = None, params: Iterable[Any] = ()) -> int:
     c = db.conn.cursor()
-    c.execute("SELECT * FROM entries WHERE id = ?", (entry_id,))
-    row = c.fetchone()
-    if not row:
-        return None
-    cols = [d[0] for d in c.description]
-    return dict(zip(cols, row))
+    sql = "SELECT COUNT(*) FROM entries"
+    if where_clause:
+        sql += f" WHERE ({where_clause})"
+    c.execute(sql, list(params) if params else [])
+    return c.fetchone()[0]
+
+def year_counts(db: BibliographyDB) -> list[tuple[int | None, int]]:
+    # year, else the year part of publication_date; None when neither is set.
+    c = db.conn.cursor()
+    c.execute("""
+        SELECT coalesce(year, CAST(nullif(substr(pub_sort, 1, 4), '') AS INTEGER)) AS y, COUNT(*)
+        FROM entries GROUP BY y ORDER BY y
+    """)
+    return c.fetchall()
+
+def keyset_cursor(row) -> tuple[str, int]:
+    return (row[7], row[0])
+
+def fts_query(text: str) -> str:
+    # Every word becomes a quoted prefix term, so user input can never be parsed as FTS syntax.
+    return " ".join(f'"{t}"*' for t in re.findall(r"\w+", text))
+
+def text_clause(text: str, has_fts: bool) -> tuple[str, tuple]:
+    query = fts_query(text) if has_fts else ""
+    if query:
+        return "id IN (SELECT rowid FROM entries_fts WHERE entries_fts MATCH ?)", (query,)
+    p = f"%{text}%"
+    return "(authors LIKE ? OR title LIKE ? OR tags LIKE ? OR venue LIKE ?)", (p, p, p, p)
+
+def text_match_clause(db: BibliographyDB, text: str) -> tuple[str, tuple]:
+    return text_clause(text, db.has_fts)
+
+def search_entries(db: BibliographyDB, text: str, limit: int | None = None, offset: int = 0):
+    query = fts_query(text) if db.has_fts else ""
+    if not query:
+        rows = list_entries(db, *text_match_clause(db, text))
+        return rows[offset:offset + limit] if limit is not None else rows[offset:]
+    c = db.conn.cursor()
+    c.execute(
+        """SELECT e.id, e.authors, e.title, e.venue, e.year, e.publication_date, e.tags, e.created_at
+           FROM entries_fts JOIN entries e ON e.id = entries_fts.rowid
+           WHERE entries_fts MATCH ?
+           ORDER BY bm25(entries_fts, 1.5, 2.0, 0.5, 1.0)
+           LIMIT ? OFFSET ?""",
+        (query, -1 if limit is None else limit, offset),
+    )
+    return c.fetchall()
+
+def list_entry_ids(db: BibliographyDB, where_clause: str | None = None, params: Iterable[Any] = (),
+                   order_by: str | None = None, descending: bool = False) -> list[int]:
+    c = db.conn.cursor()
+    sql = "SELECT id FROM entries"
+    if where_clause:
+        sql += f" WHERE ({where_clause})"
+    c.execute(sql + _order_clause(order_by, descending), list(params) if params else [])
+    return [row[0] for row in c.fetchall()]
+
+def search_entry_ids(db: BibliographyDB, fts_query: str) -> list[int]:
+    # Same ranking as search_entries; fts_query is already in fts_query() form.
+    c = db.conn.cursor()
+    c.execute(
+        "SELECT rowid FROM entries_fts WHERE entries_fts MATCH ? ORDER BY bm25(entries_fts, 1.5, 2.0, 0.5, 1.0)",
+        (fts_query,),
+    )
+    return [row[0] for row in c.fetchall()]
+
+def list_entries_by_ids(db: BibliographyDB, entry_ids: Iterable[int], chunk_size: int = 500):
+    """Entry rows in the order of ``entry_ids``; ids that no longer exist are skipped."""
+    entry_ids = list(entry_ids)
+    c = db.conn.cursor()
+    by_id = {}
+    for i in range(0, len(entry_ids), chunk_size):
+        chunk = entry_ids[i:i + chunk_size]
+        c.execute(
+            "SELECT id, authors, title, venue, year, publication_date, tags, created_at FROM entries "
+            f"WHERE id IN ({', '.join('?' * len(chunk))})",
+            chunk,
+        )
+        by_id.update((row[0], row) for row in c.fetchall())
+    return [by_id[eid] for eid in entry_ids if eid in by_id]
+
+def get_entry(db: BibliographyDB, entry_id: int) -> Entry | None:
+    c = db.conn.cursor()
+    c.execute(f"SELECT {ENTRY_SELECT} FROM entries WHERE id = ?", (entry_id,))
+    return c.fetchone()
+
+def get_entries(db: BibliographyDB, entry_ids: Iterable[int], chunk_size: int = 500) -> dict[int, Entry]:
+    """Full rows for ``entry_ids`` as {id: entry}; ids that do not exist are left out."""
+    entry_ids = list(entry_ids)
+    c = db.conn.cursor()
+    found = {}
+    for i in range(0, len(entry_ids), chunk_size):
+        chunk = entry_ids[i:i + chunk_size]
+        c.execute(f"SELECT {ENTRY_SELECT} FROM entries WHERE id IN ({', '.join('?' * len(chunk))})", chunk)
+        found.update((row[0], row) for row in c.fetchall())
+    return found
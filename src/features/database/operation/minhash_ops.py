@@ -0,0 +1,79 @@
+from __future__ import annotations
+from typing import Iterable, Iterator
+from src.features.database.db import BibliographyDB
+
+def unindexed_ids(db: BibliographyDB, version: int) -> list[int]:
+    """Entries without a signature from the current MinHash ``version`` (new, edited or never scanned)."""
+    c = db.conn.cursor()
+    c.execute(
+        """SELECT id FROM entries e
+           WHERE NOT EXISTS (SELECT 1 FROM entry_minhash m WHERE m.entry_id = e.id AND m.version = ?)""",
+        (version,),
+    )
+    return [row[0] for row in c.fetchall()]
+
+def unindexed_among(db: BibliographyDB, version: int, entry_ids: Iterable[int], chunk_size: int = 500) -> list[int]:
+    """The existing ones of ``entry_ids`` that lack a current signature; point lookups instead of unindexed_ids' scan."""
+    entry_ids = list(entry_ids)
+    c = db.conn.cursor()
+    found = []
+    for i in range(0, len(entry_ids), chunk_size):
+        chunk = entry_ids[i:i + chunk_size]
+        c.execute(
+            f"""SELECT id FROM entries e WHERE id IN ({', '.join('?' * len(chunk))})
+                AND NOT EXISTS (SELECT 1 FROM entry_minhash m WHERE m.entry_id = e.id AND m.version = ?)""",
+            [*chunk, version],
+        )
+        found.extend(row[0] for row in c.fetchall())
+    return found
+
+def store_signatures(db: BibliographyDB, version: int, rows: Iterable[tuple[int, bytes, list[tuple[int, int]]]]):
+    """Replace the signature and (band, bucket) keys of each (entry_id, signature, band_keys)."""
+    rows = list(rows)
+    ids = [(eid,) for eid, _, _ in rows]
+    with db.transaction():
+        c = db.conn.cursor()
+        c.executemany("DELETE FROM entry_lsh WHERE entry_id = ?", ids)
+        c.executemany(
+            "INSERT OR REPLACE INTO entry_minhash (entry_id, version, signature) VALUES (?, ?, ?)",
+            [(eid, version, sig) for eid, sig, _ in rows],
+        )
+        c.executemany(
+            "INSERT OR IGNORE INTO entry_lsh (band, bucket, entry_id) VALUES (?, ?, ?)",
+            [(band, bucket, eid) for eid, _, keys in rows for band, bucket in keys],
+        )
+
+def shared_buckets(db: BibliographyDB, max_bucket: int) -> Iterator[list[int]]:
+    """Entry ids of every bucket holding 2..max_bucket entries; bigger buckets are too generic to be useful."""
+    c = db.conn.cursor()
+    # Walks the (band, bucket) primary key in order, so grouping needs no temp b-tree.
+    c.execute(
+        """SELECT group_concat(entry_id) FROM entry_lsh GROUP BY band, bucket
+           HAVING count(*) BETWEEN 2 AND ?""",
+        (max_bucket,),
+    )
+    for (ids,) in c:
+        yield [int(i) for i in ids.split(",")]
+
+def bucket_members(db: BibliographyDB, keys: list[tuple[int, int]]) -> list[int]:
+    """Distinct entry ids sharing at least one (band, bucket) with ``keys``."""
+    if not keys:
+        return []
+    c = db.conn.cursor()
+    c.execute(
+        # An OR of (band, bucket) terms becomes one primary key search each; a row-value IN scans the table.
+        "SELECT DISTINCT entry_id FROM entry_lsh WHERE " + " OR ".join(["(band = ? AND bucket = ?)"] * len(keys)),
+        [v for key in keys for v in key],
+    )
+    return [row[0] for row in c.fetchall()]
+
+def entry_names(db: BibliographyDB, entry_ids: Iterable[int], chunk_size: int = 500) -> dict[int, tuple[str, str]]:
+    """{id: (authors, title)} for the ids that exist."""
+    entry_ids = list(entry_ids)
+    c = db.conn.cursor()
+    found = {}
+    for i in range(0, len(entry_ids), chunk_size):
+        chunk = entry_ids[i:i + chunk_size]
+        c.execute(f"SELECT id, authors, title FROM entries WHERE id IN ({', '.join('?' * len(chunk))})", chunk)
+        found.update((eid, (authors, title)) for eid, authors, title in c.fetchall())
+    return found
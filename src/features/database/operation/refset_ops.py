@@ -1,18 +1,31 @@
 from __future__ import annotations
+from typing import Iterable
 from src.features.database.db import BibliographyDB
 
 def create_refset(db: BibliographyDB, name: str) -> int:
     created_at = db.utcnow_iso()
-    c = db.conn.cursor()
-    c.execute("INSERT INTO refsets (name, created_at) VALUES (?, ?)", (name, created_at))
-    db.conn.commit()
-    return c.lastrowid
+    with db.transaction():
+        c = db.conn.cursor()
+        c.execute("INSERT INTO refsets (name, created_at) VALUES (?, ?)", (name, created_at))
+        return c.lastrowid
 
 def delete_refset(db: BibliographyDB, set_id: int):
+    with db.transaction():
+        c = db.conn.cursor()
+        c.execute("DELETE FROM refsets WHERE id = ?", (set_id,))
+        c.execute("DELETE FROM set_entries WHERE set_id = ?", (set_id,))
+
+def delete_refsets(db: BibliographyDB, set_ids: Iterable[int]):
+    ids = [(set_id,) for set_id in set_ids]
+    with db.transaction():
+        c = db.conn.cursor()
+        c.executemany("DELETE FROM set_entries WHERE set_id = ?", ids)
+        c.executemany("DELETE FROM refsets WHERE id = ?", ids)
+
+def get_refset(db: BibliographyDB, set_id: int):
     c = db.conn.cursor()
-    c.execute("DELETE FROM refsets WHERE id = ?", (set_id,))
-    c.execute("DELETE FROM set_entries WHERE set_id = ?", (set_id,))
-    db.conn.commit()
+    c.execute("SELECT id, name, created_at FROM refsets WHERE id = ?", (set_id,))
+    return c.fetchone()
 
 def list_refsets(db: BibliographyDB):
     c = db.conn.cursor()
@@ -1,19 +1,71 @@
 from __future__ import annotations
 import sqlite3
+from typing import Any, Iterable
 from src.features.database.db import BibliographyDB
+from src.features.database.operation import refset_ops
+
+_SET_OPERATORS = {"union": "UNION", "intersection": "INTERSECT", "difference": "EXCEPT"}
 
 def add_entry_to_set(db: BibliographyDB, set_id: int, entry_id: int):
-    c = db.conn.cursor()
     try:
-        c.execute("INSERT INTO set_entries (set_id, entry_id) VALUES (?,?)", (set_id, entry_id))
-        db.conn.commit()
+        with db.transaction():
+            c = db.conn.cursor()
+            c.execute("INSERT INTO set_entries (set_id, entry_id) VALUES (?,?)", (set_id, entry_id))
     except sqlite3.IntegrityError:
         pass
 
 def remove_entry_from_set(db: BibliographyDB, set_id: int, entry_id: int):
-    c = db.conn.cursor()
-    c.execute("DELETE FROM set_entries WHERE set_id = ? AND entry_id = ?", (set_id, entry_id))
-    db.conn.commit()
+    with db.transaction():
+        c = db.conn.cursor()
+        c.execute("DELETE FROM set_entries WHERE set_id = ? AND entry_id = ?", (set_id, entry_id))
+
+def add_entries_to_set(db: BibliographyDB, set_id: int, entry_ids: Iterable[int]) -> int:
+    # Selecting through entries skips ids that no longer exist instead of failing the foreign key.
+    with db.transaction():
+        c = db.conn.cursor()
+        c.executemany(
+            "INSERT OR IGNORE INTO set_entries (set_id, entry_id) SELECT ?, id FROM entries WHERE id = ?",
+            ((set_id, entry_id) for entry_id in entry_ids),
+        )
+        return max(c.rowcount, 0)
+
+def remove_entries_from_set(db: BibliographyDB, set_id: int, entry_ids: Iterable[int]) -> int:
+    with db.transaction():
+        c = db.conn.cursor()
+        c.executemany(
+            "DELETE FROM set_entries WHERE set_id = ? AND entry_id = ?",
+            ((set_id, entry_id) for entry_id in entry_ids),
+        )
+        return max(c.rowcount, 0)
+
+def add_matching_entries_to_set(db: BibliographyDB, set_id: int, where_clause: str | None = None,
+                                params: Iterable[Any] = ()) -> int:
+    sql = "INSERT OR IGNORE INTO set_entries (set_id, entry_id) SELECT ?, id FROM entries"
+    if where_clause:
+        sql += f" WHERE ({where_clause})"
+    with db.transaction():
+        c = db.conn.cursor()
+        c.execute(sql, (set_id, *params))
+        return c.rowcount
+
+def combine_sets(db: BibliographyDB, operation: str, left_id: int, right_id: int, name: str) -> tuple[int, int]:
+    """Create set ``name`` as left ∪/∩/− right entirely in SQL; returns (new set id, entry count)."""
+    operator = _SET_OPERATORS.get(operation)
+    if operator is None:
+        raise ValueError(f"Unknown set operation {operation!r} (expected one of {', '.join(_SET_OPERATORS)})")
+    with db.transaction():
+        new_id = refset_ops.create_refset(db, name)
+        c = db.conn.cursor()
+        c.execute(
+            f"""INSERT INTO set_entries (set_id, entry_id)
+                SELECT ?, entry_id FROM (
+                    SELECT entry_id FROM set_entries WHERE set_id = ?
+                    {operator}
+                    SELECT entry_id FROM set_entries WHERE set_id = ?
+                )""",
+            (new_id, left_id, right_id),
+        )
+        return new_id, c.rowcount
 
 def list_entries_in_set(db: BibliographyDB, set_id: int):
     c = db.conn.cursor()
@@ -22,3 +74,17 @@ def list_entries_in_set(db: BibliographyDB, set_id: int):
            FROM entries e JOIN set_entries s ON e.id = s.entry_id
            WHERE s.set_id = ? ORDER BY e.created_at DESC""",                (set_id,),            )
     return c.fetchall()
+
+def list_sets_of_entry(db: BibliographyDB, entry_id: int):
+    c = db.conn.cursor()
+    c.execute(
+        """SELECT r.id, r.name FROM refsets r JOIN set_entries s ON r.id = s.set_id
+           WHERE s.entry_id = ? ORDER BY r.name""",
+        (entry_id,),
+    )
+    return c.fetchall()
+
+def count_entries_in_set(db: BibliographyDB, set_id: int) -> int:
+    c = db.conn.cursor()
+    c.execute("SELECT COUNT(*) FROM set_entries WHERE set_id = ?", (set_id,))
+    return c.fetchone()[0]
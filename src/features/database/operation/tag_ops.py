@@ -0,0 +1,35 @@
+from __future__ import annotations
+from src.features.database.db import BibliographyDB
+
+def split_tags(tags: str | None) -> list[str]:
+    out: list[str] = []
+    for tag in (tags or "").split(","):
+        tag = tag.strip().lower()
+        if tag and tag not in out:
+            out.append(tag)
+    return out
+
+def set_entry_tags(db: BibliographyDB, entry_id: int, tags: str | None):
+    c = db.conn.cursor()
+    c.execute("DELETE FROM entry_tags WHERE entry_id = ?", (entry_id,))
+    c.executemany(
+        "INSERT INTO entry_tags (entry_id, tag) VALUES (?, ?)",
+        [(entry_id, tag) for tag in split_tags(tags)],
+    )
+
+def tag_filter_clause(tag: str) -> tuple[str, tuple]:
+    return "id IN (SELECT entry_id FROM entry_tags WHERE tag = ?)", (tag.strip().lower(),)
+
+def count_tag(db: BibliographyDB, tag: str) -> int:
+    c = db.conn.cursor()
+    c.execute("SELECT COUNT(*) FROM entry_tags WHERE tag = ?", (tag.strip().lower(),))
+    return c.fetchone()[0]
+
+def tag_counts(db: BibliographyDB, limit: int | None = None) -> list[tuple[str, int]]:
+    c = db.conn.cursor()
+    c.execute(
+        """SELECT tag, COUNT(*) AS n FROM entry_tags
+           GROUP BY tag ORDER BY n DESC, tag LIMIT ?""",
+        (-1 if limit is None else limit,),
+    )
+    return c.fetchall()
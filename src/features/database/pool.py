@@ -0,0 +1,93 @@
+from __future__ import annotations
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+DEFAULT_READERS = 4
+
+class ReadView:
+    """What read operations use from a BibliographyDB, backed by a pooled read-only connection."""
+
+    def __init__(self, db, conn: sqlite3.Connection):
+        self.db, self.conn = db, conn
+
+    @property
+    def has_fts(self) -> bool:
+        return self.db.has_fts
+
+    @property
+    def db_file(self) -> str:
+        return self.db.db_file
+
+    def data_version(self) -> int:
+        # The changelog's newest seq is the same whichever connection reads it, so ask this one.
+        row = self.conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'changelog'").fetchone()
+        return row[0] if row else 0
+
+class ReaderPool:
+    """Up to ``size`` read-only connections (``file:...?mode=ro``) shared between threads.
+
+    Connections are opened on demand and handed out exclusively: ``checkout()`` blocks while all of
+    them are in use, ``checkin()`` returns one. In WAL mode readers and the writer never block each other.
+    """
+
+    def __init__(self, db_file: str, size: int, connect: Callable[..., sqlite3.Connection],
+                 setup: Callable[[sqlite3.Connection], Any]):
+        self.size = size
+        self._uri = Path(db_file).resolve().as_uri() + "?mode=ro"
+        self._connect, self._setup = connect, setup
+        # LIFO: the most recently used connection has the warmest page cache.
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._opened: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def checkout(self, timeout: float | None = None) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Cannot operate on a closed reader pool")
+            if len(self._opened) < self.size:
+                conn = self._connect(self._uri, uri=True, check_same_thread=False)
+                self._setup(conn)
+                self._opened.append(conn)
+                return conn
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No reader connection free after {timeout}s") from None
+
+    def checkin(self, conn: sqlite3.Connection):
+        if self._closed:
+            conn.close()
+            return
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self, timeout: float | None = None) -> Iterator[sqlite3.Connection]:
+        conn = self.checkout(timeout)
+        try:
+            yield conn
+        finally:
+            self.checkin(conn)
+
+    @property
+    def opened(self) -> int:
+        return len(self._opened)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._opened = []
+        # Checked-out connections are closed by checkin().
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
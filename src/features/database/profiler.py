@@ -0,0 +1,302 @@
+from __future__ import annotations
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from itertools import chain
+
+# Opt-in statement profiling for BibliographyDB. Enable with BibliographyDB(profiler=True | "stats.json" |
+# QueryProfiler(...)) or BIBAPP_DB_PROFILER=1 / =path/to/stats.json without code changes.
+PROFILER_ENV = "BIBAPP_DB_PROFILER"
+SLOW_MS = 50.0
+# Histogram bucket upper bounds in milliseconds; the last bucket catches everything slower.
+BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, float("inf"))
+
+_OP_PACKAGE = ".database.operation."
+_WS = re.compile(r"\s+")
+
+def resolve_profiler(profiler: QueryProfiler | bool | str | None) -> tuple[QueryProfiler | None, bool]:
+    """Return ``(profiler, owned)``; an owned profiler is dumped when its database closes."""
+    if isinstance(profiler, QueryProfiler):
+        return profiler, False
+    if profiler is None:
+        profiler = os.environ.get(PROFILER_ENV) or False
+        if profiler in ("0", "false", "off"):
+            profiler = False
+        elif profiler in ("1", "true", "on", "stderr"):
+            profiler = True
+    if profiler is False:
+        return None, False
+    return QueryProfiler(output=None if profiler is True else profiler), True
+
+def _op_name(frame) -> str:
+    # Attribute to the outermost frame inside database/operation (the op the caller asked for);
+    # statements issued elsewhere are named after the first frame outside this module.
+    op, fallback = None, None
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module != __name__:
+            short = f"{module.rsplit('.', 1)[-1]}.{frame.f_code.co_name}"
+            if _OP_PACKAGE in f".{module}.":
+                op = short
+            elif fallback is None:
+                fallback = short
+        frame = frame.f_back
+    return op or fallback or "<unknown>"
+
+def _normalize(sql: str) -> str:
+    return _WS.sub(" ", sql).strip()
+
+class _QueryStats:
+    __slots__ = ("op", "sql", "calls", "traced", "rows", "total_ms", "max_ms", "slow", "plan", "histogram")
+
+    def __init__(self, op: str, sql: str):
+        self.op, self.sql = op, sql
+        self.calls = self.traced = self.rows = self.slow = 0
+        self.total_ms = self.max_ms = 0.0
+        self.plan: list[str] | None = None
+        self.histogram = [0] * len(BUCKETS_MS)
+
+    def add(self, elapsed_ms: float, rows: int):
+        self.calls += 1
+        self.rows += rows
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.histogram[next(i for i, bound in enumerate(BUCKETS_MS) if elapsed_ms <= bound)] += 1
+
+    def percentile(self, q: float) -> float:
+        # Upper bound of the bucket holding the q-th sample, capped at the slowest sample seen.
+        seen, target = 0, q * self.calls
+        for bound, count in zip(BUCKETS_MS, self.histogram):
+            seen += count
+            if count and seen >= target:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def as_dict(self) -> dict:
+        return {
+            "op": self.op, "sql": self.sql, "calls": self.calls, "traced": self.traced, "rows": self.rows,
+            "total_ms": round(self.total_ms, 3), "mean_ms": round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            "max_ms": round(self.max_ms, 3), "p50_ms": round(self.percentile(0.5), 3),
+            "p95_ms": round(self.percentile(0.95), 3), "slow": self.slow, "plan": self.plan,
+            "histogram": {f"<={b:g}" if b != float("inf") else f">{BUCKETS_MS[-2]:g}": n
+                          for b, n in zip(BUCKETS_MS, self.histogram) if n},
+        }
+
+class QueryProfiler:
+    """Collects per-statement latency histograms, row counts and plans of slow statements, keyed by op."""
+
+    def __init__(self, slow_ms: float = SLOW_MS, output: str | None = None):
+        self.slow_ms = slow_ms
+        self.output = output
+        self._stats: dict[tuple[str, str], _QueryStats] = {}
+        self._lock = threading.RLock()
+        # Set while this thread runs the profiler's own statements (EXPLAIN), which trace() skips.
+        self._untraced = threading.local()
+
+    def _entry(self, op: str, sql: str) -> _QueryStats:
+        key = (op, sql)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = _QueryStats(op, sql)
+        return stats
+
+    def trace(self, sql: str):
+        # set_trace_callback hook: counts every statement SQLite runs, including implicit BEGINs
+        # and trigger bodies that never pass through a cursor.
+        if getattr(self._untraced, "active", False):
+            return
+        op = _op_name(sys._getframe(1))
+        with self._lock:
+            self._entry(op, _normalize(sql)).traced += 1
+
+    def record(self, op: str, sql: str, elapsed_ms: float, rows: int, plan_source=None):
+        sql = _normalize(sql)
+        with self._lock:
+            stats = self._entry(op, sql)
+            stats.add(elapsed_ms, rows)
+            slow = elapsed_ms >= self.slow_ms
+            if slow:
+                stats.slow += 1
+            want_plan = slow and stats.plan is None
+        if want_plan and plan_source is not None:
+            plan = plan_source()
+            with self._lock:
+                stats.plan = plan
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def summary(self) -> dict:
+        with self._lock:
+            queries = sorted((s.as_dict() for s in self._stats.values()), key=lambda q: -q["total_ms"])
+        ops: dict[str, dict] = {}
+        for q in queries:
+            op = ops.setdefault(q["op"], {"calls": 0, "statements": 0, "rows": 0, "total_ms": 0.0, "slow": 0})
+            op["calls"] += q["calls"]
+            op["statements"] += max(q["calls"], q["traced"])
+            op["rows"] += q["rows"]
+            op["total_ms"] = round(op["total_ms"] + q["total_ms"], 3)
+            op["slow"] += q["slow"]
+        return {
+            "slow_ms": self.slow_ms,
+            "total_ms": round(sum(q["total_ms"] for q in queries), 3),
+            "ops": dict(sorted(ops.items(), key=lambda kv: -kv[1]["total_ms"])),
+            "queries": queries,
+        }
+
+    def format_summary(self, top: int = 20) -> str:
+        s = self.summary()
+        lines = [f"query profile: {s['total_ms']:.1f} ms in {len(s['queries'])} distinct statements"]
+        lines.append(f"{'op':<40}{'calls':>8}{'rows':>10}{'total ms':>12}{'slow':>6}")
+        for name, op in s["ops"].items():
+            lines.append(f"{name:<40}{op['calls']:>8}{op['rows']:>10}{op['total_ms']:>12.1f}{op['slow']:>6}")
+        lines.append(f"top statements (p50/p95 ms):")
+        for q in s["queries"][:top]:
+            if not q["calls"]:
+                continue
+            lines.append(f"  {q['total_ms']:>9.1f} ms  {q['calls']:>6}x  {q['p50_ms']:g}/{q['p95_ms']:g}  {q['op']}: {q['sql'][:100]}")
+            for detail in q["plan"] or ():
+                lines.append(f"      plan: {detail}")
+        return "\n".join(lines)
+
+    def dump(self, path: str | None = None):
+        """Write the summary as JSON to ``path`` (or ``self.output``); without either print it to stderr."""
+        path = path or self.output
+        if path is None:
+            print(self.format_summary(), file=sys.stderr)
+            return
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+            f.write("\n")
+
+class ProfiledCursor(sqlite3.Cursor):
+    # A sample spans execute() plus the fetches that drain it, since SQLite does most of its work while stepping.
+    _pending = None
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        return self._run(super().execute, sql, parameters, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        params = iter(seq_of_parameters)
+        first = next(params, None)
+        if first is not None:
+            params = chain([first], params)
+        return self._run(super().executemany, sql, params, first)
+
+    def _run(self, call, sql, parameters, plan_params):
+        op = _op_name(sys._getframe(2))
+        start = time.perf_counter()
+        try:
+            call(sql, parameters)
+        finally:
+            elapsed = time.perf_counter() - start
+        self._pending = [op, sql, plan_params, elapsed, 0]
+        if self.description is None:
+            self._finish(max(self.rowcount, 0))
+        return self
+
+    def _fetched(self, start: float, rows: int, done: bool):
+        pending = self._pending
+        if pending is not None:
+            pending[3] += time.perf_counter() - start
+            pending[4] += rows
+            if done:
+                self._finish()
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(start, row is not None, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        start = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._fetched(start, len(rows), len(rows) < size)
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(start, len(rows), True)
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(start, 0, True)
+            raise
+        self._fetched(start, 1, False)
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        self._finish()
+
+    def _finish(self, rows: int | None = None):
+        pending, self._pending = self._pending, None
+        if pending is None:
+            return
+        op, sql, params, elapsed, fetched = pending
+        conn = self.connection
+        conn.profiler.record(op, sql, elapsed * 1000, fetched if rows is None else rows,
+                             lambda: conn.explain(sql, params))
+
+class ProfiledConnection(sqlite3.Connection):
+    """Connection factory that routes every statement through ProfiledCursor and times commits."""
+    profiler: QueryProfiler
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self):
+        self._timed("COMMIT", super().commit)
+
+    def rollback(self):
+        self._timed("ROLLBACK", super().rollback)
+
+    def _timed(self, sql: str, call):
+        pending = self.in_transaction
+        start = time.perf_counter()
+        call()
+        if pending:
+            self.profiler.record(_op_name(sys._getframe(2)), sql, (time.perf_counter() - start) * 1000, 0)
+
+    def explain(self, sql: str, params) -> list[str] | None:
+        # Plain cursor, and trace() told to skip this thread, so the EXPLAIN itself stays out of the report.
+        # The trace callback stays installed: other threads' statements on this connection are still counted.
+        untraced = self.profiler._untraced
+        untraced.active = True
+        try:
+            cur = super().cursor()
+            cur.execute(f"EXPLAIN QUERY PLAN {sql}", params or ())
+            return [row[3] for row in cur.fetchall()]
+        except sqlite3.Error:
+            return None
+        finally:
+            untraced.active = False
+
+def connect(db_file: str, profiler: QueryProfiler, **kwargs) -> ProfiledConnection:
+    conn = sqlite3.connect(db_file, factory=ProfiledConnection, **kwargs)
+    conn.profiler = profiler
+    conn.set_trace_callback(profiler.trace)
+    return conn
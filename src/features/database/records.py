@@ -0,0 +1,97 @@
+from __future__ import annotations
+from operator import itemgetter
+from typing import Any, Callable
+
+# Every column of the entries table in table order, except the generated pub_sort sort key, which is
+# only filtered and ordered on. List views select eight of them (see entry_ops.list_entries) and leave
+# out the heavier volume/number/pages/doi/url/citation_key, which records load on first access.
+ENTRY_COLUMNS = ("id", "authors", "title", "venue", "year", "publication_date", "volume", "number", "pages",
+                 "doi", "url", "tags", "created_at", "citation_key")
+# Use instead of SELECT *, which would also return pub_sort.
+ENTRY_SELECT = ", ".join(ENTRY_COLUMNS)
+_ENTRY_COLUMN_SET = frozenset(ENTRY_COLUMNS)
+
+class Entry(tuple):
+    """A row of the entries table.
+
+    Still a tuple, so ``entry_id, authors, title, *rest = row`` and ``row[0]`` keep working, but columns
+    are also attributes (``entry.title``) and keys (``entry["title"]``, ``entry.get("doi")``,
+    ``dict(entry)``). A record only holds the columns its query selected; reading any other entries
+    column fetches the full row by id through the connection that produced it, so do that on the
+    same thread (or call ``load()`` once and use the result).
+    """
+    __slots__ = ()
+    _fields: tuple[str, ...] = ()
+    _index: dict[str, int] = {}
+    _conn: Any = None
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            i = self._index.get(key)
+            return self._missing(key) if i is None else tuple.__getitem__(self, i)
+        return tuple.__getitem__(self, key)
+
+    def __getattr__(self, name: str):
+        # Only called for names that are not selected columns (those are properties on the subclass).
+        if name in _ENTRY_COLUMN_SET:
+            return self._missing(name)
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def _missing(self, name: str):
+        if name not in _ENTRY_COLUMN_SET:
+            raise KeyError(name)
+        full = self.load()
+        return None if full is None else full[name]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self) -> tuple[str, ...]:
+        return self._fields
+
+    def load(self) -> Entry | None:
+        """This record with every column; None if the entry was deleted since."""
+        if len(self._fields) == len(ENTRY_COLUMNS):
+            return self
+        return self._conn.execute(f"SELECT {ENTRY_SELECT} FROM entries WHERE id = ?", (self[0],)).fetchone()
+
+    def __repr__(self) -> str:
+        return "Entry(" + ", ".join(f"{k}={v!r}" for k, v in zip(self._fields, self)) + ")"
+
+    def __reduce__(self):
+        # Layout classes are generated per connection; pickle as a plain tuple.
+        return tuple, (tuple(self),)
+
+def _record_class(names: tuple[str, ...], conn) -> type[Entry] | None:
+    """Record class for one column layout, or None when the result is not a row of entries."""
+    if not names or names[0] != "id" or "title" not in names or not _ENTRY_COLUMN_SET.issuperset(names):
+        return None
+    namespace = {name: property(itemgetter(i)) for i, name in enumerate(names)}
+    namespace.update(__slots__=(), _fields=names, _index={name: i for i, name in enumerate(names)}, _conn=conn)
+    return type("Entry", (Entry,), namespace)
+
+def row_factory() -> Callable[[Any, tuple], tuple]:
+    """sqlite3 row_factory turning entries rows into Entry records and leaving every other row a plain tuple.
+
+    Set one per connection: records load their missing columns through the connection that produced them.
+    """
+    classes: dict[tuple[str, ...], type[Entry] | None] = {}
+    last: tuple[Any, type[Entry] | None] = (None, None)
+
+    def factory(cursor, row):
+        nonlocal last
+        desc, cls = last
+        # description is one object per statement, so the layout lookup happens once per query, not per row.
+        if cursor.description is not desc:
+            desc = cursor.description
+            names = tuple(d[0] for d in desc)
+            if names not in classes:
+                classes[names] = _record_class(names, cursor.connection)
+            cls = classes[names]
+            last = (desc, cls)
+        return row if cls is None else tuple.__new__(cls, row)
+
+    return factory
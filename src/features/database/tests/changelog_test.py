@@ -0,0 +1,91 @@
+import pytest
+
+from features.database import db
+from features.database.changelog import ChangeFeed
+from features.database.operation import changelog_ops
+from features.entries_services.entries_service import EntriesService
+from features.refsets_services.refsets_service import RefsetsService
+from features.search import SearchService
+
+def _events(database, since=0):
+    return [(c.table, c.op, c.row_id, c.entry_id) for c in changelog_ops.changes_since(database, since)]
+
+# Changelog tests
+def test_triggers_log_every_write(temp_db):
+    entries, refsets = EntriesService(temp_db), RefsetsService(temp_db)
+    eid = entries.add(authors="Doe, J.", title="Logged")
+    start = changelog_ops.current_seq(temp_db)
+    set_id = refsets.create("Reading")
+    refsets.add_entry(set_id, eid)
+    entries.update(eid, title="Renamed")
+    entries.delete(eid)
+    assert _events(temp_db, start) == [
+        ("refsets", "I", set_id, None), ("set_entries", "I", set_id, eid), ("entries", "U", eid, None),
+        # The membership goes with the entry (ON DELETE CASCADE) and is logged as its own event.
+        ("set_entries", "D", set_id, eid), ("entries", "D", eid, None),
+    ]
+    seqs = [c.seq for c in changelog_ops.changes_since(temp_db, 0)]
+    assert seqs == sorted(seqs) and seqs[-1] == changelog_ops.current_seq(temp_db)
+
+def test_rolled_back_writes_leave_no_events(temp_db):
+    start = changelog_ops.current_seq(temp_db)
+    with pytest.raises(RuntimeError):
+        with temp_db.transaction():
+            EntriesService(temp_db).add(authors="Doe, J.", title="Rolled back")
+            raise RuntimeError
+    assert changelog_ops.changes_since(temp_db, start) == []
+
+def test_compact_keeps_the_latest_event_per_row(temp_db):
+    entries = EntriesService(temp_db)
+    a, b = entries.add(authors="A", title="First"), entries.add(authors="B", title="Second")
+    for i in range(3):
+        entries.update(a, title=f"First {i}")
+    entries.delete(b)
+    assert changelog_ops.compact_changes(temp_db) == 4
+    assert _events(temp_db) == [("entries", "U", a, None), ("entries", "D", b, None)]
+    assert changelog_ops.entry_changes(changelog_ops.changes_since(temp_db, 0)) == ({a}, {b})
+
+def test_prune_keeps_seq_monotonic_and_rejects_stale_readers(temp_db):
+    entries = EntriesService(temp_db)
+    entries.add(authors="A", title="First")
+    upto = changelog_ops.current_seq(temp_db)
+    assert changelog_ops.prune_changes(temp_db, upto) == 1
+    with pytest.raises(changelog_ops.ChangesPruned):
+        changelog_ops.changes_since(temp_db, upto - 1)
+    assert changelog_ops.changes_since(temp_db, upto) == []
+    eid = entries.add(authors="B", title="Second")
+    assert changelog_ops.changes_since(temp_db, upto) == [(upto + 1, "entries", "I", eid, None)]
+
+def test_feed_follows_commits(temp_db):
+    feed, entries = ChangeFeed(temp_db), EntriesService(temp_db)
+    assert feed.poll() == []
+    eid = entries.add(authors="A", title="Followed")
+    assert [(c.op, c.row_id) for c in feed.poll()] == [("I", eid)]
+    assert feed.poll() == []
+    with temp_db.transaction():
+        entries.update(eid, title="Uncommitted")
+        assert feed.poll() is None  # seqs handed out inside a transaction may be reused after a rollback
+    for i in range(3):
+        entries.update(eid, title=f"Edit {i}")
+    assert feed.poll(limit=2) is None and feed.poll() == []
+
+def test_caches_drop_only_what_changed(temp_db):
+    entries = EntriesService(temp_db)
+    ids = [entries.add(authors=f"Author {i}", title=f"Graph {i}") for i in range(4)]
+    kept, edited = entries.get(ids[0]), entries.get(ids[1])
+    search = SearchService(temp_db)
+    assert search.ids("graph") and len(search._results) == 1
+
+    other = db.BibliographyDB(temp_db.db_file)
+    EntriesService(other).update(ids[1], title="Graph edited")
+    assert entries.get(ids[0]) is kept and entries.get(ids[1]) is not edited
+    assert entries.get(ids[1]).title == "Graph edited"
+
+    # Set changes and deletions keep cached search results; the deleted ids are filtered out.
+    search.ids("graph")
+    RefsetsService(other).add_entry(RefsetsService(other).create("Reading"), ids[2])
+    EntriesService(other).delete(ids[3])
+    other.close()
+    plan = search.plan("graph")
+    assert search.ids("graph") == search._results[plan] and ids[3] not in search.ids("graph")
+    assert sorted(search.ids("graph")) == ids[:3]
@@ -0,0 +1,59 @@
+import os
+import sqlite3
+import tempfile
+
+import pytest
+
+import features.database.db as db
+from features.bibtex.bibtex import entry_to_bibtex
+from features.entries_services.entries_service import EntriesService
+
+# Citation key tests
+def test_keys_are_stored_and_suffixed(temp_db):
+    service = EntriesService(temp_db)
+    first = service.add(authors="Smith, J.", title="Graphs everywhere", year=2020)
+    second = service.add(authors="Smith, A.", title="Graphs anywhere", year=2020)
+    third = service.add(authors="Smith, B.", title="Graph theory", year=2020)
+    assert service.get(first)["citation_key"] == "smith2020graphs"
+    assert service.get(second)["citation_key"] == "smith2020graphsa"
+    assert service.get(third)["citation_key"] == "smith2020grapht"
+
+def test_bulk_keys_unique_within_batch(temp_db):
+    service = EntriesService(temp_db)
+    results = service.add_many({"authors": "Müller, K.", "title": f"Über alles {i}", "year": 1999} for i in range(30))
+    keys = [service.get(eid)["citation_key"] for _, eid in results]
+    assert keys[:3] == ["muller1999uberal", "muller1999uberala", "muller1999uberalb"]
+    assert len(set(keys)) == 30
+
+def test_supplied_key_is_kept_or_suffixed(temp_db):
+    service = EntriesService(temp_db)
+    a = service.add(authors="Doe", title="One", citation_key="doe:one")
+    b = service.add(authors="Doe", title="Two", citation_key="doe:one")
+    assert service.get(a)["citation_key"] == "doe:one"
+    assert service.get(b)["citation_key"] == "doe:onea"
+    with pytest.raises(sqlite3.IntegrityError):
+        service.update(b, citation_key="doe:one")
+
+def test_export_reuses_stored_key(temp_db):
+    service = EntriesService(temp_db)
+    entry_id = service.add(authors="Doe, J.", title="Stable keys", year=2021)
+    service.update(entry_id, title="Renamed later")
+    assert entry_to_bibtex(service.get(entry_id)).startswith("@misc{doe2021stable,")
+
+def test_missing_keys_are_backfilled():
+    fd, db_path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    conn = sqlite3.connect(db_path)
+    conn.execute("""CREATE TABLE entries (id INTEGER PRIMARY KEY, authors TEXT NOT NULL, title TEXT NOT NULL,
+        venue TEXT, year INTEGER, publication_date TEXT, volume INTEGER, number INTEGER, pages TEXT,
+        doi TEXT, url TEXT, tags TEXT, created_at TEXT NOT NULL)""")
+    conn.executemany("INSERT INTO entries (authors, title, year, created_at) VALUES (?, ?, 2010, '2024-01-01')",
+                     [("Lee", "Same start"), ("Lee", "Same start again")])
+    conn.commit(); conn.close()
+    database = db.BibliographyDB(db_path)
+    try:
+        keys = [r[0] for r in database.conn.execute("SELECT citation_key FROM entries ORDER BY id")]
+        assert keys == ["lee2010samest", "lee2010samesta"]
+    finally:
+        database.close()
+        os.remove(db_path)
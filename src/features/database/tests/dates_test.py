@@ -0,0 +1,36 @@
+import pytest
+
+from features.database.dates import prefix_clause, prefix_to_range, pub_sort_range, range_clause
+from features.entries_services.entries_service import EntriesService
+
+# Date filter tests
+def test_prefix_to_range():
+    assert prefix_to_range("2024") == ("2024-01-01", "2025-01-01")
+    assert prefix_to_range("2024-12") == ("2024-12-01", "2025-01-01")
+    assert prefix_to_range("2024-02-29") == ("2024-02-29", "2024-03-01")
+    with pytest.raises(ValueError):
+        prefix_to_range("24-1")
+
+def test_pub_sort_range_brackets_partial_dates():
+    assert pub_sort_range("2021") == ("2021-00-00", "2022-00-00")
+    assert pub_sort_range("2021-12") == ("2021-12-00", "2021-13-00")
+    assert pub_sort_range("2021-03-31") == ("2021-03-31", "2021-03-32")
+
+def _matching(db, where, params):
+    return {r[5] for r in EntriesService(db).list(where, params)}
+
+def test_pub_filters_match_like_prefix(temp_db):
+    service = EntriesService(temp_db)
+    for i, pub in enumerate(["2021", "2021-03", "2021-03-04", "2021-04", "2021-12-31", "2022-01", None]):
+        service.add(authors="Doe, J.", title=f"Paper {i}", publication_date=pub)
+    assert _matching(temp_db, *prefix_clause("publication_date", "2021")) == {"2021", "2021-03", "2021-03-04", "2021-04", "2021-12-31"}
+    assert _matching(temp_db, *prefix_clause("publication_date", "2021-03")) == {"2021-03", "2021-03-04"}
+    assert _matching(temp_db, *prefix_clause("publication_date", "2021-03-04")) == {"2021-03-04"}
+    assert _matching(temp_db, *range_clause("publication_date", "2021-04", "2022")) == {"2021-04", "2021-12-31", "2022-01"}
+    assert _matching(temp_db, *range_clause("publication_date", None, "2021-03")) == {"2021", "2021-03", "2021-03-04"}
+
+def test_date_filters_use_indexes(temp_db):
+    for column, index in (("publication_date", "idx_entries_pub_sort"), ("created_at", "idx_entries_created")):
+        where, params = prefix_clause(column, "2021-03")
+        plan = temp_db.conn.execute(f"EXPLAIN QUERY PLAN SELECT id FROM entries WHERE {where}", params).fetchall()
+        assert any(index in row[3] for row in plan)
@@ -10,4 +10,41 @@ def test_close_db(temp_db):
     database = temp_db
     database.close()
     with pytest.raises(Exception):
-        database.conn.execute("SELECT 1")
\ No newline at end of file
+        database.conn.execute("SELECT 1")
+
+def test_duplicate_lookup_uses_index(temp_db):
+    from features.database.operation import entry_ops
+    database = temp_db
+    entry_ops.add_entry(database, authors="Doe, J.", title="Indexed Title", publication_date="2020")
+    assert entry_ops.find_duplicate_id(database, " DOE, J.", "indexed title ", "2020") is not None
+    plan = database.conn.execute("""
+        EXPLAIN QUERY PLAN SELECT id FROM entries
+        WHERE lower(trim(title)) = ? AND lower(trim(authors)) = ? AND ifnull(trim(publication_date), '') = ?
+    """, ("a", "b", "")).fetchall()
+    assert any("idx_entries_dedup" in row[-1] for row in plan)
+
+
+def test_default_profile_enables_wal(temp_db):
+    database = temp_db
+    assert database.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert database.conn.execute("PRAGMA synchronous").fetchone()[0] == 2  # FULL
+
+def test_profile_from_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv(db.PROFILE_ENV, "bulk")
+    database = db.BibliographyDB(str(tmp_path / "bulk.db"))
+    try:
+        assert database.conn.execute("PRAGMA synchronous").fetchone()[0] == 0  # OFF
+        assert database.conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+        assert database.conn.execute("PRAGMA cache_size").fetchone()[0] == -256_000
+    finally:
+        database.close()
+
+def test_explicit_profile_overrides_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv(db.PROFILE_ENV, "bulk")
+    database = db.BibliographyDB(str(tmp_path / "bal.db"), profile="balanced")
+    try:
+        assert database.conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    finally:
+        database.close()
+    with pytest.raises(ValueError):
+        db.BibliographyDB(str(tmp_path / "bad.db"), profile="turbo")
@@ -0,0 +1,40 @@
+from features.entries_services.entries_service import EntriesService
+
+# Bulk import tests
+def test_add_many_inserts_rows(temp_db):
+    service = EntriesService(temp_db)
+    rows = [
+        {"authors": "Doe, J.", "title": "First Bulk Entry", "year": 2020},
+        {"authors": "Smith, A.", "title": "Second Bulk Entry", "publication_date": "2021-05"},
+    ]
+    results = service.add_many(rows)
+    assert [status for status, _ in results] == ["inserted", "inserted"]
+    for _, entry_id in results:
+        assert service.get(entry_id) is not None
+    assert len(service.list()) == 2
+
+def test_add_many_reports_duplicates_without_aborting(temp_db):
+    service = EntriesService(temp_db)
+    existing_id = service.add(authors="Doe, J.", title="Existing Entry", publication_date="2020")
+    rows = iter([
+        {"authors": "  doe, j. ", "title": "EXISTING ENTRY", "publication_date": "2020"},
+        {"authors": "Brown, B.", "title": "Fresh Entry"},
+        {"authors": "brown, b.", "title": "fresh entry"},
+        {"title": "No Authors"},
+    ])
+    results = service.add_many(rows)
+    assert results[0] == ("duplicate", existing_id)
+    assert results[1][0] == "inserted"
+    assert results[2] == ("duplicate", results[1][1])
+    assert results[3][0] == "invalid"
+    assert len(service.list()) == 2
+
+def test_add_many_is_one_transaction(temp_db):
+    service = EntriesService(temp_db)
+    commits = []
+    temp_db.conn.set_trace_callback(lambda sql: commits.append(sql) if sql.upper().startswith("COMMIT") else None)
+    service.add_many({"authors": f"Author {i}", "title": f"Title {i}"} for i in range(2500))
+    temp_db.conn.set_trace_callback(None)
+    assert len(commits) == 1
+    assert len(service.list()) == 2500
+    assert not temp_db.conn.in_transaction
@@ -0,0 +1,76 @@
+from contextlib import contextmanager
+
+from features.database import db
+from features.entries_services.entries_service import EntriesService
+
+def _count_selects(database):
+    selects = []
+    trace = lambda sql: selects.append(sql) if "FROM entries" in sql else None
+    database.conn.set_trace_callback(trace)
+    # Reads go to the pool; single-threaded, its LIFO queue hands back this same reader every time.
+    with database.pool.connection() as reader:
+        reader.set_trace_callback(trace)
+    return selects
+
+def _seed(service, n):
+    return [service.add(authors=f"Author {i}", title=f"Cached {i}") for i in range(n)]
+
+# Entry cache tests
+def test_neighbours_are_loaded_with_a_miss(temp_db):
+    service = EntriesService(temp_db)
+    ids = _seed(service, 10)
+    selects = _count_selects(temp_db)
+    assert service.get(ids[0], ids[1:5])["title"] == "Cached 0"
+    assert [service.get(eid)["title"] for eid in ids[1:5]] == [f"Cached {i}" for i in range(1, 5)]
+    assert len(selects) == 1
+    assert service.get(ids[5]) is not None and len(selects) == 2
+
+def test_get_many_keeps_order_and_skips_missing(temp_db):
+    service = EntriesService(temp_db)
+    ids = _seed(service, 5)
+    service.get(ids[2])
+    entries = service.get_many([ids[4], 9999, ids[2], ids[0]])
+    assert [e["id"] for e in entries] == [ids[4], ids[2], ids[0]]
+    assert service.get(ids[4]) is entries[0]  # records are immutable, so the cache hands out the same one
+
+def test_writes_invalidate(temp_db):
+    service = EntriesService(temp_db)
+    ids = _seed(service, 3)
+    service.get_many(ids)
+    service.update(ids[0], title="Renamed")
+    service.delete(ids[1])
+    assert service.get(ids[0])["title"] == "Renamed"
+    assert service.get(ids[1]) is None
+    # A commit on another connection moves data_version and drops the whole cache.
+    other = db.BibliographyDB(temp_db.db_file)
+    EntriesService(other).update(ids[2], title="Elsewhere")
+    other.close()
+    assert service.get(ids[2])["title"] == "Elsewhere"
+
+def test_rows_read_under_an_older_version_are_not_cached(temp_db, monkeypatch):
+    service = EntriesService(temp_db)
+    ids = _seed(service, 2)
+    service.get(ids[0])
+    read, raced = temp_db.read, []
+
+    @contextmanager
+    def racing_read():
+        with read() as view:
+            yield view
+        if not raced:
+            # While the rows were in flight another thread saw a newer commit and moved the version on.
+            raced.append(True)
+            other = db.BibliographyDB(temp_db.db_file)
+            EntriesService(other).update(ids[1], title="Newer")
+            other.close()
+            service._check_version()
+
+    monkeypatch.setattr(temp_db, "read", racing_read)
+    assert service._load([ids[1]])[ids[1]]["title"] == "Cached 1"
+    assert service.get(ids[1])["title"] == "Newer"
+
+def test_cache_is_bounded(temp_db):
+    service = EntriesService(temp_db, cache_size=4)
+    ids = _seed(service, 10)
+    assert len(service.get_many(ids)) == 10
+    assert len(service._cache) == 4
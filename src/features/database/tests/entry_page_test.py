@@ -0,0 +1,68 @@
+import pytest
+
+from features.entries_services.entries_service import EntriesService
+
+def _seed(service, n):
+    service.add_many({"authors": f"Author {i}", "title": f"Paged Title {i}", "tags": "even" if i % 2 == 0 else "odd"}
+                     for i in range(n))
+
+# Keyset pagination tests
+def test_list_page_walks_every_row_once(temp_db):
+    service = EntriesService(temp_db)
+    _seed(service, 25)
+    # Force identical timestamps so the id tie-breaker is exercised.
+    temp_db.conn.execute("UPDATE entries SET created_at = '2024-01-01T00:00:00'")
+    seen, after = [], None
+    while True:
+        rows, after = service.list_page(after=after, limit=10)
+        seen += [r[0] for r in rows]
+        if after is None:
+            break
+    assert seen == [r[0] for r in service.list()]
+    assert len(set(seen)) == 25
+
+def test_list_page_with_filter(temp_db):
+    service = EntriesService(temp_db)
+    _seed(service, 20)
+    rows, after = service.list_page(*service.tag_filter("even"), limit=4)
+    assert len(rows) == 4 and after is not None
+    rest, after = service.list_page(*service.tag_filter("even"), after=after, limit=100)
+    assert after is None
+    assert len(rows) + len(rest) == 10
+
+def test_search_page_offsets(temp_db):
+    service = EntriesService(temp_db)
+    _seed(service, 12)
+    first, offset = service.search_page("paged", limit=5)
+    assert offset == 5
+    second, offset = service.search_page("paged", offset, limit=10)
+    assert offset is None
+    assert {r[0] for r in first} | {r[0] for r in second} == {r[0] for r in service.list()}
+
+def test_keyset_listing_uses_created_index(temp_db):
+    plan = temp_db.conn.execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM entries WHERE (created_at, id) < (?, ?) ORDER BY created_at DESC, id DESC LIMIT 10",
+        ("2024", 1),
+    ).fetchall()
+    assert any("idx_entries_created" in row[-1] for row in plan)
+
+# Sorted listing tests
+def test_sorted_ids_and_offset_pages(temp_db):
+    service = EntriesService(temp_db)
+    service.add_many([{"authors": "b", "title": "Beta", "publication_date": "2021"},
+                      {"authors": "A", "title": "alpha", "publication_date": "2020-05"},
+                      {"authors": "c", "title": "Gamma", "publication_date": "2020-05-03"}])
+    assert [service.get(i)["title"] for i in service.list_ids(order_by="title")] == ["alpha", "Beta", "Gamma"]
+    assert [service.get(i)["authors"] for i in service.list_ids(order_by="authors", descending=True)] == ["c", "b", "A"]
+    by_date = service.list_ids(order_by="publication_date")
+    assert [service.get(i)["publication_date"] for i in by_date] == ["2020-05", "2020-05-03", "2021"]
+    page = service.list(order_by="publication_date", limit=2, offset=1)
+    assert [r[0] for r in page] == by_date[1:]
+    assert [r[0] for r in service.list_by_ids(by_date)] == by_date
+
+def test_sort_rejects_unknown_column(temp_db):
+    service = EntriesService(temp_db)
+    with pytest.raises(ValueError):
+        service.list_ids(order_by="id; DROP TABLE entries")
+    with pytest.raises(ValueError):
+        service.list(after=("2024", 1), order_by="title")
@@ -0,0 +1,39 @@
+from features.entries_services.entries_service import EntriesService
+
+def _seed(service):
+    return {
+        "deep": service.add(authors="LeCun, Y.", title="Deep Learning", venue="Nature", tags="ml, neural"),
+        "html": service.add(authors="Berners-Lee, T.", title="HTML Documents", tags="html, web"),
+        "venue": service.add(authors="Ng, A.", title="Some Survey", venue="Learning Letters"),
+    }
+
+# Full-text search tests
+def test_search_prefix_and_ranking(temp_db):
+    service = EntriesService(temp_db)
+    ids = _seed(service)
+    rows = service.search("learn")
+    assert [r[0] for r in rows] == [ids["deep"], ids["venue"]]  # title hits outrank venue hits
+    assert [r[0] for r in service.search("lecun deep")] == [ids["deep"]]
+
+def test_search_tracks_updates_and_deletes(temp_db):
+    service = EntriesService(temp_db)
+    ids = _seed(service)
+    service.update(ids["html"], title="Hypertext Markup")
+    assert service.search("documents") == []
+    assert [r[0] for r in service.search("hypertext")] == [ids["html"]]
+    service.delete(ids["html"])
+    assert service.search("hypertext") == []
+
+def test_search_ignores_fts_syntax(temp_db):
+    service = EntriesService(temp_db)
+    ids = _seed(service)
+    assert [r[0] for r in service.search('deep" (')] == [ids["deep"]]
+    assert service.search("***") == []
+
+def test_search_like_fallback_without_fts(temp_db):
+    service = EntriesService(temp_db)
+    ids = _seed(service)
+    temp_db.has_fts = False
+    assert {r[0] for r in service.search("earn")} == {ids["deep"], ids["venue"]}
+    where, _ = service.text_filter("earn")
+    assert "LIKE" in where
@@ -0,0 +1,47 @@
+import pytest
+
+from features.entries_services.entries_service import EntriesService
+from features.refsets_services.refsets_service import RefsetsService
+
+def _ids_in(refsets, set_id):
+    return {r[0] for r in refsets.list_entries(set_id)}
+
+# Batch membership and set algebra tests
+def test_add_and_remove_entries_in_bulk(temp_db):
+    entries, refsets = EntriesService(temp_db), RefsetsService(temp_db)
+    ids = [eid for _, eid in entries.add_many({"authors": "A", "title": f"T{i}"} for i in range(100))]
+    set_id = refsets.create("Bulk")
+    assert refsets.add_entries(set_id, ids[:60]) == 60
+    assert refsets.add_entries(set_id, ids[50:70] + [999_999]) == 10  # overlap and unknown ids are skipped
+    assert refsets.count_entries(set_id) == 70
+    assert refsets.remove_entries(set_id, ids[:30]) == 30
+    assert _ids_in(refsets, set_id) == set(ids[30:70])
+
+def test_set_algebra(temp_db):
+    entries, refsets = EntriesService(temp_db), RefsetsService(temp_db)
+    ids = [eid for _, eid in entries.add_many({"authors": "A", "title": f"T{i}"} for i in range(10))]
+    left, right = refsets.create("Left"), refsets.create("Right")
+    refsets.add_entries(left, ids[:6])
+    refsets.add_entries(right, ids[4:])
+    union_id, n = refsets.union(left, right, "Both")
+    assert n == 10 and _ids_in(refsets, union_id) == set(ids)
+    inter_id, n = refsets.intersection(left, right, "Common")
+    assert n == 2 and _ids_in(refsets, inter_id) == set(ids[4:6])
+    diff_id, n = refsets.difference(left, right, "Only left")
+    assert n == 4 and _ids_in(refsets, diff_id) == set(ids[:4])
+
+def test_combine_rolls_back_on_bad_name(temp_db):
+    refsets = RefsetsService(temp_db)
+    left = refsets.create("Left")
+    with pytest.raises(Exception):
+        refsets.union(left, left, "Left")  # name already taken
+    assert [s[1] for s in refsets.list()] == ["Left"]
+
+def test_add_search_results_to_set(temp_db):
+    entries, refsets = EntriesService(temp_db), RefsetsService(temp_db)
+    ml = entries.add(authors="A", title="Deep learning", tags="ml")
+    entries.add(authors="B", title="Markup", tags="html")
+    set_id = refsets.create("ML")
+    assert refsets.add_search_results(set_id, *entries.tag_filter("ml")) == 1
+    assert refsets.add_search_results(set_id, *entries.text_filter("learning")) == 0
+    assert _ids_in(refsets, set_id) == {ml}
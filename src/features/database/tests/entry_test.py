@@ -1,6 +1,11 @@
 import pytest
 import features.database.db as db
 import conftest
+from features.database.operation import entry_ops
+
+def _id_by_title(database, title):
+    rows = entry_ops.list_entries(database, "title = ?", (title,))
+    return rows[0][0] if rows else None
 
 # Add entry tests
 def test_add_valid_entry(temp_db):
@@ -17,7 +22,7 @@ def test_add_valid_entry(temp_db):
         "url": "http://example.com",
         "tags": "sample, test"
     }
-    entry_id = database.add_entry(**kwargs)
+    entry_id = entry_ops.add_entry(database, **kwargs)
     assert isinstance(entry_id, int)
     
 def test_add_entry_missing_required_field(temp_db):
@@ -26,8 +31,8 @@ def test_add_entry_missing_required_field(temp_db):
         "title": "Sample Title Without Authors"
     }
     with pytest.raises(ValueError) as excinfo:
-        database.add_entry(**kwargs)
-    assert "Authors is required" in str(excinfo.value)
+        entry_ops.add_entry(database, **kwargs)
+    assert "Authors and Title are required" in str(excinfo.value)
 
 def test_add_entry_empty_optional_field(temp_db):
     database = temp_db
@@ -43,16 +48,16 @@ def test_add_entry_empty_optional_field(temp_db):
         "url": "",
         "tags": ""
     }
-    entry_id = database.add_entry(**kwargs)
+    entry_id = entry_ops.add_entry(database, **kwargs)
     assert isinstance(entry_id, int)
 
 
 # List entries tests
 def test_list_entries(temp_db):
     database = temp_db
-    database.add_entry(authors="Doe, J.", title="First Entry")
-    database.add_entry(authors="Smith, A.", title="Second Entry")
-    entries = database.list_entries()
+    entry_ops.add_entry(database, authors="Doe, J.", title="First Entry")
+    entry_ops.add_entry(database, authors="Smith, A.", title="Second Entry")
+    entries = entry_ops.list_entries(database)
     assert isinstance(entries, list)
     for entry in entries:
         assert isinstance(entry, tuple)
@@ -63,14 +68,14 @@ def test_list_entries_with_where_clause(temp_db):
         "authors": "Doe, J.",
         "title": "Unique Title for Listing"
     }
-    database.add_entry(**kwargs)
-    entries = database.list_entries("authors = ?", ("Doe, J.",))
+    entry_ops.add_entry(database, **kwargs)
+    entries = entry_ops.list_entries(database, "authors = ?", ("Doe, J.",))
     assert any(entry[1] == "Doe, J." for entry in entries)
     
     
 def test_list_entries_no_match(temp_db):
     database = temp_db
-    entries = database.list_entries("authors = ?", ("Non Existing Author",))
+    entries = entry_ops.list_entries(database, "authors = ?", ("Non Existing Author",))
     assert len(entries) == 0
     
 
@@ -81,8 +86,8 @@ def test_get_entry_id(temp_db):
         "authors": "Johnson, K.",
         "title": "Unique Title for ID Test"
     }
-    database.add_entry(**kwargs)
-    entry_id = database.get_entry_id_by_title("Unique Title for ID Test")
+    entry_ops.add_entry(database, **kwargs)
+    entry_id = _id_by_title(database, "Unique Title for ID Test")
     assert isinstance(entry_id, int)
     assert entry_id > 0
 
@@ -90,7 +95,7 @@ def test_get_entry_id(temp_db):
 def test_get_non_existing_entry_id(temp_db):
     database = temp_db
     non_existing_title = "This Title Does Not Exist"
-    entry_id = database.get_entry_id_by_title(non_existing_title)
+    entry_id = _id_by_title(database, non_existing_title)
     assert entry_id is None
     
 
@@ -101,9 +106,9 @@ def test_get_entry_by_id(temp_db):
         "authors": "Williams, S.",
         "title": "Entry for Get by ID Test"
     }
-    database.add_entry(**kwargs)
-    entry_id = database.get_entry_id_by_title("Entry for Get by ID Test")
-    entry = database.get_entry(entry_id)
+    entry_ops.add_entry(database, **kwargs)
+    entry_id = _id_by_title(database, "Entry for Get by ID Test")
+    entry = entry_ops.get_entry(database, entry_id)
     assert entry is not None
     assert entry['id'] == entry_id
     assert entry['authors'] == "Williams, S."
@@ -113,7 +118,7 @@ def test_get_entry_by_id(temp_db):
 def test_get_non_existing_entry_by_id(temp_db):
     database = temp_db
     non_existing_id = 999999
-    entry = database.get_entry(non_existing_id)
+    entry = entry_ops.get_entry(database, non_existing_id)
     assert entry is None
     
 
@@ -124,9 +129,9 @@ def test_delete_entry(temp_db):
         "authors": "Smith, A.",
         "title": "Entry to be deleted"
     }
-    entry_id = database.add_entry(**kwargs)
-    database.delete_entry(entry_id)
-    entries = database.list_entries("id = ?", (entry_id,))
+    entry_id = entry_ops.add_entry(database, **kwargs)
+    entry_ops.delete_entry(database, entry_id)
+    entries = entry_ops.list_entries(database, "id = ?", (entry_id,))
     assert len(entries) == 0
     
     
@@ -134,8 +139,8 @@ def test_delete_non_existing_entry(temp_db):
     database = temp_db
     non_existing_id = 999999
     # Should not raise an error
-    database.delete_entry(non_existing_id)
-    entries = database.list_entries("id = ?", (non_existing_id,))
+    entry_ops.delete_entry(database, non_existing_id)
+    entries = entry_ops.list_entries(database, "id = ?", (non_existing_id,))
     assert len(entries) == 0
     
 
@@ -146,10 +151,10 @@ def test_update_entry(temp_db):
         "authors": "Brown, B.",
         "title": "Original Title"
     }
-    database.add_entry(**kwargs)
-    entry_id = database.get_entry_id_by_title("Original Title")
-    database.update_entry(entry_id, title="Updated Title")
-    entries = database.list_entries("id = ?", (entry_id,))
+    entry_ops.add_entry(database, **kwargs)
+    entry_id = _id_by_title(database, "Original Title")
+    entry_ops.update_entry(database, entry_id, title="Updated Title")
+    entries = entry_ops.list_entries(database, "id = ?", (entry_id,))
     assert len(entries) == 1
     assert entries[0][2] == "Updated Title"  # title is the third field
     
@@ -160,10 +165,10 @@ def test_update_entry_no_fields(temp_db):
         "authors": "Green, G.",
         "title": "Title Before No-Op Update"
     }
-    entry_id = database.add_entry(**kwargs)
+    entry_id = entry_ops.add_entry(database, **kwargs)
     # No fields to update
-    database.update_entry(entry_id)
-    entries = database.list_entries("id = ?", (entry_id,))
+    entry_ops.update_entry(database, entry_id)
+    entries = entry_ops.list_entries(database, "id = ?", (entry_id,))
     assert len(entries) == 1
     assert entries[0][2] == "Title Before No-Op Update"  # title is the third field
     
@@ -174,8 +179,8 @@ def test_add_entry_with_publication_date(temp_db):
         "title": "Entry with Publication Date",
         "publication_date": "2024-01-15"
     }
-    entry_id = database.add_entry(**kwargs)
-    entry = database.get_entry(entry_id)
+    entry_id = entry_ops.add_entry(database, **kwargs)
+    entry = entry_ops.get_entry(database, entry_id)
     assert entry is not None
     assert entry['publication_date'] == "2024-01-15"
     
@@ -0,0 +1,48 @@
+import sqlite3
+import threading
+
+import pytest
+
+from features.database.executor import QueryExecutor
+from features.entries_services.entries_service import EntriesService
+
+SLOW_QUERY = """
+    WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n)
+    SELECT count(*) FROM n WHERE i < 0
+"""
+
+@pytest.fixture
+def executor(temp_db):
+    ex = QueryExecutor(temp_db.db_file, setup=EntriesService)
+    yield ex
+    ex.shutdown()
+
+# Query executor tests
+def test_executor_runs_on_worker_connection(temp_db, executor):
+    EntriesService(temp_db).add(authors="Doe, J.", title="Worker Entry")
+    future = executor.submit(lambda entries: (threading.current_thread().name, entries.list()))
+    thread_name, rows = future.result(timeout=5)
+    assert thread_name != threading.current_thread().name
+    assert [r[2] for r in rows] == ["Worker Entry"]
+    # Service reads stay on the worker's own connection, where cancel() can abort them.
+    assert executor.submit(lambda entries: entries.db.pool).result(timeout=5) is None
+
+def test_executor_propagates_errors(executor):
+    future = executor.submit(lambda entries: entries.db.conn.execute("SELECT * FROM missing_table"))
+    with pytest.raises(sqlite3.OperationalError):
+        future.result(timeout=5)
+
+def test_executor_cancels_superseded_queries(executor):
+    started = threading.Event()
+    def slow(entries):
+        started.set()
+        return entries.db.conn.execute(SLOW_QUERY).fetchone()
+    running = executor.submit(slow)
+    queued = executor.submit(lambda entries: "never")
+    started.wait(5)
+    assert executor.cancel(queued)
+    assert executor.cancel(running)
+    with pytest.raises(sqlite3.OperationalError):
+        running.result(timeout=5)
+    assert queued.cancelled()
+    assert executor.submit(lambda entries: "after").result(timeout=5) == "after"
@@ -0,0 +1,90 @@
+import sqlite3
+import threading
+
+import pytest
+
+from features.database import db
+from features.database.pool import ReadView
+from features.entries_services.entries_service import EntriesService
+from features.refsets_services.refsets_service import RefsetsService
+
+def _seed(database, n=20):
+    return [EntriesService(database).add(authors=f"Author {i}", title=f"Pooled {i}") for i in range(n)]
+
+# Reader pool tests
+def test_reads_use_read_only_pooled_connections(temp_db):
+    with temp_db.read() as view:
+        assert isinstance(view, ReadView) and view.conn is not temp_db.conn
+        with pytest.raises(sqlite3.OperationalError):
+            view.conn.execute("DELETE FROM entries")
+    assert temp_db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert temp_db.pool.opened == 1
+
+def test_services_read_through_the_pool(temp_db):
+    ids = _seed(temp_db, 5)
+    service = EntriesService(temp_db)
+    assert sorted(row.title for row in service.list()) == [f"Pooled {i}" for i in range(5)]
+    assert service.get(ids[0]).title == "Pooled 0" and service.count() == 5
+    set_id = RefsetsService(temp_db).create("Reading")
+    RefsetsService(temp_db).add_entries(set_id, ids[:2])
+    assert RefsetsService(temp_db).count_entries(set_id) == 2
+    assert temp_db.pool.opened >= 1
+
+def test_reads_inside_a_transaction_see_uncommitted_writes(temp_db):
+    service = EntriesService(temp_db)
+    with temp_db.transaction():
+        service.add(authors="Doe, J.", title="Uncommitted")
+        with temp_db.read() as view:
+            assert view is temp_db
+        assert service.count() == 1
+    with temp_db.read() as view:
+        assert view.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0] == 1
+
+def test_checkout_times_out_when_all_readers_are_busy(temp_db):
+    database = db.BibliographyDB(temp_db.db_file, readers=1)
+    held = database.pool.checkout()
+    with pytest.raises(TimeoutError):
+        database.pool.checkout(timeout=0.01)
+    database.pool.checkin(held)
+    assert database.pool.checkout(timeout=0.01) is held
+    database.close()
+
+def test_readers_zero_disables_the_pool(temp_db):
+    database = db.BibliographyDB(temp_db.db_file, readers=0)
+    assert database.pool is None
+    with database.read() as view:
+        assert view is database
+    database.close()
+    assert db.BibliographyDB(":memory:").pool is None
+
+def test_concurrent_reads_from_threads(temp_db):
+    _seed(temp_db, 50)
+    service, errors, counts = EntriesService(temp_db), [], []
+
+    def reader():
+        try:
+            for _ in range(20):
+                counts.append(len(service.list_ids()))
+        except Exception as e:  # surfaced below; pytest does not see thread exceptions
+            errors.append(e)
+
+    threads = [threading.Thread(target=reader) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors and set(counts) == {50}
+    assert temp_db.pool.opened <= temp_db.pool.size
+
+def test_data_version_and_lazy_columns_stay_off_the_writer(temp_db):
+    ids = _seed(temp_db, 3)
+    statements = []
+    temp_db.conn.set_trace_callback(statements.append)
+    version = temp_db.data_version()
+    with temp_db.read() as view:
+        entry = view.conn.execute("SELECT id, title FROM entries WHERE id = ?", (ids[0],)).fetchone()
+        assert entry.authors == "Author 0" and entry._conn is view.conn
+    temp_db.conn.set_trace_callback(None)
+    assert version == temp_db.data_version() and statements == []
+    EntriesService(temp_db).add(authors="Doe, J.", title="Newer")
+    assert temp_db.data_version() != version
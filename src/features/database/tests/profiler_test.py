@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from features.database import db
+from features.database.profiler import QueryProfiler
+from features.entries_services.entries_service import EntriesService
+from features.refsets_services.refsets_service import RefsetsService
+
+@pytest.fixture
+def profiled_db(tmp_path):
+    database = db.BibliographyDB(str(tmp_path / "profiled.db"), profiler=QueryProfiler(slow_ms=0))
+    database.profiler.reset()
+    yield database
+    database.conn.close()
+
+def _queries(profiler, op):
+    return [q for q in profiler.summary()["queries"] if q["op"] == op]
+
+# Profiler tests
+def test_statements_are_attributed_to_ops(profiled_db):
+    entries, refsets = EntriesService(profiled_db), RefsetsService(profiled_db)
+    entry_id = entries.add(authors="Doe, J.", title="Profiled", tags="ml")
+    set_id = refsets.create("Profiled set")
+    refsets.add_entry(set_id, entry_id)
+    entries.list()
+    ops = profiled_db.profiler.summary()["ops"]
+    for op in ("entry_ops.add_entry", "refset_ops.create_refset", "set_entries_ops.add_entry_to_set", "entry_ops.list_entries"):
+        assert ops[op]["calls"] > 0
+    # Nested helpers count towards the op the caller invoked.
+    assert "tag_ops.set_entry_tags" not in ops
+    # The op's own transaction() commits by releasing its savepoint.
+    assert any(q["sql"] == "RELEASE bibdb_tx_0" for q in _queries(profiled_db.profiler, "entry_ops.add_entry"))
+
+def test_row_counts_and_histogram(profiled_db):
+    service = EntriesService(profiled_db)
+    service.add_many({"authors": f"Author {i}", "title": f"Title {i}"} for i in range(30))
+    for _ in range(3):
+        service.list()
+    (select,) = [q for q in _queries(profiled_db.profiler, "entry_ops.list_entries") if q["sql"].startswith("SELECT")]
+    assert select["calls"] == 3
+    assert select["rows"] == 90
+    assert sum(select["histogram"].values()) == 3
+    assert select["p50_ms"] <= select["p95_ms"] <= select["max_ms"]
+
+def test_slow_statements_capture_query_plan(profiled_db):
+    service = EntriesService(profiled_db)
+    service.add(authors="Doe, J.", title="Planned")
+    service.list()
+    (select,) = [q for q in _queries(profiled_db.profiler, "entry_ops.list_entries") if q["sql"].startswith("SELECT")]
+    assert select["slow"] == 1
+    assert any("idx_entries_created" in step for step in select["plan"])
+    # The EXPLAIN itself is not profiled.
+    assert not any(q["sql"].startswith("EXPLAIN") for q in profiled_db.profiler.summary()["queries"])
+    # Tracing stays on for the connection once the plan is captured.
+    service.count()
+    (count,) = [q for q in _queries(profiled_db.profiler, "entry_ops.count_entries") if q["sql"].startswith("SELECT")]
+    assert count["traced"] == 1
+
+def test_owned_profiler_dumps_json_on_close(tmp_path):
+    out = tmp_path / "stats.json"
+    database = db.BibliographyDB(str(tmp_path / "dump.db"), profiler=str(out))
+    EntriesService(database).add(authors="Doe, J.", title="Dumped")
+    database.close()
+    report = json.loads(out.read_text())
+    assert "entry_ops.add_entry" in report["ops"]
+    assert report["queries"][0]["total_ms"] >= report["queries"][-1]["total_ms"]
+
+def test_profiler_env_var(tmp_path, monkeypatch):
+    monkeypatch.setenv("BIBAPP_DB_PROFILER", "1")
+    database = db.BibliographyDB(str(tmp_path / "env.db"))
+    assert database.profiler is not None
+    database.conn.close()
+    monkeypatch.delenv("BIBAPP_DB_PROFILER")
+    database = db.BibliographyDB(str(tmp_path / "env.db"))
+    assert database.profiler is None
+    database.close()
@@ -0,0 +1,50 @@
+import pickle
+
+import pytest
+
+from features.database.records import Entry
+from features.entries_services.entries_service import EntriesService
+from features.refsets_services.refsets_service import RefsetsService
+
+def _add(temp_db):
+    return EntriesService(temp_db).add(authors="Doe, J.", title="Records", venue="JMLR", pages="1-10",
+                                       doi="10.1/x", publication_date="2021-03")
+
+# Entry record tests
+def test_list_rows_are_tuples_with_named_columns(temp_db):
+    eid = _add(temp_db)
+    row = EntriesService(temp_db).list()[0]
+    assert isinstance(row, Entry) and isinstance(row, tuple)
+    entry_id, authors, title, venue, year, pubdate, tags, created = row
+    assert (entry_id, title) == (eid, "Records") and row[2] == row.title == row["title"]
+    assert row.keys() == ("id", "authors", "title", "venue", "year", "publication_date", "tags", "created_at")
+    assert row == tuple(row)
+
+def test_heavy_columns_load_on_access(temp_db):
+    eid = _add(temp_db)
+    row = EntriesService(temp_db).list()[0]
+    assert "doi" not in row.keys()
+    assert row.doi == row["doi"] == row.get("doi") == "10.1/x"
+    assert row.load().pages == "1-10"
+    assert row.get("not_a_column", "fallback") == "fallback"
+    with pytest.raises(KeyError):
+        row["not_a_column"]
+    with pytest.raises(AttributeError):
+        row.not_a_column
+    EntriesService(temp_db).delete(eid)
+    assert row.doi is None
+
+def test_detail_and_mapping_views(temp_db):
+    eid = _add(temp_db)
+    entry = EntriesService(temp_db).get(eid)
+    assert entry.load() is entry
+    assert dict(entry)["venue"] == "JMLR" and dict(entry)["citation_key"]
+    assert "pub_sort" not in entry.keys() and entry.get("pub_sort") is None
+    assert pickle.loads(pickle.dumps(entry)) == tuple(entry)
+
+def test_other_rows_stay_plain_tuples(temp_db):
+    _add(temp_db)
+    assert type(temp_db.conn.execute("SELECT COUNT(*) FROM entries").fetchone()) is tuple
+    assert type(temp_db.conn.execute("SELECT id FROM entries").fetchone()) is tuple
+    RefsetsService(temp_db).create("Reading")
+    assert type(RefsetsService(temp_db).list()[0]) is tuple
@@ -0,0 +1,50 @@
+import os
+import sqlite3
+import tempfile
+
+import features.database.db as db
+from features.entries_services.entries_service import EntriesService
+
+# Tag table tests
+def test_tag_filter_matches_whole_tags_only(temp_db):
+    service = EntriesService(temp_db)
+    ml_id = service.add(authors="Doe, J.", title="Learning", tags="ML, vision")
+    service.add(authors="Smith, A.", title="Markup", tags="html, xml")
+    rows = service.list(*service.tag_filter("ml"))
+    assert [r[0] for r in rows] == [ml_id]
+
+def test_tags_follow_update_and_delete(temp_db):
+    service = EntriesService(temp_db)
+    entry_id = service.add(authors="Doe, J.", title="Tagged", tags="a, b")
+    service.update(entry_id, tags="b, c")
+    assert service.tag_counts() == [("b", 1), ("c", 1)]
+    service.delete(entry_id)
+    assert service.tag_counts() == []
+
+def test_tag_counts_and_bulk_import(temp_db):
+    service = EntriesService(temp_db)
+    service.add_many([
+        {"authors": "A", "title": "One", "tags": "ml, nlp"},
+        {"authors": "B", "title": "Two", "tags": "ml"},
+        {"authors": "C", "title": "Three", "tags": " ML ,ml"},
+    ])
+    assert service.tag_counts() == [("ml", 3), ("nlp", 1)]
+    assert service.tag_counts(limit=1) == [("ml", 3)]
+
+def test_existing_tags_are_migrated():
+    fd, db_path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    conn = sqlite3.connect(db_path)
+    conn.execute("""CREATE TABLE entries (id INTEGER PRIMARY KEY, authors TEXT NOT NULL, title TEXT NOT NULL,
+        venue TEXT, year INTEGER, publication_date TEXT, volume INTEGER, number INTEGER, pages TEXT,
+        doi TEXT, url TEXT, tags TEXT, created_at TEXT NOT NULL)""")
+    conn.execute("INSERT INTO entries (authors, title, tags, created_at) VALUES ('Doe', 'Old', 'ml, Web', '2024-01-01')")
+    conn.commit(); conn.close()
+    database = db.BibliographyDB(db_path)
+    try:
+        service = EntriesService(database)
+        assert service.tag_counts() == [("ml", 1), ("web", 1)]
+        assert len(service.search("old")) == 1
+    finally:
+        database.close()
+        os.remove(db_path)
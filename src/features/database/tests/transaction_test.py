@@ -0,0 +1,93 @@
+import threading
+import time
+
+import pytest
+
+from features.database.operation import entry_ops, refset_ops, set_entries_ops
+from features.entries_services.entries_service import EntriesService
+from features.refsets_services.refsets_service import RefsetsService
+
+def _count_commits(database):
+    commits = []
+    # Releasing the outermost savepoint commits; the ones nested ops take inside it do not.
+    database.conn.set_trace_callback(lambda sql: commits.append(sql) if sql.startswith(("COMMIT", "RELEASE bibdb_tx_0")) else None)
+    return commits
+
+# Transaction tests
+def test_ops_commit_once_inside_transaction(temp_db):
+    commits = _count_commits(temp_db)
+    with temp_db.transaction():
+        set_id = refset_ops.create_refset(temp_db, "Batch")
+        for i in range(50):
+            entry_id = entry_ops.add_entry(temp_db, authors="Doe", title=f"Batch {i}")
+            set_entries_ops.add_entry_to_set(temp_db, set_id, entry_id)
+        assert temp_db.in_transaction
+    temp_db.conn.set_trace_callback(None)
+    assert len(commits) == 1
+    assert not temp_db.in_transaction
+    assert len(set_entries_ops.list_entries_in_set(temp_db, set_id)) == 50
+
+def test_transaction_rolls_back_everything_on_error(temp_db):
+    with pytest.raises(ValueError):
+        with temp_db.transaction():
+            entry_ops.add_entry(temp_db, authors="Doe", title="Kept?")
+            entry_ops.add_entry(temp_db, authors="Doe", title="Kept?")  # duplicate
+    assert entry_ops.list_entries(temp_db) == []
+    assert not temp_db.conn.in_transaction
+
+def test_original_error_survives_a_rollback_sqlite_already_did(temp_db):
+    with pytest.raises(ValueError, match="original"):
+        with temp_db.transaction():
+            with temp_db.transaction():
+                entry_ops.add_entry(temp_db, authors="Doe", title="Gone")
+                temp_db.conn.execute("ROLLBACK")  # as SQLite does itself on SQLITE_FULL
+                raise ValueError("original")
+    assert not temp_db.in_transaction and entry_ops.list_entries(temp_db) == []
+    entry_ops.add_entry(temp_db, authors="Doe", title="Still writable")
+
+def test_nested_savepoint_rolls_back_alone(temp_db):
+    service = EntriesService(temp_db)
+    with service.transaction():
+        outer_id = service.add(authors="Doe", title="Outer")
+        with pytest.raises(ValueError):
+            with service.transaction():
+                service.add(authors="Doe", title="Inner")
+                raise ValueError("undo inner only")
+    titles = [r[2] for r in service.list()]
+    assert titles == ["Outer"]
+    assert service.get(outer_id)["title"] == "Outer"
+
+def test_batch_variants(temp_db):
+    entries = EntriesService(temp_db)
+    refsets = RefsetsService(temp_db)
+    ids = [entries.add(authors="Doe", title=f"T{i}", tags="x") for i in range(5)]
+    entries.update_many((eid, {"venue": "V"}) for eid in ids[:3])
+    assert [entries.get(eid)["venue"] for eid in ids] == ["V", "V", "V", None, None]
+    entries.delete_many(ids[:2])
+    assert len(entries.list()) == 3
+    assert entries.tag_counts() == [("x", 3)]
+    set_ids = [refsets.create(f"S{i}") for i in range(3)]
+    refsets.delete_many(set_ids[:2])
+    assert [s[1] for s in refsets.list()] == ["S2"]
+
+def test_ops_on_other_threads_wait_for_an_open_transaction(temp_db):
+    service, wrote, errors = EntriesService(temp_db), threading.Event(), []
+
+    def other():
+        wrote.wait(5)
+        try:
+            service.add(authors="Other", title="Committed alone")
+        except Exception as e:  # surfaced below; pytest does not see thread exceptions
+            errors.append(e)
+
+    thread = threading.Thread(target=other)
+    thread.start()
+    with pytest.raises(ValueError):
+        with temp_db.transaction():
+            service.add(authors="Doe", title="Rolled back")
+            wrote.set()
+            time.sleep(0.1)  # the other thread's add is waiting for the write lock by now
+            raise ValueError("undo")
+    thread.join(5)
+    assert not errors
+    assert [r[2] for r in service.list()] == ["Committed alone"]
@@ -0,0 +1,3 @@
+from .dedupe_service import DedupeService, DuplicateCluster, DuplicateMatch
+
+__all__ = ['DedupeService', 'DuplicateCluster', 'DuplicateMatch']
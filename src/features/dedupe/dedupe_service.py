@@ -0,0 +1,135 @@
+from __future__ import annotations
+from dataclasses import dataclass
+
+from src.features.database.changelog import ChangeFeed
+from src.features.database.db import BibliographyDB
+from src.features.database.operation import changelog_ops, entry_ops, minhash_ops
+from .minhash import (SIGNATURE_VERSION, author_tokens, band_keys, jaccard_at_least, pack_signature, shingles,
+                      signature, title_grams)
+
+INDEX_CHUNK = 1000
+
+@dataclass(frozen=True)
+class DuplicateMatch:
+    entry_id: int
+    score: float
+    title_score: float
+    author_score: float
+
+@dataclass(frozen=True)
+class DuplicateCluster:
+    entry_ids: tuple[int, ...]
+    score: float  # weakest link: the lowest score among the pairs joining the cluster
+    pairs: tuple[tuple[int, int, float], ...]
+
+class DedupeService:
+    """Near-duplicate detection over normalized titles and authors with MinHash + LSH.
+
+    Signatures and band buckets live in entry_minhash/entry_lsh and are only computed for entries that
+    lack a current one. ``scan()`` looks for those across the library; after its first call ``check()``
+    only looks among the entries the changelog says were added or edited since.
+    Candidates sharing a bucket are then scored exactly: a pair is a duplicate when its title shingle
+    Jaccard reaches ``threshold`` and its author token Jaccard reaches ``author_threshold``.
+    """
+
+    def __init__(self, db: BibliographyDB, threshold: float = 0.8, author_threshold: float = 0.5,
+                 max_bucket: int = 50):
+        self.db = db
+        self.threshold = threshold
+        self.author_threshold = author_threshold
+        self.max_bucket = max_bucket
+        self._changes = ChangeFeed(db)
+        self._synced = False
+
+    def index(self) -> int:
+        """Compute missing or stale signatures; returns how many entries were (re)indexed."""
+        ids = minhash_ops.unindexed_ids(self.db, SIGNATURE_VERSION)
+        self._index(ids)
+        return len(ids)
+
+    def _catch_up(self):
+        # Index the entries added or edited since the last call; a full index() when the changelog cannot say.
+        changes = self._changes.poll(INDEX_CHUNK)
+        if changes is None or not self._synced:
+            self.index()
+            self._synced = True
+            return
+        changed, _ = changelog_ops.entry_changes(changes)
+        self._index(minhash_ops.unindexed_among(self.db, SIGNATURE_VERSION, changed))
+
+    def _index(self, ids: list[int]):
+        for i in range(0, len(ids), INDEX_CHUNK):
+            names = minhash_ops.entry_names(self.db, ids[i:i + INDEX_CHUNK])
+            rows = []
+            for eid, (authors, title) in names.items():
+                sig = signature(shingles(authors, title))
+                rows.append((eid, pack_signature(sig), band_keys(sig)))
+            minhash_ops.store_signatures(self.db, SIGNATURE_VERSION, rows)
+
+    def check(self, authors: str, title: str, exclude_id: int | None = None) -> list[DuplicateMatch]:
+        """Existing entries that look like a duplicate of (authors, title), best match first."""
+        self._catch_up()
+        keys = band_keys(signature(shingles(authors, title)))
+        candidates = [eid for eid in minhash_ops.bucket_members(self.db, keys) if eid != exclude_id]
+        names = minhash_ops.entry_names(self.db, candidates)
+        probe = (title_grams(title), author_tokens(authors))
+        matches = []
+        for eid, (other_authors, other_title) in names.items():
+            match = self._score(probe, (title_grams(other_title), author_tokens(other_authors)), eid)
+            if match is not None:
+                matches.append(match)
+        return sorted(matches, key=lambda m: (-m.score, m.entry_id))
+
+    def add(self, **kwargs) -> tuple[int, list[DuplicateMatch]]:
+        """add_entry plus the near duplicates it already had in the library (the entry is added regardless)."""
+        matches = self.check(kwargs.get("authors") or "", kwargs.get("title") or "")
+        entry_id = entry_ops.add_entry(self.db, **kwargs)
+        self._index([entry_id])
+        return entry_id, matches
+
+    def scan(self) -> list[DuplicateCluster]:
+        """Clusters of near-duplicate entries across the library, highest scoring first."""
+        self.index()
+        pairs = set()
+        for ids in minhash_ops.shared_buckets(self.db, self.max_bucket):
+            ids.sort()
+            pairs.update((a, b) for i, a in enumerate(ids) for b in ids[i + 1:])
+        features = {}
+        needed = {eid for pair in pairs for eid in pair}
+        for eid, (authors, title) in minhash_ops.entry_names(self.db, needed).items():
+            features[eid] = (title_grams(title), author_tokens(authors))
+
+        parent: dict[int, int] = {}
+
+        def find(x):
+            while parent.setdefault(x, x) != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        edges = []
+        for a, b in pairs:
+            if a in features and b in features:
+                match = self._score(features[a], features[b], b)
+                if match is not None:
+                    edges.append((a, b, round(match.score, 4)))
+                    parent[find(b)] = find(a)
+        clusters: dict[int, list[tuple[int, int, float]]] = {}
+        for edge in sorted(edges):
+            clusters.setdefault(find(edge[0]), []).append(edge)
+        result = [
+            DuplicateCluster(tuple(sorted({eid for a, b, _ in group for eid in (a, b)})),
+                             min(score for _, _, score in group), tuple(group))
+            for group in clusters.values()
+        ]
+        return sorted(result, key=lambda c: (-c.score, c.entry_ids))
+
+    def _score(self, left, right, entry_id: int) -> DuplicateMatch | None:
+        title_score = jaccard_at_least(left[0], right[0], self.threshold)
+        if title_score is None:
+            return None
+        author_score = jaccard_at_least(left[1], right[1], self.author_threshold)
+        if author_score is None:
+            return None
+        # Titles carry most of the signal; author lists vary more in format (initials, ordering, "et al.").
+        return DuplicateMatch(entry_id, (2 * title_score + author_score) / 3, title_score, author_score)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+import re
+import struct
+import unicodedata
+from hashlib import blake2b
+
+# 60 hash values in 12 bands of 5: pairs with shingle Jaccard >= 0.8 share a bucket ~99% of the time,
+# pairs at 0.5 about a third of the time, below 0.4 rarely. Bump SIGNATURE_VERSION when changing these
+# (or the normalization) so stored signatures get recomputed.
+NUM_PERM = 60
+BANDS = 12
+ROWS = NUM_PERM // BANDS
+SIGNATURE_VERSION = 1
+TITLE_GRAM = 3
+_MASK = (1 << 64) - 1
+_SPAN = (_MASK + 1) // NUM_PERM  # bin values are below this, so densified values still fit in 64 bits
+_WORD = re.compile(r"[^\W_]+")
+_AUTHOR_FILLER = {"and", "et", "al"}
+
+def _fold(text: str | None) -> str:
+    text = unicodedata.normalize("NFKD", text or "")
+    return "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+
+def normalize_title(title: str | None) -> str:
+    """Lowercase, accents and punctuation stripped: "Deep Learning." -> "deep learning"."""
+    return " ".join(_WORD.findall(_fold(title)))
+
+def author_tokens(authors: str | None) -> frozenset[str]:
+    """Order-free name tokens; initials only count when nothing longer is there ("LeCun, Y." == "Y. LeCun")."""
+    words = [w for w in _WORD.findall(_fold(authors)) if w not in _AUTHOR_FILLER]
+    names = frozenset(w for w in words if len(w) > 1)
+    return names or frozenset(words)
+
+def title_grams(title: str | None) -> frozenset[str]:
+    text = normalize_title(title)
+    if len(text) <= TITLE_GRAM:
+        return frozenset([text]) if text else frozenset()
+    return frozenset(text[i:i + TITLE_GRAM] for i in range(len(text) - TITLE_GRAM + 1))
+
+def shingles(authors: str | None, title: str | None) -> set[str]:
+    return {"t" + g for g in title_grams(title)} | {"a" + t for t in author_tokens(authors)}
+
+def jaccard_at_least(a: frozenset, b: frozenset, threshold: float) -> float | None:
+    """Jaccard similarity of ``a`` and ``b``, or None when it is below ``threshold``."""
+    la, lb = len(a), len(b)
+    # Jaccard is at most min/max of the sizes, so most candidate pairs stop before the intersection.
+    if min(la, lb) < threshold * max(la, lb):
+        return None
+    if not la:
+        return 1.0
+    common = len(a & b)
+    score = common / (la + lb - common)
+    return score if score >= threshold else None
+
+def signature(tokens: set[str]) -> tuple[int, ...]:
+    """MinHash signature of NUM_PERM unsigned 64-bit values (all-max for empty input).
+
+    One-permutation hashing: each shingle is hashed once and only lowers the minimum of the bin the hash
+    falls in, instead of evaluating NUM_PERM hash functions per shingle. An empty bin borrows the next
+    non-empty bin to its right, offset by the distance, so borrowed values only match when both
+    signatures borrowed from the same place (Shrivastava & Li's densification).
+    """
+    bins: list[int | None] = [None] * NUM_PERM
+    for s in tokens:
+        h = int.from_bytes(blake2b(s.encode(), digest_size=8).digest(), "little")
+        j, v = h % NUM_PERM, h // NUM_PERM
+        if bins[j] is None or v < bins[j]:
+            bins[j] = v
+    if not tokens:
+        return (_MASK,) * NUM_PERM
+    sig, source = [0] * NUM_PERM, 0
+    for j in range(2 * NUM_PERM - 1, -1, -1):
+        if bins[j % NUM_PERM] is not None:
+            source = j
+        if j < NUM_PERM:
+            sig[j] = bins[source % NUM_PERM] + (source - j) * _SPAN
+    return tuple(sig)
+
+def pack_signature(sig: tuple[int, ...]) -> bytes:
+    return struct.pack(f"<{len(sig)}Q", *sig)
+
+def band_keys(sig: tuple[int, ...]) -> list[tuple[int, int]]:
+    """(band, bucket) pairs; the bucket is a signed 64-bit digest of the band's rows so SQLite can store it."""
+    keys = []
+    for band in range(BANDS):
+        digest = blake2b(pack_signature(sig[band * ROWS:(band + 1) * ROWS]), digest_size=8).digest()
+        keys.append((band, int.from_bytes(digest, "little", signed=True)))
+    return keys
@@ -0,0 +1,79 @@
+from features.dedupe import DedupeService
+from features.dedupe.minhash import BANDS, author_tokens, band_keys, normalize_title, shingles, signature
+from features.entries_services.entries_service import EntriesService
+
+def _seed(temp_db):
+    service = EntriesService(temp_db)
+    return service, {
+        "deep": service.add(authors="LeCun, Y.", title="Deep Learning."),
+        "deep2": service.add(authors="Y. LeCun", title="Deep learning"),
+        "deep3": service.add(authors="Yann LeCun", title="Deep  Learning!"),
+        "other_author": service.add(authors="Goodfellow, I.", title="Deep Learning"),
+        "graph": service.add(authors="Smith, A.", title="Graph Learning at Scale"),
+        "graph2": service.add(authors="A. Smith", title="Graph learning at scale."),
+        "kernel": service.add(authors="Jones, B.", title="Kernel Methods"),
+    }
+
+# MinHash tests
+def test_normalization():
+    assert normalize_title("  Déjà Vu:  a Study.") == "deja vu a study"
+    assert author_tokens("LeCun, Y.") == author_tokens("Y. LeCun") == {"lecun"}
+    assert author_tokens("Smith, J. and Doe, A. et al.") == {"smith", "doe"}
+
+def test_identical_inputs_share_every_band():
+    a = band_keys(signature(shingles("LeCun, Y.", "Deep Learning.")))
+    b = band_keys(signature(shingles("Y. LeCun", "Deep learning")))
+    assert a == b and len(a) == BANDS
+    assert not set(a) & set(band_keys(signature(shingles("Jones, B.", "Kernel Methods"))))
+
+# Dedupe service tests
+def test_scan_clusters_near_duplicates(temp_db):
+    _, ids = _seed(temp_db)
+    clusters = DedupeService(temp_db).scan()
+    assert sorted(c.entry_ids for c in clusters) == [
+        (ids["deep"], ids["deep2"], ids["deep3"]), (ids["graph"], ids["graph2"])]
+    for cluster in clusters:
+        assert 0.5 < cluster.score <= 1.0
+        assert {eid for a, b, _ in cluster.pairs for eid in (a, b)} == set(cluster.entry_ids)
+
+def test_check_and_incremental_index(temp_db):
+    service, ids = _seed(temp_db)
+    dedupe = DedupeService(temp_db)
+    assert dedupe.index() == len(ids)
+    assert dedupe.index() == 0
+    matches = dedupe.check("Smith, Alice", "Graph Learning at scale")
+    assert sorted(m.entry_id for m in matches) == [ids["graph"], ids["graph2"]]
+    assert all(m.title_score == 1.0 for m in matches)
+    # Editing the title drops the stored signature; the next check re-indexes only that entry.
+    service.update(ids["kernel"], title="Graph learning at scale")
+    assert [m.entry_id for m in dedupe.check("Jones, B.", "Graph Learning at Scale")] == [ids["kernel"]]
+    assert dedupe.index() == 0
+
+def test_add_reports_matches_and_indexes(temp_db):
+    _, ids = _seed(temp_db)
+    dedupe = DedupeService(temp_db)
+    entry_id, matches = dedupe.add(authors="Jones, Bob", title="Kernel methods.")
+    assert [m.entry_id for m in matches] == [ids["kernel"]]
+    assert dedupe.index() == 0
+    assert (ids["kernel"], entry_id) in [c.entry_ids for c in dedupe.scan()]
+
+def test_deleted_entries_leave_the_index(temp_db):
+    service, ids = _seed(temp_db)
+    dedupe = DedupeService(temp_db)
+    dedupe.index()
+    service.delete(ids["graph2"])
+    assert temp_db.conn.execute("SELECT COUNT(*) FROM entry_lsh WHERE entry_id = ?", (ids["graph2"],)).fetchone()[0] == 0
+    assert ids["graph2"] not in [eid for c in dedupe.scan() for eid in c.entry_ids]
+
+def test_check_indexes_only_what_changed_since_the_last_call(temp_db):
+    service, ids = _seed(temp_db)
+    dedupe = DedupeService(temp_db)
+    dedupe.check("Nobody", "Nothing")
+    scans = []
+    temp_db.conn.set_trace_callback(lambda sql: scans.append(sql) if "NOT EXISTS" in sql and "IN (" not in sql else None)
+    added = service.add(authors="Jones, Bob", title="Kernel methods.")
+    assert [m.entry_id for m in dedupe.check("Jones, B.", "Kernel Methods")] == [ids["kernel"], added]
+    dedupe.add(authors="B. Jones", title="Kernel Methods")
+    assert scans == []
+    temp_db.conn.set_trace_callback(None)
+    assert dedupe.index() == 0
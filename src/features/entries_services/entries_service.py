@@ -1,23 +1,175 @@
 from __future__ import annotations
+import threading
+from collections import OrderedDict
 from typing import Iterable, Any
+from src.features.database.changelog import ChangeFeed
 from src.features.database.db import BibliographyDB
-from src.features.database.operation import entry_ops
+from src.features.database.operation import changelog_ops, entry_ops, tag_ops
+from src.features.database.records import Entry
 
 class EntriesService:
-    def __init__(self, db: BibliographyDB):
+    """Entry operations on one connection, with an LRU of full Entry records for ``get``/``get_many``.
+
+    Cached entries are dropped by this service's own updates and deletes; when ``db.data_version()``
+    moves (another connection committed) the changelog says which other entries to drop. Reads go through ``db.read()``, so
+    one service can be shared by threads that each get a pooled reader.
+    """
+
+    def __init__(self, db: BibliographyDB, cache_size: int = 1024):
         self.db = db
+        self.cache_size = cache_size
+        self._cache: OrderedDict[int, Entry] = OrderedDict()
+        self._version: Any = None
+        self._changes = ChangeFeed(db)
+        self._lock = threading.Lock()
 
     def add(self, **kwargs) -> int:
         return entry_ops.add_entry(self.db, **kwargs)
 
+    def add_many(self, rows: Iterable[dict]) -> list[tuple[str, Any]]:
+        return entry_ops.add_entries(self.db, rows)
+
     def update(self, entry_id: int, **kwargs):
+        self._forget((entry_id,))
         return entry_ops.update_entry(self.db, entry_id, **kwargs)
 
     def delete(self, entry_id: int):
+        self._forget((entry_id,))
         return entry_ops.delete_entry(self.db, entry_id)
 
-    def list(self, where_clause: str | None = None, params: Iterable[Any] = ()):
-        return entry_ops.list_entries(self.db, where_clause, params)
+    def update_many(self, updates: Iterable[tuple[int, dict]]):
+        updates = list(updates)
+        self._forget(eid for eid, _ in updates)
+        return entry_ops.update_entries(self.db, updates)
+
+    def delete_many(self, entry_ids: Iterable[int]):
+        entry_ids = list(entry_ids)
+        self._forget(entry_ids)
+        return entry_ops.delete_entries(self.db, entry_ids)
+
+    def transaction(self):
+        return self.db.transaction()
+
+    def list(self, where_clause: str | None = None, params: Iterable[Any] = (),
+             after: tuple[str, int] | None = None, limit: int | None = None,
+             order_by: str | None = None, descending: bool = False, offset: int = 0):
+        with self.db.read() as db:
+            return entry_ops.list_entries(db, where_clause, params, after, limit, order_by, descending, offset)
+
+    def list_ids(self, where_clause: str | None = None, params: Iterable[Any] = (),
+                 order_by: str | None = None, descending: bool = False) -> list[int]:
+        with self.db.read() as db:
+            return entry_ops.list_entry_ids(db, where_clause, params, order_by, descending)
+
+    def list_by_ids(self, entry_ids: Iterable[int]):
+        with self.db.read() as db:
+            return entry_ops.list_entries_by_ids(db, entry_ids)
+
+    def list_page(self, where_clause: str | None = None, params: Iterable[Any] = (),
+                  after: tuple[str, int] | None = None, limit: int = 200):
+        with self.db.read() as db:
+            rows = entry_ops.list_entries(db, where_clause, params, after, limit)
+        return rows, (entry_ops.keyset_cursor(rows[-1]) if len(rows) == limit else None)
+
+    def count(self, where_clause: str | None = None, params: Iterable[Any] = ()) -> int:
+        with self.db.read() as db:
+            return entry_ops.count_entries(db, where_clause, params)
+
+    def year_counts(self) -> list[tuple[int | None, int]]:
+        with self.db.read() as db:
+            return entry_ops.year_counts(db)
+
+    def duplicate_groups(self) -> list[list[int]]:
+        with self.db.read() as db:
+            return entry_ops.find_duplicate_groups(db)
+
+    def merge(self, keep_id: int, duplicate_ids: Iterable[int]):
+        duplicate_ids = list(duplicate_ids)
+        self._forget([keep_id, *duplicate_ids])
+        return entry_ops.merge_entries(self.db, keep_id, duplicate_ids)
+
+    def search(self, text: str, limit: int | None = None, offset: int = 0):
+        with self.db.read() as db:
+            return entry_ops.search_entries(db, text, limit, offset)
+
+    def search_page(self, text: str, offset: int | None = None, limit: int = 200):
+        offset = offset or 0
+        with self.db.read() as db:
+            rows = entry_ops.search_entries(db, text, limit, offset)
+        return rows, (offset + len(rows) if len(rows) == limit else None)
+
+    def text_filter(self, text: str) -> tuple[str, tuple]:
+        return entry_ops.text_match_clause(self.db, text)
+
+    def tag_filter(self, tag: str) -> tuple[str, tuple]:
+        return tag_ops.tag_filter_clause(tag)
+
+    def tag_counts(self, limit: int | None = None) -> list[tuple[str, int]]:
+        with self.db.read() as db:
+            return tag_ops.tag_counts(db, limit)
+
+    def get(self, entry_id: int, neighbours: Iterable[int] = ()) -> Entry | None:
+        """One full entry. On a cache miss the uncached ``neighbours`` (e.g. the rows around
+        the selection) are fetched in the same query, so stepping through a list hits the cache."""
+        self._check_version()
+        with self._lock:
+            entry = self._cache.get(entry_id)
+            if entry is not None:
+                self._cache.move_to_end(entry_id)
+                return entry
+        return self._load([entry_id, *neighbours]).get(entry_id)
+
+    def get_many(self, entry_ids: Iterable[int]) -> list[Entry]:
+        """Entries in the order of ``entry_ids``, fetching the uncached ones in batches; missing ids are skipped."""
+        self._check_version()
+        entry_ids = list(entry_ids)
+        found = self._load(entry_ids)
+        return [found[eid] for eid in entry_ids if eid in found]
+
+    def prefetch(self, entry_ids: Iterable[int]):
+        self._check_version()
+        self._load(entry_ids)
+
+    def _load(self, entry_ids: Iterable[int]) -> dict[int, Entry]:
+        """The existing ones of ``entry_ids``, fetching only those not cached."""
+        entry_ids = list(dict.fromkeys(entry_ids))
+        with self._lock:
+            found = {eid: self._cache[eid] for eid in entry_ids if eid in self._cache}
+            version = self._version
+        missing = [eid for eid in entry_ids if eid not in found]
+        if not missing:
+            return found
+        with self.db.read() as db:
+            fetched = entry_ops.get_entries(db, missing)
+        found.update(fetched)
+        with self._lock:
+            if self._version != version:
+                # Another thread moved to a newer version meanwhile; these rows may predate it.
+                return found
+            # Only the tail of a large batch stays cached; get_many still returns all of it.
+            for eid in missing[max(0, len(missing) - self.cache_size):]:
+                if eid in fetched:
+                    self._cache[eid] = fetched[eid]
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return found
+
+    def _forget(self, entry_ids: Iterable[int]):
+        with self._lock:
+            for eid in entry_ids:
+                self._cache.pop(eid, None)
 
-    def get(self, entry_id: int) -> dict | None:
-        return entry_ops.get_entry(self.db, entry_id)
+    def _check_version(self):
+        version = self.db.data_version()
+        with self._lock:
+            if version == self._version:
+                return
+            changes = self._changes.poll(self.cache_size)
+            # The feed's position, not ``version``: a commit between the two reads was applied by this poll.
+            self._version = version if self.db.in_transaction else self._changes.seq
+            if changes is None:
+                self._cache.clear()
+                return
+            changed, deleted = changelog_ops.entry_changes(changes)
+            for eid in changed | deleted:
+                self._cache.pop(eid, None)
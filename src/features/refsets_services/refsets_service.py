@@ -1,4 +1,5 @@
 from __future__ import annotations
+from typing import Any, Iterable
 from src.features.database.db import BibliographyDB
 from src.features.database.operation import refset_ops, set_entries_ops
 
@@ -12,8 +13,23 @@ class RefsetsService:
     def delete(self, set_id: int):
         return refset_ops.delete_refset(self.db, set_id)
 
+    def delete_many(self, set_ids: Iterable[int]):
+        return refset_ops.delete_refsets(self.db, set_ids)
+
+    def transaction(self):
+        return self.db.transaction()
+
     def list(self):
-        return refset_ops.list_refsets(self.db)
+        with self.db.read() as db:
+            return refset_ops.list_refsets(db)
+
+    def get(self, set_id: int):
+        with self.db.read() as db:
+            return refset_ops.get_refset(db, set_id)
+
+    def sets_of_entry(self, entry_id: int):
+        with self.db.read() as db:
+            return set_entries_ops.list_sets_of_entry(db, entry_id)
 
     def add_entry(self, set_id: int, entry_id: int):
         return set_entries_ops.add_entry_to_set(self.db, set_id, entry_id)
@@ -21,5 +37,28 @@ class RefsetsService:
     def remove_entry(self, set_id: int, entry_id: int):
         return set_entries_ops.remove_entry_from_set(self.db, set_id, entry_id)
 
+    def add_entries(self, set_id: int, entry_ids: Iterable[int]) -> int:
+        return set_entries_ops.add_entries_to_set(self.db, set_id, entry_ids)
+
+    def remove_entries(self, set_id: int, entry_ids: Iterable[int]) -> int:
+        return set_entries_ops.remove_entries_from_set(self.db, set_id, entry_ids)
+
+    def add_search_results(self, set_id: int, where_clause: str | None = None, params: Iterable[Any] = ()) -> int:
+        return set_entries_ops.add_matching_entries_to_set(self.db, set_id, where_clause, params)
+
+    def union(self, left_id: int, right_id: int, name: str) -> tuple[int, int]:
+        return set_entries_ops.combine_sets(self.db, "union", left_id, right_id, name)
+
+    def intersection(self, left_id: int, right_id: int, name: str) -> tuple[int, int]:
+        return set_entries_ops.combine_sets(self.db, "intersection", left_id, right_id, name)
+
+    def difference(self, left_id: int, right_id: int, name: str) -> tuple[int, int]:
+        return set_entries_ops.combine_sets(self.db, "difference", left_id, right_id, name)
+
     def list_entries(self, set_id: int):
-        return set_entries_ops.list_entries_in_set(self.db, set_id)
+        with self.db.read() as db:
+            return set_entries_ops.list_entries_in_set(db, set_id)
+
+    def count_entries(self, set_id: int) -> int:
+        with self.db.read() as db:
+            return set_entries_ops.count_entries_in_set(db, set_id)
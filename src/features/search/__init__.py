@@ -0,0 +1,4 @@
+from .query import SearchPlan, advanced_query, compile_query, parse_query
+from .search_service import SearchService
+
+__all__ = ['SearchPlan', 'SearchService', 'advanced_query', 'compile_query', 'parse_query']
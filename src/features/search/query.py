@@ -0,0 +1,132 @@
+from __future__ import annotations
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Union
+
+from src.features.database.dates import DATE_PREFIX, prefix_clause, prefix_to_range, pub_sort_range, range_clause
+from src.features.database.operation import entry_ops, tag_ops
+
+# Query AST. Nodes are frozen (hashable, and equal only to the same node type) so parsed queries
+# and compiled plans can be cached.
+@dataclass(frozen=True)
+class Text:
+    text: str
+
+@dataclass(frozen=True)
+class Tag:
+    tag: str
+
+@dataclass(frozen=True)
+class Author:
+    text: str
+
+@dataclass(frozen=True)
+class Year:
+    year: int
+
+@dataclass(frozen=True)
+class DatePrefix:
+    column: str
+    prefix: str
+
+@dataclass(frozen=True)
+class DateRange:
+    # Inclusive YYYY[-MM[-DD]] prefixes; either end may be open.
+    column: str
+    start: str | None
+    end: str | None
+
+@dataclass(frozen=True)
+class And:
+    terms: tuple
+
+Node = Union[Text, Tag, Author, Year, DatePrefix, DateRange, And]
+
+@dataclass(frozen=True)
+class SearchPlan:
+    where: str | None
+    params: tuple
+    # FTS query when results are ranked by relevance instead of listed newest first.
+    rank: str | None = None
+
+    @property
+    def filter(self) -> tuple[str | None, tuple]:
+        return self.where, self.params
+
+_FIELD = re.compile(r"^(tag|author|created|pub):(.+)$", re.IGNORECASE)
+_DATE_COLUMNS = {"created": "created_at", "pub": "publication_date"}
+
+@lru_cache(maxsize=256)
+def parse_query(q: str) -> Node | None:
+    """Parse the quick-search box: ``tag:``, ``author:``, ``created:`` and ``pub:`` prefixes,
+    a bare YYYY[-MM[-DD]] date, or free text."""
+    q = q.strip()
+    if not q:
+        return None
+    m = _FIELD.match(q)
+    if m:
+        field, value = m.group(1).lower(), m.group(2)
+        if field == "tag":
+            return Tag(value)
+        if field == "author":
+            return Author(value.strip())
+        if DATE_PREFIX.match(value):
+            return DatePrefix(_DATE_COLUMNS[field], value)
+    if DATE_PREFIX.match(q):
+        return DatePrefix("publication_date", q) if "-" in q else Year(int(q))
+    return Text(q)
+
+def _range(column: str, label: str, start: str, end: str) -> DateRange | None:
+    for value, side in ((start, "From"), (end, "To")):
+        if value and not DATE_PREFIX.match(value):
+            raise ValueError(f"{label} {side} must be YYYY, YYYY-MM, or YYYY-MM-DD")
+        if value and column == "created_at":
+            prefix_to_range(value)  # rejects impossible calendar dates such as 2023-02-31
+    if not (start or end):
+        return None
+    return DateRange(column, start or None, end or None)
+
+def advanced_query(text: str = "", tag: str = "", author: str = "", created_from: str = "", created_to: str = "",
+                   pub_from: str = "", pub_to: str = "") -> Node | None:
+    """Build the AST for the advanced-search form; blank fields are ignored, bad dates raise ValueError."""
+    text, tag, author = text.strip(), tag.strip(), author.strip()
+    terms = [
+        Text(text) if text else None,
+        Tag(tag) if tag else None,
+        Author(author) if author else None,
+        _range("created_at", "Created", created_from.strip(), created_to.strip()),
+        _range("publication_date", "Publication", pub_from.strip(), pub_to.strip()),
+    ]
+    terms = tuple(t for t in terms if t is not None)
+    if not terms:
+        return None
+    return terms[0] if len(terms) == 1 else And(terms)
+
+def _clause(node: Node, has_fts: bool) -> tuple[str, tuple]:
+    if isinstance(node, Text):
+        return entry_ops.text_clause(node.text, has_fts)
+    if isinstance(node, Tag):
+        return tag_ops.tag_filter_clause(node.tag)
+    if isinstance(node, Author):
+        return "authors LIKE ?", (f"%{node.text}%",)
+    if isinstance(node, Year):
+        start, end = pub_sort_range(f"{node.year:04d}")
+        return "(year = ? OR (pub_sort >= ? AND pub_sort < ?))", (node.year, start, end)
+    if isinstance(node, DatePrefix):
+        return prefix_clause(node.column, node.prefix)
+    if isinstance(node, DateRange):
+        return range_clause(node.column, node.start, node.end)
+    if isinstance(node, And):
+        clauses = [_clause(t, has_fts) for t in node.terms]
+        return " AND ".join(f"({w})" for w, _ in clauses), tuple(p for _, ps in clauses for p in ps)
+    raise ValueError(f"Unknown query node {node!r}")
+
+@lru_cache(maxsize=256)
+def compile_query(node: Node | None, has_fts: bool = True) -> SearchPlan:
+    if node is None:
+        return SearchPlan(None, ())
+    where, params = _clause(node, has_fts)
+    # Free text on its own is ranked by relevance; combined with other fields it is just a filter.
+    rank = entry_ops.fts_query(node.text) if isinstance(node, Text) and has_fts else ""
+    return SearchPlan(where, tuple(params), rank or None)
@@ -0,0 +1,92 @@
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from src.features.database.changelog import ChangeFeed
+from src.features.database.db import BibliographyDB
+from src.features.database.operation import changelog_ops, entry_ops
+from .query import Node, SearchPlan, compile_query, parse_query
+
+class SearchService:
+    """Runs quick/advanced searches, keeping the matching ids of recent queries.
+
+    When ``db.data_version()`` moves the changelog decides what survives: membership and set changes
+    keep every cached list, entry deletions are filtered out of them, anything else drops them. So
+    paging or re-running a search between writes only fetches the rows being shown. Safe to share
+    between threads: queries run on pooled readers outside the cache lock.
+    """
+
+    def __init__(self, db: BibliographyDB, max_results: int = 32, max_cached_ids: int = 100_000):
+        self.db = db
+        self.max_results = max_results
+        self.max_cached_ids = max_cached_ids
+        self._results: OrderedDict[SearchPlan, list[int]] = OrderedDict()
+        self._version: Any = None
+        self._changes = ChangeFeed(db)
+        self._lock = threading.Lock()
+
+    def plan(self, query: str | Node | None) -> SearchPlan:
+        node = parse_query(query) if isinstance(query, str) else query
+        return compile_query(node, self.db.has_fts)
+
+    def filter(self, query: str | Node | None) -> tuple[str | None, tuple]:
+        return self.plan(query).filter
+
+    def ids(self, query: str | Node | None) -> list[int]:
+        plan = self.plan(query)
+        version = self._sync()
+        with self._lock:
+            ids = self._results.get(plan)
+            if ids is not None:
+                self._results.move_to_end(plan)
+                return ids
+        with self.db.read() as db:
+            if plan.rank:
+                ids = entry_ops.search_entry_ids(db, plan.rank)
+            else:
+                ids = entry_ops.list_entry_ids(db, plan.where, plan.params)
+        if len(ids) <= self.max_cached_ids:
+            with self._lock:
+                if version == self._version:
+                    self._results[plan] = ids
+                    if len(self._results) > self.max_results:
+                        self._results.popitem(last=False)
+        return ids
+
+    def count(self, query: str | Node | None) -> int:
+        return len(self.ids(query))
+
+    def search(self, query: str | Node | None, limit: int | None = None, offset: int = 0):
+        ids = self.ids(query)
+        with self.db.read() as db:
+            return entry_ops.list_entries_by_ids(db, ids[offset:None if limit is None else offset + limit])
+
+    def page(self, query: str | Node | None, offset: int | None = None, limit: int = 200):
+        offset = offset or 0
+        ids = self.ids(query)
+        with self.db.read() as db:
+            rows = entry_ops.list_entries_by_ids(db, ids[offset:offset + limit])
+        return rows, (offset + limit if offset + limit < len(ids) else None)
+
+    def _sync(self):
+        version = self.db.data_version()
+        with self._lock:
+            if version == self._version:
+                return version
+            changes = self._changes.poll(self.max_cached_ids)
+            # Label the cache with the feed's position, not ``version``: a commit landing between the two
+            # reads was applied by this poll, and results read before it must not be stored under its label.
+            self._version = version if self.db.in_transaction else self._changes.seq
+            changed, deleted = changelog_ops.entry_changes(changes or ())
+            if changes is None or changed:
+                # New or edited entries may match any query, and where they rank is only known to SQLite.
+                self._results.clear()
+            elif deleted:
+                for plan, ids in list(self._results.items()):
+                    self._results[plan] = [eid for eid in ids if eid not in deleted]
+            return self._version
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
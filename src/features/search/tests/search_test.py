@@ -0,0 +1,113 @@
+import pytest
+
+from features.database import db
+from features.entries_services.entries_service import EntriesService
+from features.search import SearchService, advanced_query, compile_query, parse_query
+from features.search.query import And, Author, DatePrefix, DateRange, Tag, Text, Year
+
+def _seed(temp_db):
+    service = EntriesService(temp_db)
+    ids = {
+        "graph": service.add(authors="Smith, A.", title="Graph Learning at Scale", tags="ml, graphs",
+                             publication_date="2021-03-04"),
+        "kernel": service.add(authors="Jones, B.", title="Kernel Methods", tags="ml", year=2019),
+        "review": service.add(authors="Smith, C.", title="A Review of Graph Databases", publication_date="2019-11"),
+    }
+    return service, ids
+
+def _ids(rows):
+    return [r[0] for r in rows]
+
+# Parser tests
+def test_parse_quick_search_forms():
+    assert parse_query("tag:ML") == Tag("ML")
+    assert parse_query("Author: Smith ") == Author("Smith")
+    assert parse_query("created:2024-05") == DatePrefix("created_at", "2024-05")
+    assert parse_query("pub:2021") == DatePrefix("publication_date", "2021")
+    assert parse_query("2019") == Year(2019)
+    assert parse_query("2019-11") == DatePrefix("publication_date", "2019-11")
+    assert parse_query("created:yesterday") == Text("created:yesterday")
+    assert parse_query("graph learning") == Text("graph learning")
+    assert parse_query("   ") is None
+    # Node types never compare equal to each other, so cached plans cannot collide.
+    assert Text("smith") != Author("smith")
+
+def test_advanced_query_builds_and_validates():
+    assert advanced_query() is None
+    assert advanced_query(author="Smith") == Author("Smith")
+    query = advanced_query(text="graph", tag="ml", created_from="2024", pub_from="2020-02", pub_to="2021")
+    assert query == And((Text("graph"), Tag("ml"), DateRange("created_at", "2024", None),
+                         DateRange("publication_date", "2020-02", "2021")))
+    assert advanced_query(created_to="2024-12") == DateRange("created_at", None, "2024-12")
+    with pytest.raises(ValueError, match="Publication To"):
+        advanced_query(pub_to="12/2020")
+    with pytest.raises(ValueError):
+        advanced_query(created_from="2023-02-31")
+
+def test_compile_is_parameterized_and_cached():
+    plan = compile_query(parse_query("author:O'Brien"), True)
+    assert plan.where == "authors LIKE ?" and plan.params == ("%O'Brien%",)
+    assert compile_query(parse_query("author:O'Brien"), True) is plan
+    assert compile_query(Text("graph"), True).rank == '"graph"*'
+    assert compile_query(Text("graph"), False).rank is None
+
+# Service tests
+def test_quick_search_forms_return_matches(temp_db):
+    _, ids = _seed(temp_db)
+    search = SearchService(temp_db)
+    assert set(_ids(search.search("tag:ML"))) == {ids["graph"], ids["kernel"]}
+    assert _ids(search.search("author:smith")) == [ids["review"], ids["graph"]]
+    assert _ids(search.search("pub:2021-03")) == [ids["graph"]]
+    assert set(_ids(search.search("2019"))) == {ids["kernel"], ids["review"]}
+    assert len(search.search("created:" + temp_db.utcnow_iso()[:7])) == 3
+    assert _ids(search.search("graph"))[0] == ids["graph"]
+
+def test_advanced_search_combines_terms(temp_db):
+    _, ids = _seed(temp_db)
+    search = SearchService(temp_db)
+    assert _ids(search.search(advanced_query(text="graph", tag="ml"))) == [ids["graph"]]
+    assert _ids(search.search(advanced_query(author="smith", pub_from="2019", pub_to="2019"))) == [ids["review"]]
+
+def test_page_serves_from_cached_ids(temp_db):
+    service = EntriesService(temp_db)
+    service.add_many({"authors": "Doe, J.", "title": f"Paper {i}", "tags": "bulk"} for i in range(25))
+    search = SearchService(temp_db)
+    rows, next_offset = search.page("tag:bulk", None, 10)
+    assert len(rows) == 10 and next_offset == 10
+    statements = []
+    temp_db.conn.set_trace_callback(statements.append)
+    rows2, _ = search.page("tag:bulk", next_offset, 10)
+    temp_db.conn.set_trace_callback(None)
+    assert not any("entry_tags" in sql for sql in statements)
+    assert not set(_ids(rows)) & set(_ids(rows2))
+    assert search.page("tag:bulk", 20, 10)[1] is None
+
+def test_writes_invalidate_cached_results(temp_db):
+    service, ids = _seed(temp_db)
+    search = SearchService(temp_db)
+    assert len(search.search("tag:ml")) == 2
+    service.update(ids["review"], tags="ml")
+    assert len(search.search("tag:ml")) == 3
+    # Commits from another connection (e.g. the UI thread) are noticed as well.
+    other = db.BibliographyDB(temp_db.db_file)
+    EntriesService(other).delete(ids["kernel"])
+    other.close()
+    assert len(search.search("tag:ml")) == 2
+
+def test_commit_between_version_and_poll_is_not_labelled_old(temp_db, monkeypatch):
+    service, ids = _seed(temp_db)
+    search = SearchService(temp_db)
+    search.ids("tag:ml")
+    service.update(ids["review"], tags="ml")
+    read_version = temp_db.data_version
+
+    def racing_version():
+        version = read_version()
+        monkeypatch.undo()
+        service.add(authors="Late, L.", title="Committed mid-sync", tags="ml")
+        return version
+
+    monkeypatch.setattr(temp_db, "data_version", racing_version)
+    # Ids read before the late commit could be stored under the returned label; it must not be the old version.
+    assert search._sync() == temp_db.data_version()
+    assert len(search.ids("tag:ml")) == 4
@@ -1,42 +1,98 @@
 from __future__ import annotations
+import queue
 import re
-from datetime import date
+import time
+from types import SimpleNamespace
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog, filedialog
+from tkinter import ttk, messagebox
 
-from src.features.database.db import BibliographyDB
+from src.features.database.changelog import ChangeFeed
+from src.features.database.db import DB_FILE, BibliographyDB
+from src.features.database.executor import QueryExecutor
+from src.features.database.operation.changelog_ops import entry_changes
 from src.features.entries_services.entries_service import EntriesService
 from src.features.refsets_services.refsets_service import RefsetsService
-from src.features.bibtex.bibtex import entry_to_bibtex
-
-def prefix_to_range(prefix: str):
-    if not re.match(r'^\d{4}(-\d{2}){0,2}$', prefix):
-        raise ValueError('Date must be YYYY, YYYY-MM, or YYYY-MM-DD')
-    parts = prefix.split('-')
-    if len(parts) == 1:
-        y = int(parts[0]); start = f"{y:04d}-01-01"; end = f"{y+1:04d}-01-01"
-    elif len(parts) == 2:
-        y, m = int(parts[0]), int(parts[1])
-        start = f"{y:04d}-{m:02d}-01"
-        end = f"{(y if m < 12 else y+1):04d}-{(m+1 if m < 12 else 1):02d}-01"
-    else:
-        y, m, d = int(parts[0]), int(parts[1]), int(parts[2])
-        start = f"{y:04d}-{m:02d}-{d:02d}"
-        ne = date.fromordinal(date(y, m, d).toordinal() + 1)
-        end = ne.strftime('%Y-%m-%d')
-    return start, end
+from src.features.ui.virtual_list import VirtualTreeview
+
+# Dialog modules, search and BibTeX import/export are imported where they are used, keeping startup lean.
+
+POLL_MS = 30
+DETAIL_PREFETCH = 25  # rows on each side of the selection loaded with it
+CHANGES_MS = 2000     # how often the changelog is checked for edits made elsewhere
+CHANGES_LIMIT = 5000  # more pending events than this reload the list instead
+
+def _worker_services(db: BibliographyDB) -> SimpleNamespace:
+    from src.features.dedupe import DedupeService  # runs on the query thread, off the startup path
+    from src.features.search import SearchService
+    return SimpleNamespace(db=db, entries=EntriesService(db), refsets=RefsetsService(db), search=SearchService(db),
+                           dedupe=DedupeService(db), changes=ChangeFeed(db))
 
 class BibliographyApp(tk.Tk):
-    def __init__(self):
+    def __init__(self, db_file: str = DB_FILE):
+        self._started = time.perf_counter()
+        # Seconds since construction; "first_paint" once the window is drawn, "interactive" once
+        # the first page of entries and the set list are shown.
+        self.startup_times = {}; self._startup_waiting = {"entries", "sets"}
         super().__init__()
         self.title("Bibliography Manager"); self.geometry("1150x660")
-        self.db = BibliographyDB()
+        self.db = BibliographyDB(db_file)
         self.entries = EntriesService(self.db)
         self.refsets = RefsetsService(self.db)
+        self.search = None
         self.selected_entry_id = None
         self.selected_set_id = None
+        # Reads run on a worker connection; results come back through _drain_results on the Tk thread.
+        self.queries = QueryExecutor(self.db.db_file, setup=_worker_services, profile=self.db.profile,
+                                     profiler=self.db.profiler)
+        self._pending = {}; self._results = queue.SimpleQueue()
+        self._changes_again = False
         self._build_ui()
+        self.after(POLL_MS, self._drain_results)
+        self.after(CHANGES_MS, self._watch_changes)
+        # Paint first: the initial loads are queued once the window is mapped.
+        self.bind("<Map>", self._on_first_map)
+
+    def _on_first_map(self, event):
+        if event.widget is not self: return
+        self.unbind("<Map>")
         self.refresh_entries(); self.refresh_sets()
+        self.after_idle(self._mark_painted)
+
+    def _mark_painted(self):
+        self.update_idletasks()
+        self.startup_times["first_paint"] = time.perf_counter() - self._started
+
+    def _startup_step(self, part):
+        if part not in self._startup_waiting: return
+        self._startup_waiting.discard(part)
+        if not self._startup_waiting:
+            self.startup_times["interactive"] = time.perf_counter() - self._started
+
+    def _submit(self, channel, fn, on_done, *args, on_error=None):
+        # A new call on a channel supersedes (and cancels) the one still pending there.
+        prev = self._pending.get(channel)
+        if prev is not None:
+            self.queries.cancel(prev)
+        future = self.queries.submit(fn, *args)
+        self._pending[channel] = future
+        future.add_done_callback(lambda f: self._results.put((channel, f, on_done, on_error)))
+
+    def _drain_results(self):
+        while True:
+            try:
+                channel, future, on_done, on_error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if self._pending.get(channel) is not future or future.cancelled():
+                continue
+            del self._pending[channel]
+            exc = future.exception()
+            if exc is None:
+                on_done(future.result())
+                continue
+            if on_error: on_error(exc)
+            messagebox.showerror("Error", str(exc))
+        self.after(POLL_MS, self._drain_results)
 
     def _build_ui(self):
         top = ttk.Frame(self); top.pack(fill="x", padx=6, pady=6)
@@ -52,29 +108,26 @@ class BibliographyApp(tk.Tk):
         left = ttk.Frame(main, width=480); main.add(left, weight=1)
         ttk.Label(left, text="Entries").pack(anchor="w")
 
-        self.entries_tree = ttk.Treeview(
-            left,
-            columns=("authors", "title", "venue", "year", "pubdate", "tags", "created"),
-            show="headings", selectmode="browse",
-        )
-        for col, w, header in [
+        # Only the rows on screen exist as Treeview items; the rest are fetched by id as the list scrolls.
+        self.entry_list = VirtualTreeview(left, [
             ("authors", 220, "Authors"),
             ("title", 300, "Title"),
             ("venue", 150, "Venue"),
             ("year", 60, "Year"),
-            ("pubdate", 180, "Publication Date"),
+            ("publication_date", 180, "Publication Date"),
             ("tags", 180, "Tags"),
-            ("created", 170, "Created"),
-        ]:
-            self.entries_tree.heading(col, text=header)
-            self.entries_tree.column(col, width=w, anchor="w")
-        self.entries_tree.pack(fill="both", expand=True)
-        self.entries_tree.bind("<<TreeviewSelect>>", self.on_select_entry)
+            ("created_at", 170, "Created"),
+        ], self._submit, on_select=self.on_select_entry, on_sort=self._reload_entries,
+            on_ready=lambda: self._startup_step("entries"))
+        self.entry_list.pack(fill="both", expand=True)
+        self.entries_tree = self.entry_list.tree
+        self._current_filter = (None, ()); self._current_query = None
 
         btns = ttk.Frame(left); btns.pack(fill="x")
         ttk.Button(btns, text="Add entry", command=self.show_add_dialog).pack(side="left")
         ttk.Button(btns, text="Edit entry", command=self.show_edit_dialog).pack(side="left")
         ttk.Button(btns, text="Delete entry", command=self.delete_selected_entry).pack(side="left")
+        ttk.Button(btns, text="Import BibTeX", command=self.import_bibtex).pack(side="left", padx=6)
 
         right = ttk.Frame(main); main.add(right, weight=2)
         form = ttk.Frame(right); form.pack(fill="both", expand=True)
@@ -105,9 +158,8 @@ class BibliographyApp(tk.Tk):
         ttk.Button(sets, text="Remove selected entry from set", command=self.remove_selected_from_set).pack(side="left")
         ttk.Button(sets, text="Show entries in set", command=self.show_entries_in_set).pack(side="left", padx=6)
         ttk.Button(sets, text="Export set to BibTeX", command=self.export_set_bibtex).pack(side="left", padx=6)
-
-    def _like_for_prefix_date(self, value: str) -> str:
-        return value.strip() + "%"
+        ttk.Button(sets, text="Add all results to set", command=self.add_results_to_set).pack(side="left")
+        ttk.Button(sets, text="Combine sets...", command=self.open_combine_sets).pack(side="left", padx=6)
 
     def _collect_form(self) -> dict:
         def none_if_empty(x: str):
@@ -149,57 +201,68 @@ class BibliographyApp(tk.Tk):
         }
 
     def refresh_entries(self):
-        rows = self.entries.list()
-        self._populate_entries(rows)
-
-    def _populate_entries(self, rows):
-        for i in self.entries_tree.get_children():
-            self.entries_tree.delete(i)
-        for r in rows:
-            entry_id, authors, title, venue, year, pubdate, tags, created = r
-            self.entries_tree.insert(
-                "", "end", iid=str(entry_id),
-                values=(authors, title, venue or "", year or "", pubdate or "", tags or "", created)
-            )
+        self._show_query()
+
+    def _show_query(self, where=None, params=()):
+        self._show_entries((where, params))
+
+    def _show_entries(self, filter, search_query=None):
+        self._current_filter, self._current_query = filter, search_query
+        self._reload_entries()
+
+    def _reload_entries(self, keep_position=False):
+        # Runs again when a column heading is clicked; the id list is re-fetched in the new order.
+        sort, query = self.entry_list.sort, self._current_query
+        if sort is None and query is not None:
+            # Unsorted searches keep their relevance order and the worker's cached result ids.
+            self.entry_list.load(lambda q: q.search.ids(query), keep_position)
+            return
+        where, params = self._current_filter
+        column, descending = sort or (None, False)
+        self.entry_list.load(lambda q: q.entries.list_ids(where, params, column, descending), keep_position)
+
+    def _watch_changes(self):
+        self._poll_changes()
+        self.after(CHANGES_MS, self._watch_changes)
+
+    def _poll_changes(self):
+        # Never superseded: a cancelled poll could lose events the worker's feed already moved past.
+        if "changes" in self._pending:
+            self._changes_again = True; return
+        self._submit("changes", lambda q: q.changes.poll(CHANGES_LIMIT), self._apply_changes)
+
+    def _apply_changes(self, changes):
+        # Refresh only what the committed changes touch, keeping the filter, sort and scroll position.
+        if self._changes_again:
+            self._changes_again = False; self.after_idle(self._poll_changes)
+        if changes is None:
+            self._reload_entries(keep_position=True); self.refresh_sets(); return
+        if not changes: return
+        tables = {c.table for c in changes}
+        changed, deleted = entry_changes(changes)
+        if "refsets" in tables: self.refresh_sets()
+        # Edits can move a row in a sorted or filtered list, or in or out of it; the default order is by created_at.
+        filtered = self._current_filter[0] is not None or self.entry_list.sort is not None
+        # Compaction reports an insert that was edited since as 'U', so new rows are the ones the list lacks.
+        model = self.entry_list.model
+        unseen = any(model.index(eid) is None for eid in changed)
+        if unseen or deleted or (filtered and (changed or "set_entries" in tables)):
+            self._reload_entries(keep_position=True)
+        elif changed:
+            self.entry_list.refresh_rows(changed)
 
     def on_search(self):
-        import re
         q = self.search_var.get().strip()
         if not q:
             self.refresh_entries(); return
+        self._show_search(q)
 
-        where, params = None, None
-        m = re.match(r"^tag:(.+)$", q, flags=re.IGNORECASE)
-        if m:
-            where, params = ("tags LIKE ?", (f"%{m.group(1).strip()}%",))
-
-        if where is None:
-            m = re.match(r"^author:(.+)$", q, flags=re.IGNORECASE)
-            if m:
-                where, params = ("authors LIKE ?", (f"%{m.group(1).strip()}%",))
-
-        if where is None:
-            m = re.match(r"^created:(\d{4}(?:-\d{2})?(?:-\d{2})?)$", q, flags=re.IGNORECASE)
-            if m:
-                where, params = ("created_at LIKE ?", (self._like_for_prefix_date(m.group(1)),))
-
-        if where is None:
-            m = re.match(r"^pub:(\d{4}(?:-\d{2})?(?:-\d{2})?)$", q, flags=re.IGNORECASE)
-            if m:
-                where, params = ("publication_date LIKE ?", (self._like_for_prefix_date(m.group(1)),))
-
-        if where is None and re.match(r"^\d{4}(?:-\d{2})?(?:-\d{2})?$", q):
-            if "-" in q:
-                where, params = ("publication_date LIKE ?", (self._like_for_prefix_date(q),))
-            else:
-                where = "(year = ? OR publication_date LIKE ?)"
-                params = (int(q), f"{q}%")
-
-        if where is None:
-            where = "(authors LIKE ? OR title LIKE ? OR tags LIKE ? OR venue LIKE ?)"
-            p = f"%{q}%"; params = (p, p, p, p)
-
-        self._populate_entries(self.entries.list(where, params))
+    def _show_search(self, query):
+        if self.search is None:
+            from src.features.search import SearchService
+            self.search = SearchService(self.db)
+        self.entry_list.clear_sort()
+        self._show_entries(self.search.filter(query), query)
 
     def open_advanced_search(self):
         dlg = tk.Toplevel(self); dlg.title("Advanced Search"); dlg.transient(self); dlg.grab_set()
@@ -231,60 +294,14 @@ class BibliographyApp(tk.Tk):
         pub_to = tk.StringVar(); ttk.Entry(pd_fr, textvariable=pub_to).pack(side="left", fill="x", expand=True)
 
         def run_advanced():
-            import re
-            where, params = [], []
-
-            t = text_contains.get().strip()
-            if t:
-                p = f"%{t}%"
-                where.append("(authors LIKE ? OR title LIKE ? OR venue LIKE ? OR tags LIKE ?)")
-                params += [p, p, p, p]
-
-            tg = tag.get().strip()
-            if tg:
-                where.append("tags LIKE ?"); params.append(f"%{tg}%")
-
-            au = author.get().strip()
-            if au:
-                where.append("authors LIKE ?"); params.append(f"%{au}%")
-
-            cf = created_from.get().strip()
-            ct = created_to.get().strip()
-            if cf and not re.match(r'^\d{4}(-\d{2}){0,2}$', cf):
-                messagebox.showerror("Error", "Created From must be YYYY, YYYY-MM, or YYYY-MM-DD"); return
-            if ct and not re.match(r'^\d{4}(-\d{2}){0,2}$', ct):
-                messagebox.showerror("Error", "Created To must be YYYY, YYYY-MM, or YYYY-MM-DD"); return
-            if cf:
-                cfs, cfe = prefix_to_range(cf)
-                if ct:
-                    _, cte = prefix_to_range(ct)
-                    where.append("(created_at >= ? AND created_at < ?)"); params += [cfs, cte]
-                else:
-                    where.append("(created_at >= ? AND created_at < ?)"); params += [cfs, cfe]
-            elif ct:
-                _, cte = prefix_to_range(ct)
-                where.append("(created_at < ?)"); params += [cte]
-
-            pf = pub_from.get().strip()
-            pt = pub_to.get().strip()
-            if pf and not re.match(r'^\d{4}(-\d{2}){0,2}$', pf):
-                messagebox.showerror("Error", "Publication From must be YYYY, YYYY-MM, or YYYY-MM-DD"); return
-            if pt and not re.match(r'^\d{4}(-\d{2}){0,2}$', pt):
-                messagebox.showerror("Error", "Publication To must be YYYY, YYYY-MM, or YYYY-MM-DD"); return
-            if pf:
-                pfs, pfe = prefix_to_range(pf)
-                if pt:
-                    _, pte = prefix_to_range(pt)
-                    where.append("(publication_date >= ? AND publication_date < ?)"); params += [pfs, pte]
-                else:
-                    where.append("(publication_date >= ? AND publication_date < ?)"); params += [pfs, pfe]
-            elif pt:
-                _, pte = prefix_to_range(pt)
-                where.append("(publication_date < ?)"); params += [pte]
-
-            sql_where = " AND ".join(where) if where else None
-            rows = self.entries.list(sql_where, tuple(params))
-            self._populate_entries(rows)
+            from src.features.search import advanced_query
+            try:
+                query = advanced_query(text_contains.get(), tag.get(), author.get(), created_from.get(),
+                                       created_to.get(), pub_from.get(), pub_to.get())
+            except ValueError as e:
+                messagebox.showerror("Error", str(e)); return
+            if query is None: self.refresh_entries()
+            else: self._show_search(query)
             dlg.destroy()
 
         btns = ttk.Frame(frm); btns.pack(fill="x", pady=10)
@@ -292,11 +309,14 @@ class BibliographyApp(tk.Tk):
         ttk.Button(btns, text="Cancel", command=dlg.destroy).pack(side="left", padx=6)
         dlg.wait_visibility(); dlg.focus_set()
 
-    def on_select_entry(self, _):
-        sel = self.entries_tree.selection()
-        self.selected_entry_id = int(sel[0]) if sel else None
-        if not self.selected_entry_id: return
-        entry = self.entries.get(self.selected_entry_id)
+    def on_select_entry(self, entry_id):
+        self.selected_entry_id = entry_id
+        # A miss also loads the rows around the selection, so arrowing through the list reads from the cache.
+        ids, i = self.entry_list.model.ids, self.entry_list.model.index(entry_id)
+        neighbours = ids[max(0, i - DETAIL_PREFETCH):i + DETAIL_PREFETCH + 1] if i is not None else ()
+        self._submit("detail", lambda q, eid, near: q.entries.get(eid, near), self._fill_form, entry_id, neighbours)
+
+    def _fill_form(self, entry):
         if not entry: return
         mapping = {
             "Authors (required)": "authors","Title (required)": "title","Venue/Journal": "venue","Year": "year",
@@ -317,7 +337,21 @@ class BibliographyApp(tk.Tk):
 
     def add_entry_from_form(self):
         try:
-            eid = self.entries.add(**self._collect_form())
+            fields = self._collect_form()
+        except ValueError as e:
+            messagebox.showerror("Error", str(e)); return
+        # Near-duplicate check on the query thread (the first one indexes the library, later ones only new rows).
+        self._submit("dedupe", lambda q, f: q.dedupe.check(f["authors"], f["title"]),
+                     lambda matches: self._add_entry(fields, matches), fields)
+
+    def _add_entry(self, fields, matches):
+        if matches:
+            similar = "\n".join(f"#{e['id']} {e['authors']} - {e['title']}"
+                                for e in self.entries.get_many(m.entry_id for m in matches[:5]))
+            if not messagebox.askyesno("Possible duplicate", f"Similar entries already exist:\n\n{similar}\n\nAdd anyway?"):
+                return
+        try:
+            eid = self.entries.add(**fields)
             messagebox.showinfo("Added", f"Entry added with id {eid}")
             self.refresh_entries(); self.clear_form()
         except Exception as e:
@@ -329,7 +363,7 @@ class BibliographyApp(tk.Tk):
         try:
             self.entries.update(self.selected_entry_id, **self._collect_form())
             messagebox.showinfo("Updated", "Entry updated")
-            self.refresh_entries()
+            self._poll_changes()
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
@@ -338,19 +372,41 @@ class BibliographyApp(tk.Tk):
             messagebox.showwarning("Delete", "Select an entry to delete."); return
         if messagebox.askyesno("Confirm", "Delete selected entry?"):
             self.entries.delete(self.selected_entry_id)
-            self.refresh_entries(); self.clear_form()
+            self.selected_entry_id = self.entry_list.selected_id = None
+            self._poll_changes(); self.clear_form()
+
+    def import_bibtex(self):
+        from tkinter import filedialog
+        from src.features.bibtex.parser import import_bibtex_path
+        path = filedialog.askopenfilename(filetypes=[("BibTeX files","*.bib"), ("All files","*")], title="Import BibTeX file")
+        if not path: return
+
+        def done(results):
+            counts = {}
+            for status, _ in results:
+                counts[status] = counts.get(status, 0) + 1
+            messagebox.showinfo("Imported", f"Imported {counts.get('inserted', 0)} entries "
+                                f"({counts.get('duplicate', 0)} duplicates, {counts.get('invalid', 0)} without authors/title skipped)")
+            self.refresh_entries()
+
+        self._submit("import", lambda q, p: import_bibtex_path(q.db, p), done, path)
 
     def clear_form(self):
         for v in self.form_vars.values():
             v.set("")
 
     def refresh_sets(self):
-        sets = self.refsets.list()
+        self._submit("sets", lambda q: q.refsets.list(), self._show_sets)
+
+    def _show_sets(self, sets):
+        self._startup_step("sets")
         self._sets_cache = sets
         names = [s[1] for s in sets]
+        # Keep the chosen set across refreshes (e.g. after a set was created elsewhere).
+        keep = next((i for i, s in enumerate(sets) if s[0] == self.selected_set_id), 0)
         self.sets_combo["values"] = names
         if names:
-            self.sets_combo.current(0); self.selected_set_id = sets[0][0]
+            self.sets_combo.current(keep); self.selected_set_id = sets[keep][0]
         else:
             self.selected_set_id = None
 
@@ -359,6 +415,7 @@ class BibliographyApp(tk.Tk):
         self.selected_set_id = next((s[0] for s in self._sets_cache if s[1] == name), None)
 
     def create_set(self):
+        from tkinter import simpledialog
         name = simpledialog.askstring("Create set", "Set name:")
         if not name: return
         try:
@@ -390,30 +447,68 @@ class BibliographyApp(tk.Tk):
         if not self.selected_set_id:
             messagebox.showwarning("Remove from set", "Select a set first"); return
         self.refsets.remove_entry(self.selected_set_id, self.selected_entry_id)
-        self.refresh_entries()
+        self._poll_changes()
         messagebox.showinfo("Removed", "Entry removed from set")
 
     def show_entries_in_set(self):
         if not self.selected_set_id:
             messagebox.showwarning("Show set", "Select a set first"); return
-        rows = self.refsets.list_entries(self.selected_set_id)
-        self._populate_entries(rows)
+        self._show_query("id IN (SELECT entry_id FROM set_entries WHERE set_id = ?)", (self.selected_set_id,))
+
+    def add_results_to_set(self):
+        if not self.selected_set_id:
+            messagebox.showwarning("Add to set", "Select a set first"); return
+        try:
+            n = self.refsets.add_search_results(self.selected_set_id, *self._current_filter)
+            messagebox.showinfo("Added", f"{n} entries added to set")
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+
+    def open_combine_sets(self):
+        names = [s[1] for s in getattr(self, "_sets_cache", [])]
+        if len(names) < 2:
+            messagebox.showwarning("Combine sets", "Create at least two sets first"); return
+        dlg = tk.Toplevel(self); dlg.title("Combine sets"); dlg.transient(self); dlg.grab_set()
+        frm = ttk.Frame(dlg, padding=8); frm.pack(fill="both", expand=True)
+        left = ttk.Combobox(frm, state="readonly", values=names); left.current(0); left.pack(fill="x", pady=2)
+        op = ttk.Combobox(frm, state="readonly", values=["union", "intersection", "difference"]); op.current(0); op.pack(fill="x", pady=2)
+        right = ttk.Combobox(frm, state="readonly", values=names); right.current(1); right.pack(fill="x", pady=2)
+        ttk.Label(frm, text="New set name:").pack(anchor="w", pady=(6,0))
+        name_var = tk.StringVar(); ttk.Entry(frm, textvariable=name_var).pack(fill="x")
+
+        def run_combine():
+            ids = {s[1]: s[0] for s in self._sets_cache}
+            name = name_var.get().strip()
+            if not name:
+                messagebox.showwarning("Combine sets", "Enter a name for the new set", parent=dlg); return
+            try:
+                combine = getattr(self.refsets, op.get())
+                sid, n = combine(ids[left.get()], ids[right.get()], name)
+            except Exception as e:
+                messagebox.showerror("Error", str(e), parent=dlg); return
+            dlg.destroy()
+            messagebox.showinfo("Combined", f"Created set {name} (id {sid}) with {n} entries")
+            self.refresh_sets()
+
+        btns = ttk.Frame(frm); btns.pack(fill="x", pady=10)
+        ttk.Button(btns, text="Create", command=run_combine).pack(side="left")
+        ttk.Button(btns, text="Cancel", command=dlg.destroy).pack(side="left", padx=6)
 
     def export_set_bibtex(self):
         if not self.selected_set_id:
             messagebox.showwarning("Export", "Select a set first"); return
-        rows = self.refsets.list_entries(self.selected_set_id)
-        if not rows:
+        set_id = self.selected_set_id
+        self._submit("export", lambda q, sid: q.refsets.count_entries(sid), lambda n: self._export_set_to_file(set_id, n), set_id)
+
+    def _export_set_to_file(self, set_id, count):
+        if not count:
             messagebox.showinfo("Export", "Set is empty"); return
+        from tkinter import filedialog
+        from src.features.bibtex.export import export_set_to_path
         path = filedialog.asksaveasfilename(defaultextension=".bib", filetypes=[("BibTeX files","*.bib")], title="Save BibTeX file")
         if not path: return
-        with open(path, "w", encoding="utf-8") as f:
-            for r in rows:
-                eid = r[0]
-                entry = self.entries.get(eid)
-                bib = entry_to_bibtex(entry)
-                f.write(bib + "\n\n")
-        messagebox.showinfo("Exported", f"BibTeX exported to {path}")
+        self._submit("export", lambda q, sid, p: export_set_to_path(q.db, sid, p),
+                     lambda _: messagebox.showinfo("Exported", f"BibTeX exported to {path}"), set_id, path)
 
     def on_close(self):
-        self.db.close(); self.destroy()
+        self.queries.shutdown(); self.db.close(); self.destroy()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Add the repository root so `src.` imports resolve
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..')))
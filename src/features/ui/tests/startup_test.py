@@ -0,0 +1,68 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.features.database.db import BibliographyDB
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../.."))
+LIBRARY_SIZE = 100_000
+# Seconds from interpreter start (imports included) on a 100k-entry library.
+FIRST_PAINT_BUDGET = 1.5
+INTERACTIVE_BUDGET = 3.0
+
+# Runs in a fresh interpreter so import time is part of the measurement.
+STARTUP_SCRIPT = """
+import json, sys, time
+t0 = time.perf_counter()
+import tkinter
+try:
+    from src.features.ui.main_window import BibliographyApp
+    app = BibliographyApp(sys.argv[1])
+except tkinter.TclError as exc:
+    print(json.dumps({"skip": str(exc)})); sys.exit(0)
+offset = app._started - t0
+deadline = time.perf_counter() + 30
+while "interactive" not in app.startup_times and time.perf_counter() < deadline:
+    app.update(); time.sleep(0.002)
+times = {k: v + offset for k, v in app.startup_times.items()}
+times["rows"] = len(app.entries_tree.get_children())
+app.on_close()
+print(json.dumps(times))
+"""
+
+def _needs_display():
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        pytest.skip("no display for Tk")
+    pytest.importorskip("tkinter")
+
+@pytest.fixture(scope="module")
+def library(tmp_path_factory):
+    _needs_display()
+    path = str(tmp_path_factory.mktemp("startup") / "library.db")
+    db = BibliographyDB(path, profile="bulk")
+    db.conn.execute(f"""
+        INSERT INTO entries (authors, title, venue, year, publication_date, tags, created_at)
+        WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < {LIBRARY_SIZE})
+        SELECT 'Author ' || (i % 997), 'Title ' || i, 'Venue ' || (i % 50), 2000 + i % 25,
+               printf('%04d-%02d', 2000 + i % 25, 1 + i % 12), 'ml', printf('2024-01-01T00:00:00.%06d', i)
+        FROM n
+    """)
+    db.conn.commit()
+    db.close()
+    return path
+
+# Startup tests
+def test_startup_within_budget(library):
+    result = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT, library], cwd=ROOT,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    times = json.loads(result.stdout.strip().splitlines()[-1])
+    if "skip" in times:
+        pytest.skip(times["skip"])
+    assert times["first_paint"] < FIRST_PAINT_BUDGET
+    assert times["interactive"] < INTERACTIVE_BUDGET
+    # Only the first page is loaded up front, never the whole library.
+    assert 0 < times["rows"] < LIBRARY_SIZE
@@ -0,0 +1,229 @@
+from __future__ import annotations
+from collections import OrderedDict
+from tkinter import ttk
+from typing import Any, Callable, Sequence
+
+BLOCK_SIZE = 200
+MAX_BLOCKS = 50          # row blocks kept in memory (~10k rows)
+BUFFER_ROWS = 20         # rows fetched ahead of / behind the visible window
+WHEEL_ROWS = 3
+PLACEHOLDER = "…"
+
+class EntryListModel:
+    """Rows for VirtualTreeview: an ordered id snapshot plus an LRU of row blocks fetched on demand.
+
+    ``submit(channel, fn, on_done, *args)`` runs ``fn(services, *args)`` on the query thread and
+    calls ``on_done`` with its result on the Tk thread (BibliographyApp._submit).
+    """
+
+    def __init__(self, submit: Callable[..., Any], on_change: Callable[[bool], None]):
+        self._submit = submit
+        self._on_change = on_change
+        self.ids: list[int] = []
+        self._positions: dict[int, int] | None = None   # id -> index in ids, built on first index()
+        self._blocks: OrderedDict[int, dict] = OrderedDict()
+        self._inflight: int | None = None
+        self._generation = 0
+        self.loading = False
+
+    def load(self, fetch_ids: Callable[[Any], list[int]], reset: bool = True):
+        # fetch_ids(services) -> ordered entry ids, run on the query thread.
+        self._generation += 1
+        generation = self._generation
+        self.loading = True
+
+        def done(ids):
+            if generation != self._generation: return
+            self.ids = ids; self._positions = None; self._blocks.clear(); self._inflight = None; self.loading = False
+            self._on_change(reset)
+
+        def failed(_):
+            if generation == self._generation: self.loading = False
+
+        self._submit("entries", fetch_ids, done, on_error=failed)
+
+    def refresh(self, entry_ids: set[int]):
+        """Drop the loaded blocks holding any of ``entry_ids`` (edited elsewhere); the next render re-fetches them."""
+        for b in [b for b, block in self._blocks.items() if not entry_ids.isdisjoint(block)]:
+            del self._blocks[b]
+        # A block still in flight may have been read before the edit.
+        self._inflight = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def index(self, entry_id: int) -> int | None:
+        # Called on every arrow key; one O(n) pass per snapshot instead of one per call.
+        if self._positions is None:
+            self._positions = {eid: i for i, eid in enumerate(self.ids)}
+        return self._positions.get(entry_id)
+
+    def row(self, i: int):
+        block = self._blocks.get(i // BLOCK_SIZE)
+        if block is None:
+            return None
+        eid = self.ids[i]
+        # An id missing from a loaded block was deleted after the snapshot was taken.
+        return block.get(eid) or (eid, "", "", "", "", "", "", "")
+
+    def ensure(self, start: int, stop: int) -> bool:
+        """Fetch the first missing block in [start, stop); True once all of it is loaded."""
+        for b in range(start // BLOCK_SIZE, (max(stop, start + 1) - 1) // BLOCK_SIZE + 1):
+            if b in self._blocks:
+                self._blocks.move_to_end(b)
+                continue
+            if b != self._inflight:
+                self._fetch(b)
+            return False
+        return True
+
+    def _fetch(self, b: int):
+        generation, ids = self._generation, self.ids[b * BLOCK_SIZE:(b + 1) * BLOCK_SIZE]
+        self._inflight = b
+
+        def done(rows):
+            if generation != self._generation or self._inflight != b: return
+            self._blocks[b] = {row[0]: row for row in rows}
+            while len(self._blocks) > MAX_BLOCKS:
+                self._blocks.popitem(last=False)
+            self._inflight = None
+            self._on_change(False)
+
+        self._submit("entry-rows", lambda q, chunk: q.entries.list_by_ids(chunk), done, ids)
+
+class VirtualTreeview(ttk.Frame):
+    """Treeview that only holds the rows on screen; scrolling and sorting go through EntryListModel.
+
+    ``columns`` are (entries column, width, heading) triples. Clicking a heading sets ``sort`` to
+    (column, descending) and calls ``on_sort()``; ``on_select(entry_id)`` fires when the user picks
+    a different row; ``on_ready()`` fires once per load when the first screen of rows is shown.
+    """
+
+    def __init__(self, master, columns: Sequence[tuple[str, int, str]], submit: Callable[..., Any],
+                 on_select: Callable[[int], None] | None = None, on_sort: Callable[[], None] | None = None,
+                 on_ready: Callable[[], None] | None = None):
+        super().__init__(master)
+        self.columns = list(columns)
+        self.on_select, self.on_sort, self.on_ready = on_select, on_sort, on_ready
+        self.model = EntryListModel(submit, self._on_model_change)
+        self.sort: tuple[str, bool] | None = None
+        self.selected_id: int | None = None
+        self.top = 0
+        self._ready_sent = True
+
+        self.tree = ttk.Treeview(self, columns=[c for c, _, _ in self.columns], show="headings", selectmode="browse")
+        for col, width, header in self.columns:
+            self.tree.heading(col, text=header, command=lambda c=col: self._sort_clicked(c))
+            self.tree.column(col, width=width, anchor="w")
+        self.scroll = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scroll.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self.tree.bind("<Configure>", lambda e: self.render())
+        self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll_by(-WHEEL_ROWS if e.delta > 0 else WHEEL_ROWS))
+        self.tree.bind("<Button-4>", lambda e: self.scroll_by(-WHEEL_ROWS))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_by(WHEEL_ROWS))
+        for key, step in (("<Up>", -1), ("<Down>", 1), ("<Prior>", "-page"), ("<Next>", "page"),
+                          ("<Home>", "home"), ("<End>", "end")):
+            self.tree.bind(key, lambda e, s=step: self._move_selection(s))
+
+    # -- data ------------------------------------------------------------------------------
+    def load(self, fetch_ids: Callable[[Any], list[int]], keep_position: bool = False):
+        if not keep_position:
+            self.top = 0; self._ready_sent = False
+        self.model.load(fetch_ids, reset=not keep_position)
+
+    def refresh_rows(self, entry_ids: set[int]):
+        self.model.refresh(entry_ids)
+        self.render()
+
+    def clear_sort(self):
+        self.sort = None
+        self._update_headings()
+
+    def _on_model_change(self, reset: bool):
+        if reset: self.top = 0
+        self.render()
+
+    # -- rendering -------------------------------------------------------------------------
+    def visible_rows(self) -> int:
+        children = self.tree.get_children()
+        bbox = self.tree.bbox(children[0]) if children else ""
+        if not bbox:
+            return max(1, int(self.tree.cget("height")))
+        _, y0, _, row_h = bbox
+        return max(1, (self.tree.winfo_height() - y0) // max(row_h, 1))
+
+    def render(self):
+        total, n = len(self.model), self.visible_rows()
+        self.top = max(0, min(self.top, total - n))
+        stop = min(total, self.top + n)
+        self.model.ensure(max(0, self.top - BUFFER_ROWS), min(total, stop + BUFFER_ROWS))
+        self.tree.delete(*self.tree.get_children())
+        shown = 0
+        for i in range(self.top, stop):
+            row = self.model.row(i)
+            if row is None:
+                self.tree.insert("", "end", iid=f"pending-{i}", values=(PLACEHOLDER,))
+                continue
+            shown += 1
+            self.tree.insert("", "end", iid=str(row[0]), values=["" if v is None else v for v in row[1:]])
+        if self.selected_id is not None and self.tree.exists(str(self.selected_id)):
+            self.tree.selection_set(str(self.selected_id))
+        self.scroll.set(*((self.top / total, stop / total) if total else (0.0, 1.0)))
+        if not self._ready_sent and not self.model.loading and shown == stop - self.top:
+            self._ready_sent = True
+            if self.on_ready: self.on_ready()
+
+    # -- scrolling -------------------------------------------------------------------------
+    def scroll_to(self, index: int):
+        self.top = index; self.render()
+
+    def scroll_by(self, rows: int):
+        self.scroll_to(self.top + rows)
+        return "break"
+
+    def _on_scrollbar(self, action, value, unit=None):
+        n = self.visible_rows()
+        if action == "moveto":
+            self.scroll_to(int(float(value) * len(self.model)))
+        elif action == "scroll":
+            self.scroll_by(int(value) * (n if unit == "pages" else 1))
+
+    def _move_selection(self, step):
+        total, n = len(self.model), self.visible_rows()
+        if not total: return "break"
+        current = self.model.index(self.selected_id) if self.selected_id is not None else None
+        current = self.top if current is None else current
+        target = {"home": 0, "end": total - 1, "page": current + n, "-page": current - n}.get(step)
+        target = max(0, min(total - 1, current + step if target is None else target))
+        if target < self.top: self.top = target
+        elif target >= self.top + n: self.top = target - n + 1
+        self.render()
+        row = self.model.row(target)
+        if row is not None: self._select(row[0])
+        return "break"
+
+    # -- selection / sorting ---------------------------------------------------------------
+    def _on_tree_select(self, _):
+        # Re-rendering re-selects the same row and clears it when scrolled away; only real changes count.
+        sel = self.tree.selection()
+        if sel and sel[0].isdigit() and int(sel[0]) != self.selected_id:
+            self._select(int(sel[0]))
+
+    def _select(self, entry_id: int):
+        self.selected_id = entry_id
+        if self.tree.exists(str(entry_id)): self.tree.selection_set(str(entry_id))
+        if self.on_select: self.on_select(entry_id)
+
+    def _sort_clicked(self, column: str):
+        descending = bool(self.sort and self.sort[0] == column and not self.sort[1])
+        self.sort = (column, descending)
+        self._update_headings()
+        if self.on_sort: self.on_sort()
+
+    def _update_headings(self):
+        for col, _, header in self.columns:
+            arrow = "" if not self.sort or self.sort[0] != col else (" ▼" if self.sort[1] else " ▲")
+            self.tree.heading(col, text=header + arrow)
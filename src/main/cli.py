@@ -0,0 +1,201 @@
+"""Headless command line for scripted bulk work (``bibapp-cli``); never imports tkinter.
+
+    bibapp-cli --db lib.db import refs.bib
+    bibapp-cli --db lib.db search "tag:ml" --format jsonl
+    bibapp-cli --db lib.db export "My set" -o my_set.bib
+    bibapp-cli --db lib.db dedupe --merge
+    bibapp-cli --db lib.db dedupe --near
+    bibapp-cli --db lib.db stats
+    bibapp-cli --db lib.db changes --since 1200 --format jsonl
+"""
+from __future__ import annotations
+import argparse
+import json
+import sys
+from typing import Iterable, Sequence, TextIO
+
+from src.features.bibtex.export import export_set, export_set_to_path, resolve_set_id
+from src.features.bibtex.parser import import_bibtex
+from src.features.database.db import DB_FILE, BibliographyDB
+from src.features.database.operation import changelog_ops, entry_ops
+from src.features.entries_services.entries_service import EntriesService
+from src.features.refsets_services.refsets_service import RefsetsService
+from src.features.search import SearchService
+
+ENTRY_COLUMNS = ("id", "authors", "title", "venue", "year", "publication_date", "tags", "created_at")
+FETCH_CHUNK = 500
+
+class RowWriter:
+    """Streams rows to a text stream as TSV (with a header line) or JSON lines."""
+
+    def __init__(self, out: TextIO, fmt: str, columns: Sequence[str]):
+        self.out, self.fmt, self.columns = out, fmt, tuple(columns)
+        if fmt == "tsv":
+            out.write("\t".join(self.columns) + "\n")
+
+    def write(self, row: Sequence):
+        if self.fmt == "jsonl":
+            self.out.write(json.dumps(dict(zip(self.columns, row)), ensure_ascii=False) + "\n")
+        else:
+            self.out.write("\t".join(_tsv_cell(v) for v in row) + "\n")
+
+    def write_all(self, rows: Iterable[Sequence]) -> int:
+        n = 0
+        for row in rows:
+            self.write(row)
+            n += 1
+        return n
+
+def _tsv_cell(value) -> str:
+    if value is None:
+        return ""
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+def cmd_import(args, db: BibliographyDB, out: TextIO) -> int:
+    writer = RowWriter(out, args.format, ("file", "record", "status", "result"))
+    totals: dict[str, int] = {}
+    for path in args.files:
+        f = sys.stdin if path == "-" else open(path, encoding="utf-8")
+        try:
+            results = import_bibtex(db, f, args.chunk_size)
+        finally:
+            if f is not sys.stdin:
+                f.close()
+        for i, (status, result) in enumerate(results, 1):
+            totals[status] = totals.get(status, 0) + 1
+            if status != "inserted" or not args.quiet:
+                writer.write((path, i, status, result))
+    print(", ".join(f"{n} {status}" for status, n in sorted(totals.items())) or "nothing imported", file=sys.stderr)
+    return 1 if totals.get("invalid") and args.strict else 0
+
+def cmd_export(args, db: BibliographyDB, out: TextIO) -> int:
+    set_id = resolve_set_id(db, args.set)
+    if set_id is None:
+        print(f"unknown reference set: {args.set}", file=sys.stderr)
+        return 2
+    count = export_set_to_path(db, set_id, args.output) if args.output else export_set(db, set_id, out)
+    print(f"exported {count} entries", file=sys.stderr)
+    return 0
+
+def cmd_search(args, db: BibliographyDB, out: TextIO) -> int:
+    ids = SearchService(db).ids(" ".join(args.query))
+    ids = ids[:args.limit] if args.limit is not None else ids
+    writer = RowWriter(out, args.format, ENTRY_COLUMNS)
+    for i in range(0, len(ids), FETCH_CHUNK):
+        writer.write_all(entry_ops.list_entries_by_ids(db, ids[i:i + FETCH_CHUNK]))
+    print(f"{len(ids)} matches", file=sys.stderr)
+    return 0
+
+def cmd_dedupe(args, db: BibliographyDB, out: TextIO) -> int:
+    if args.near:
+        return _near_duplicates(args, db, out)
+    entries = EntriesService(db)
+    groups = entries.duplicate_groups()
+    writer = RowWriter(out, args.format, ("group", "keep") + ENTRY_COLUMNS)
+    for n, ids in enumerate(groups, 1):
+        # The oldest row (lowest id) is the one kept when merging.
+        writer.write_all((n, row[0] == ids[0]) + tuple(row) for row in entry_ops.list_entries_by_ids(db, ids))
+    if args.merge and groups:
+        with entries.transaction():
+            for ids in groups:
+                entries.merge(ids[0], ids[1:])
+    removed = sum(len(ids) - 1 for ids in groups)
+    print(f"{len(groups)} duplicate groups, {removed} {'removed' if args.merge else 'redundant'} entries", file=sys.stderr)
+    return 0
+
+def _near_duplicates(args, db: BibliographyDB, out: TextIO) -> int:
+    from src.features.dedupe import DedupeService
+    if args.merge:
+        print("--merge only applies to exact duplicates; review near duplicates first", file=sys.stderr)
+        return 2
+    clusters = DedupeService(db, threshold=args.threshold).scan()
+    writer = RowWriter(out, args.format, ("group", "score") + ENTRY_COLUMNS)
+    for n, cluster in enumerate(clusters, 1):
+        writer.write_all((n, cluster.score) + tuple(row) for row in entry_ops.list_entries_by_ids(db, cluster.entry_ids))
+    print(f"{len(clusters)} near-duplicate groups", file=sys.stderr)
+    return 0
+
+def cmd_stats(args, db: BibliographyDB, out: TextIO) -> int:
+    entries, refsets = EntriesService(db), RefsetsService(db)
+    sets = refsets.list()
+    tags = entries.tag_counts()
+    writer = RowWriter(out, args.format, ("metric", "key", "value"))
+    writer.write(("entries", "", entries.count()))
+    writer.write(("sets", "", len(sets)))
+    writer.write(("tags", "", len(tags)))
+    writer.write_all(("year", "" if year is None else year, n) for year, n in entries.year_counts())
+    writer.write_all(("tag", tag, n) for tag, n in tags[:args.top])
+    writer.write_all(("set", s[1], refsets.count_entries(s[0])) for s in sets)
+    return 0
+
+def cmd_changes(args, db: BibliographyDB, out: TextIO) -> int:
+    if args.prune is not None or args.compact:
+        removed = changelog_ops.prune_changes(db, args.prune) if args.prune is not None else 0
+        removed += changelog_ops.compact_changes(db) if args.compact else 0
+        print(f"{removed} changelog events removed", file=sys.stderr)
+        return 0
+    try:
+        changes = changelog_ops.changes_since(db, args.since, args.limit)
+    except changelog_ops.ChangesPruned as e:
+        print(f"{e}; export the library again instead", file=sys.stderr)
+        return 3
+    RowWriter(out, args.format, changelog_ops.Change._fields).write_all(changes)
+    # A mirror passes this back as --since next time.
+    print(f"{len(changes)} changes, next --since {changes[-1].seq if changes else args.since}", file=sys.stderr)
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="bibapp-cli", description="Bibliography Manager without the GUI.")
+    parser.add_argument("--db", default=DB_FILE, help=f"SQLite database file (default: {DB_FILE})")
+    parser.add_argument("--profile", help="connection tuning profile (safe, balanced, bulk)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add(name: str, fn, help: str, rows: bool = True) -> argparse.ArgumentParser:
+        p = sub.add_parser(name, help=help)
+        p.set_defaults(func=fn)
+        if rows:
+            p.add_argument("--format", choices=("tsv", "jsonl"), default="tsv", help="output format (default: tsv)")
+        return p
+
+    p = add("import", cmd_import, "import BibTeX files ('-' reads stdin)")
+    p.add_argument("files", nargs="+")
+    p.add_argument("--chunk-size", type=int, default=1000)
+    p.add_argument("-q", "--quiet", action="store_true", help="only list duplicates and invalid records")
+    p.add_argument("--strict", action="store_true", help="exit with status 1 if any record was invalid")
+
+    p = add("export", cmd_export, "write a reference set as BibTeX", rows=False)
+    p.add_argument("set", help="reference set name or id")
+    p.add_argument("-o", "--output", help="output .bib file (default: stdout)")
+
+    p = add("search", cmd_search, "search with the quick-search syntax (tag:, author:, created:, pub:, YYYY, text)")
+    p.add_argument("query", nargs="+")
+    p.add_argument("--limit", type=int)
+
+    p = add("dedupe", cmd_dedupe, "list entries with the same title, authors and publication date")
+    p.add_argument("--merge", action="store_true", help="keep the oldest of each group, moving set memberships to it")
+    p.add_argument("--near", action="store_true", help="list similar titles/authors (MinHash) instead of exact matches")
+    p.add_argument("--threshold", type=float, default=0.8, help="title similarity for --near, 0-1 (default: 0.8)")
+
+    p = add("stats", cmd_stats, "library counts per year, tag and set")
+    p.add_argument("--top", type=int, default=20, help="number of tags to list (default: 20)")
+
+    p = add("changes", cmd_changes, "inserts, updates and deletes after a changelog sequence number")
+    p.add_argument("--since", type=int, default=0, help="last sequence number already applied (default: 0)")
+    p.add_argument("--limit", type=int)
+    p.add_argument("--compact", action="store_true", help="keep only the newest event per row instead of listing")
+    p.add_argument("--prune", type=int, metavar="SEQ", help="drop every event up to SEQ instead of listing")
+    return parser
+
+def main(argv: list[str] | None = None, out: TextIO | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    db = BibliographyDB(args.db, args.profile)
+    try:
+        return args.func(args, db, out or sys.stdout)
+    except BrokenPipeError:
+        # e.g. `bibapp-cli search ... | head`
+        return 0
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
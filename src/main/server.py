@@ -0,0 +1,417 @@
+"""Local HTTP/JSON API over the services (``bibapp-server``); stdlib asyncio only, never imports tkinter.
+
+    bibapp-server --db lib.db --port 8765
+
+    GET /entries?offset=0&limit=200&sort=title&desc=1   page of entries (sort: any list column)
+    GET /entries/<id>                                   one full entry, with the sets it belongs to
+    GET /search?q=tag:ml+graph&offset=0&limit=200       quick-search syntax, ranked like the GUI
+    GET /sets                                           reference sets
+    GET /sets/<id or name>/entries?offset=&limit=       members of a set, newest first
+    GET /sets/<id or name>/export.bib                   the set as BibTeX, streamed in chunks
+    GET /changes?since=1200&limit=1000                  changelog events after a sequence number (410 once pruned)
+    GET /metrics                                        request counts and latency percentiles per route
+
+Queries run on a thread pool sized to the database's reader pool, so the event loop only parses
+requests and writes responses. Connections are kept alive (HTTP/1.1) and bodies of unknown length
+use chunked transfer encoding. Request bodies are never read: a request that has one (or is not a
+GET) is answered and its connection closed.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import re
+import statistics
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Any, AsyncIterator, Callable, Iterator
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from src.features.bibtex.export import iter_bibtex_chunks
+from src.features.database.db import DB_FILE, BibliographyDB
+from src.features.database.operation import changelog_ops
+from src.features.database.pool import DEFAULT_READERS
+from src.features.entries_services.entries_service import EntriesService
+from src.features.refsets_services.refsets_service import RefsetsService
+from src.features.search import SearchService
+
+DEFAULT_PORT = 8765
+PAGE_SIZE = 200
+MAX_PAGE_SIZE = 1000
+EXPORT_CHUNK = 200
+STREAM_BUFFER = 4          # chunks a streaming producer may run ahead of the socket
+STREAM_WRITE_TIMEOUT = 30.0  # seconds a streamed chunk may wait for the client before the stream is cut
+LATENCY_WINDOW = 2048      # recent requests kept per route for percentiles
+MAX_HEADER_LINES = 100
+KEEP_ALIVE_TIMEOUT = 30.0
+
+SET_MEMBERS = "id IN (SELECT entry_id FROM set_entries WHERE set_id = ?)"
+# What the API shows of an entry: pages list the same columns as `bibapp-cli`, /entries/<id> all of them.
+LIST_FIELDS = ("id", "authors", "title", "venue", "year", "publication_date", "tags", "created_at")
+ENTRY_FIELDS = LIST_FIELDS + ("volume", "number", "pages", "doi", "url", "citation_key")
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+class Response:
+    """A JSON document, or ``chunks`` (an async iterator of bytes) sent with chunked encoding."""
+
+    def __init__(self, body: Any = None, status: int = 200, content_type: str = "application/json",
+                 chunks: AsyncIterator[bytes] | None = None):
+        self.status, self.content_type, self.chunks = status, content_type, chunks
+        self.body = b"" if chunks is not None else json.dumps(body, ensure_ascii=False).encode()
+
+class RouteStats:
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.statuses: dict[int, int] = {}
+        self.latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+class Metrics:
+    """Per-route request counts, status codes and latency (request line to last byte written)."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.routes: dict[str, RouteStats] = {}
+        self.in_flight = 0
+
+    def record(self, route: str, status: int, seconds: float):
+        stats = self.routes.setdefault(route, RouteStats())
+        stats.count += 1
+        stats.errors += status >= 500
+        stats.statuses[status] = stats.statuses.get(status, 0) + 1
+        stats.latencies.append(seconds * 1000)
+
+    def snapshot(self) -> dict:
+        routes = {}
+        for route, stats in sorted(self.routes.items()):
+            ordered = sorted(stats.latencies)
+            routes[route] = {
+                "count": stats.count, "errors": stats.errors,
+                "statuses": {str(code): n for code, n in sorted(stats.statuses.items())},
+                "p50_ms": round(statistics.median(ordered), 3),
+                "p95_ms": round(_percentile(ordered, 0.95), 3),
+                "p99_ms": round(_percentile(ordered, 0.99), 3),
+                "max_ms": round(ordered[-1], 3),
+            }
+        return {"uptime_s": round(time.time() - self.started, 1), "in_flight": self.in_flight, "routes": routes}
+
+def _percentile(ordered: list[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+def _int_param(query: dict, name: str, default: int, maximum: int | None = None) -> int:
+    raw = query.get(name, [None])[0]
+    if raw is None or raw == "":
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        raise HttpError(400, f"{name} must be an integer") from None
+    if value < 0 or (maximum is not None and value > maximum):
+        raise HttpError(400, f"{name} must be between 0 and {maximum}" if maximum else f"{name} must not be negative")
+    return value
+
+def _fields(entry, names: tuple[str, ...]) -> dict:
+    return {name: entry[name] for name in names}
+
+def _page(rows: list, offset: int, limit: int) -> dict:
+    # Callers fetch limit + 1 rows; the extra one only says whether there is a next page.
+    return {"offset": offset, "next": offset + limit if len(rows) > limit else None,
+            "entries": [_fields(row, LIST_FIELDS) for row in rows[:limit]]}
+
+class ApiServer:
+    """Serves one BibliographyDB; ``await start()`` then ``await serve_forever()``, or ``close()``."""
+
+    def __init__(self, db: BibliographyDB, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                 workers: int | None = None):
+        self.db, self.host, self.port = db, host, port
+        self.entries, self.refsets, self.search = EntriesService(db), RefsetsService(db), SearchService(db)
+        # One worker per reader: a worker never waits for a connection another worker holds.
+        size = workers or (db.pool.size if db.pool else DEFAULT_READERS)
+        self.executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="bibapp-server")
+        # Streams hold a worker for as long as the client takes to read; leave one free for everything else.
+        self._streams = asyncio.Semaphore(max(size - 1, 1))
+        self.metrics = Metrics()
+        self._server: asyncio.Server | None = None
+        self._clients: set[asyncio.StreamWriter] = set()
+        self._routes: list[tuple[str, re.Pattern, Callable]] = [
+            ("list", re.compile(r"/entries"), self.list_entries),
+            ("get", re.compile(r"/entries/(\d+)"), self.get_entry),
+            ("search", re.compile(r"/search"), self.search_entries),
+            ("sets", re.compile(r"/sets"), self.list_sets),
+            ("set_entries", re.compile(r"/sets/([^/]+)/entries"), self.set_entries),
+            ("export", re.compile(r"/sets/([^/]+)/export\.bib"), self.export_set),
+            ("changes", re.compile(r"/changes"), self.list_changes),
+            ("metrics", re.compile(r"/metrics"), self.get_metrics),
+        ]
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            # Idle keep-alive connections would otherwise hold wait_closed() open.
+            for writer in list(self._clients):
+                writer.close()
+            await self._server.wait_closed()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def _run(self, fn: Callable, *args):
+        return asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    # Endpoints
+    async def list_entries(self, query: dict) -> Response:
+        offset = _int_param(query, "offset", 0)
+        limit = _int_param(query, "limit", PAGE_SIZE, MAX_PAGE_SIZE)
+        sort = query.get("sort", [None])[0]
+        desc = query.get("desc", ["0"])[0] not in ("0", "false", "")
+        try:
+            rows = await self._run(lambda: self.entries.list(limit=limit + 1, order_by=sort, descending=desc, offset=offset))
+        except ValueError as e:
+            raise HttpError(400, str(e)) from None
+        return Response(_page(rows, offset, limit))
+
+    async def get_entry(self, query: dict, entry_id: str) -> Response:
+        def fetch():
+            entry = self.entries.get(int(entry_id))
+            if entry is None:
+                return None
+            sets = self.refsets.sets_of_entry(entry.id)
+            return {**_fields(entry, ENTRY_FIELDS), "sets": [{"id": set_id, "name": name} for set_id, name in sets]}
+        entry = await self._run(fetch)
+        if entry is None:
+            raise HttpError(404, f"no entry {entry_id}")
+        return Response(entry)
+
+    async def search_entries(self, query: dict) -> Response:
+        text = query.get("q", [""])[0]
+        offset = _int_param(query, "offset", 0)
+        limit = _int_param(query, "limit", PAGE_SIZE, MAX_PAGE_SIZE)
+
+        def fetch():
+            total = self.search.count(text)
+            rows = self.search.search(text, limit + 1, offset)
+            return {"query": text, "total": total, **_page(rows, offset, limit)}
+        return Response(await self._run(fetch))
+
+    async def list_sets(self, query: dict) -> Response:
+        sets = await self._run(self.refsets.list)
+        return Response([{"id": i, "name": name, "created_at": created} for i, name, created in sets])
+
+    async def set_entries(self, query: dict, ref: str) -> Response:
+        offset = _int_param(query, "offset", 0)
+        limit = _int_param(query, "limit", PAGE_SIZE, MAX_PAGE_SIZE)
+
+        def fetch():
+            found = self._find_set(ref)
+            rows = self.entries.list(SET_MEMBERS, (found[0],), limit=limit + 1, offset=offset)
+            return {"set": {"id": found[0], "name": found[1]}, "total": self.refsets.count_entries(found[0]),
+                    **_page(rows, offset, limit)}
+        return Response(await self._run(fetch))
+
+    async def export_set(self, query: dict, ref: str) -> Response:
+        set_id = (await self._run(self._find_set, ref))[0]
+        chunks = self._stream(lambda db: (text.encode() for text, _ in iter_bibtex_chunks(db, set_id, EXPORT_CHUNK)))
+        return Response(status=200, content_type="application/x-bibtex; charset=utf-8", chunks=chunks)
+
+    async def list_changes(self, query: dict) -> Response:
+        since = _int_param(query, "since", 0)
+        limit = _int_param(query, "limit", MAX_PAGE_SIZE, MAX_PAGE_SIZE)
+
+        def fetch():
+            with self.db.read() as db:
+                return changelog_ops.changes_since(db, since, limit + 1)
+        try:
+            changes = await self._run(fetch)
+        except changelog_ops.ChangesPruned as e:
+            raise HttpError(410, str(e)) from None
+        more, changes = len(changes) > limit, changes[:limit]
+        # "next" is the since= of the following call; "more" says whether to make it right away.
+        return Response({"since": since, "next": changes[-1].seq if changes else since, "more": more,
+                         "changes": [change._asdict() for change in changes]})
+
+    async def get_metrics(self, query: dict) -> Response:
+        return Response(self.metrics.snapshot())
+
+    def _find_set(self, ref: str):
+        # Names win over ids, as in `bibapp-cli export`.
+        for row in self.refsets.list():
+            if row[1] == ref:
+                return row
+        found = self.refsets.get(int(ref)) if ref.isdigit() else None
+        if found is None:
+            raise HttpError(404, f"no reference set {ref}")
+        return found
+
+    async def _stream(self, produce: Callable[[Any], Iterator[bytes]]) -> AsyncIterator[bytes]:
+        """Run ``produce(db)`` on a worker holding one reader, handing its chunks to the loop.
+
+        The worker waits for the socket once STREAM_BUFFER chunks are queued, and stops early
+        when the client goes away or stops reading (see ``_write``). At most ``_streams`` run at once.
+        """
+        async with self._streams:
+            loop = asyncio.get_running_loop()
+            queue: asyncio.Queue = asyncio.Queue()
+            credit, stop, done = threading.Semaphore(STREAM_BUFFER), threading.Event(), object()
+
+            def worker():
+                try:
+                    with self.db.read() as db:
+                        for chunk in produce(db):
+                            credit.acquire()
+                            if stop.is_set():
+                                return
+                            loop.call_soon_threadsafe(queue.put_nowait, chunk)
+                    loop.call_soon_threadsafe(queue.put_nowait, done)
+                except Exception as e:
+                    if not stop.is_set():
+                        loop.call_soon_threadsafe(queue.put_nowait, e)
+
+            future = loop.run_in_executor(self.executor, worker)
+            try:
+                while (item := await queue.get()) is not done:
+                    if isinstance(item, Exception):
+                        raise item
+                    yield item
+                    credit.release()
+            finally:
+                stop.set()
+                credit.release()
+                await asyncio.shield(future)
+
+    # HTTP
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._clients.add(writer)
+        try:
+            while await self._serve_one(reader, writer):
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+
+    async def _serve_one(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        """Answer one request; False once the connection should close."""
+        line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE_TIMEOUT)
+        if not line:
+            return False
+        start = time.perf_counter()
+        self.metrics.in_flight += 1
+        route, status = "bad_request", 400
+        try:
+            method, target, version = line.decode("latin-1").split()
+            headers = {}
+            for _ in range(MAX_HEADER_LINES):
+                header = (await reader.readline()).decode("latin-1").strip()
+                if not header:
+                    break
+                name, _, value = header.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            else:
+                # The rest of the headers would be read as the next request.
+                raise HttpError(431, f"more than {MAX_HEADER_LINES} header lines")
+            connection = headers.get("connection", "").lower()
+            keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+            # An unread body would be parsed as the next request, so its connection ends with this one.
+            if method != "GET" or int(headers.get("content-length", "0")) or "transfer-encoding" in headers:
+                keep_alive = False
+            route, response = await self._dispatch(method, target)
+        except HttpError as e:
+            response, keep_alive = Response({"error": str(e)}, e.status), False
+        except ValueError:
+            response, keep_alive = Response({"error": "malformed request"}, 400), False
+        status = response.status
+        try:
+            await self._write(writer, response, keep_alive)
+        except ConnectionError:
+            # 499 (as nginx logs it): the client went away or the stream broke before the last byte.
+            keep_alive, status = False, 499 if status < 400 else status
+        finally:
+            self.metrics.in_flight -= 1
+            self.metrics.record(route, status, time.perf_counter() - start)
+        return keep_alive
+
+    async def _dispatch(self, method: str, target: str) -> tuple[str, Response]:
+        url = urlsplit(target)
+        path, query = unquote(url.path.rstrip("/") or "/"), parse_qs(url.query)
+        for route, pattern, handler in self._routes:
+            match = pattern.fullmatch(path)
+            if match is None:
+                continue
+            if method != "GET":
+                return route, Response({"error": "method not allowed"}, 405)
+            try:
+                return route, await handler(query, *match.groups())
+            except HttpError as e:
+                return route, Response({"error": str(e)}, e.status)
+            except Exception as e:  # reported to the client and counted as a 500
+                return route, Response({"error": f"{type(e).__name__}: {e}"}, 500)
+        return "not_found", Response({"error": f"no route for {path}"}, 404)
+
+    async def _write(self, writer: asyncio.StreamWriter, response: Response, keep_alive: bool):
+        head = [f"HTTP/1.1 {response.status} {HTTPStatus(response.status).phrase}",
+                f"Content-Type: {response.content_type}",
+                f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        if response.chunks is None:
+            head.append(f"Content-Length: {len(response.body)}")
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + response.body)
+            await writer.drain()
+            return
+        head.append("Transfer-Encoding: chunked")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode())
+        try:
+            async for chunk in response.chunks:
+                writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                # A client that stops reading would otherwise keep the stream's worker and reader forever.
+                await asyncio.wait_for(writer.drain(), STREAM_WRITE_TIMEOUT)
+        except ConnectionError:
+            raise
+        except Exception:
+            # Headers are out already; cutting the connection before the last chunk marks the body incomplete.
+            raise ConnectionError("stream aborted") from None
+        finally:
+            await response.chunks.aclose()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="bibapp-server", description="Serve a bibliography as a local JSON API.")
+    parser.add_argument("--db", default=DB_FILE, help=f"SQLite database file (default: {DB_FILE})")
+    parser.add_argument("--profile", help="connection tuning profile (safe, balanced, bulk)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"0 picks a free port (default: {DEFAULT_PORT})")
+    parser.add_argument("--readers", type=int, default=DEFAULT_READERS, help="pooled read-only connections, and query threads")
+    args = parser.parse_args(argv)
+
+    async def serve():
+        db = BibliographyDB(args.db, args.profile, readers=args.readers)
+        server = ApiServer(db, args.host, args.port, workers=max(args.readers, 1))
+        await server.start()
+        print(f"listening on http://{server.host}:{server.port}", flush=True)
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+            db.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
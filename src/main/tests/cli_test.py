@@ -0,0 +1,116 @@
+import io
+import json
+import subprocess
+import sys
+
+import pytest
+
+from src.features.database.db import BibliographyDB
+from src.features.refsets_services.refsets_service import RefsetsService
+from src.main import cli
+
+BIB = """
+@article{smith2021graph,
+  author = {Smith, A.}, title = {Graph Learning}, journal = {JMLR}, year = 2021, keywords = {ml, graphs}
+}
+@misc{jones2019kernel, author = {Jones, B.}, title = {Kernel Methods}, year = {2019}, keywords = {ml}}
+@misc{broken, title = {No Author}}
+"""
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "cli.db")
+
+def run(db_path, *argv):
+    out = io.StringIO()
+    code = cli.main(["--db", db_path, *argv], out=out)
+    return code, out.getvalue()
+
+def imported(db_path, tmp_path):
+    bib = tmp_path / "refs.bib"
+    bib.write_text(BIB, encoding="utf-8")
+    return run(db_path, "import", str(bib))
+
+# CLI tests
+def test_import_reports_each_record(db_path, tmp_path):
+    code, out = imported(db_path, tmp_path)
+    lines = out.splitlines()
+    assert code == 0
+    assert lines[0] == "file\trecord\tstatus\tresult"
+    assert [line.split("\t")[2] for line in lines[1:]] == ["inserted", "inserted", "invalid"]
+
+def test_search_streams_tsv_and_jsonl(db_path, tmp_path):
+    imported(db_path, tmp_path)
+    _, out = run(db_path, "search", "tag:ml")
+    assert len(out.splitlines()) == 3
+    _, out = run(db_path, "search", "--format", "jsonl", "graph", "learning")
+    rows = [json.loads(line) for line in out.splitlines()]
+    assert [r["title"] for r in rows] == ["Graph Learning"]
+    assert rows[0]["tags"] == "ml, graphs"
+
+def test_export_set(db_path, tmp_path):
+    imported(db_path, tmp_path)
+    db = BibliographyDB(db_path)
+    refsets = RefsetsService(db)
+    refsets.add_entries(refsets.create("Reading"), [1, 2])
+    db.close()
+    code, out = run(db_path, "export", "Reading")
+    assert code == 0
+    assert "@article{smith2021graph," in out and "@misc{jones2019kernel," in out
+    assert run(db_path, "export", "Missing")[0] == 2
+
+def test_dedupe_merges_legacy_duplicates(db_path, tmp_path):
+    imported(db_path, tmp_path)
+    db = BibliographyDB(db_path)
+    # A row that bypassed the duplicate check, as in databases created before it existed.
+    dup_id = db.conn.execute(
+        "INSERT INTO entries (authors, title, publication_date, created_at) VALUES ('smith, a.', 'graph learning ', '2021', '2020')").lastrowid
+    refsets = RefsetsService(db)
+    set_id = refsets.create("Reading")
+    refsets.add_entry(set_id, dup_id)
+    db.close()
+    _, out = run(db_path, "dedupe", "--format", "jsonl")
+    rows = [json.loads(line) for line in out.splitlines()]
+    assert [(r["group"], r["keep"], r["id"]) for r in rows] == [(1, True, 1), (1, False, dup_id)]
+    run(db_path, "dedupe", "--merge")
+    _, out = run(db_path, "dedupe")
+    assert len(out.splitlines()) == 1
+    db = BibliographyDB(db_path)
+    assert [r[0] for r in RefsetsService(db).list_entries(set_id)] == [1]
+    db.close()
+
+def test_stats(db_path, tmp_path):
+    imported(db_path, tmp_path)
+    _, out = run(db_path, "stats", "--format", "jsonl")
+    rows = [json.loads(line) for line in out.splitlines()]
+    metrics = {(r["metric"], r["key"]): r["value"] for r in rows}
+    assert metrics[("entries", "")] == 2
+    assert metrics[("year", 2019)] == 1 and metrics[("year", 2021)] == 1
+    assert metrics[("tag", "ml")] == 2
+
+def test_cli_never_imports_tkinter():
+    code = "import sys, src.main.cli; sys.exit('tkinter' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code], cwd=cli.__file__.rsplit("/src/", 1)[0]).returncode == 0
+
+def test_dedupe_near_lists_scored_groups(db_path, tmp_path):
+    imported(db_path, tmp_path)
+    db = BibliographyDB(db_path)
+    db.conn.execute("INSERT INTO entries (authors, title, created_at) VALUES ('A. Smith', 'Graph learning.', '2020')")
+    db.conn.commit()
+    db.close()
+    _, out = run(db_path, "dedupe", "--near", "--format", "jsonl")
+    rows = [json.loads(line) for line in out.splitlines()]
+    assert [(r["group"], r["title"]) for r in rows] == [(1, "Graph Learning"), (1, "Graph learning.")]
+    assert rows[0]["score"] == 1.0
+    assert run(db_path, "dedupe", "--near", "--merge")[0] == 2
+
+def test_changes_since_and_prune(db_path, tmp_path):
+    imported(db_path, tmp_path)
+    _, out = run(db_path, "changes", "--format", "jsonl")
+    rows = [json.loads(line) for line in out.splitlines()]
+    assert [(r["table"], r["op"]) for r in rows] == [("entries", "I"), ("entries", "I")]
+    last = rows[-1]["seq"]
+    _, out = run(db_path, "changes", "--since", str(last))
+    assert out.splitlines() == ["seq\ttable\top\trow_id\tentry_id"]
+    assert run(db_path, "changes", "--prune", str(last))[0] == 0
+    assert run(db_path, "changes", "--since", "0")[0] == 3
@@ -0,0 +1,134 @@
+import asyncio
+import http.client
+import json
+import threading
+
+import pytest
+
+from src.features.database.db import BibliographyDB
+from src.features.entries_services.entries_service import EntriesService
+from src.features.refsets_services.refsets_service import RefsetsService
+from src.main.server import ApiServer
+
+@pytest.fixture
+def library(tmp_path):
+    db = BibliographyDB(str(tmp_path / "server.db"))
+    entries = EntriesService(db)
+    ids = [entries.add(authors=f"Author {i}", title=f"Graph Learning {i}", venue="JMLR", tags="ml")
+           for i in range(30)]
+    ids.append(entries.add(authors="Jones, B.", title="Kernel Methods", tags="theory"))
+    refsets = RefsetsService(db)
+    set_id = refsets.create("Reading list")
+    refsets.add_entries(set_id, ids[:12])
+    yield db, ids, set_id
+    db.close()
+
+@pytest.fixture
+def server(library):
+    db = library[0]
+    loop = asyncio.new_event_loop()
+    api = ApiServer(db, port=0)
+    loop.run_until_complete(api.start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield api
+    asyncio.run_coroutine_threadsafe(api.close(), loop).result(10)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(10)
+    loop.close()
+
+def get(conn, path):
+    conn.request("GET", path)
+    response = conn.getresponse()
+    body = response.read()
+    return response, json.loads(body) if response.headers["Content-Type"] == "application/json" else body
+
+# HTTP API tests
+def test_list_pages_and_sorts(server, library):
+    conn = http.client.HTTPConnection("127.0.0.1", server.port)
+    response, page = get(conn, "/entries?limit=20")
+    assert response.status == 200 and len(page["entries"]) == 20 and page["next"] == 20
+    _, rest = get(conn, "/entries?offset=20&limit=20")
+    assert len(rest["entries"]) == 11 and rest["next"] is None
+    _, by_title = get(conn, "/entries?sort=title&desc=1&limit=1")
+    assert by_title["entries"][0]["title"] == "Kernel Methods"
+    response, error = get(conn, "/entries?sort=doi")
+    assert response.status == 400 and "doi" in error["error"]
+
+def test_get_entry_with_sets(server, library):
+    _, ids, set_id = library
+    conn = http.client.HTTPConnection("127.0.0.1", server.port)
+    _, entry = get(conn, f"/entries/{ids[0]}")
+    assert entry["title"] == "Graph Learning 0" and entry["venue"] == "JMLR" and "citation_key" in entry
+    assert entry["sets"] == [{"id": set_id, "name": "Reading list"}]
+    response, _ = get(conn, "/entries/99999")
+    assert response.status == 404
+
+def test_search_and_set_membership(server, library):
+    _, ids, set_id = library
+    conn = http.client.HTTPConnection("127.0.0.1", server.port)
+    _, found = get(conn, "/search?q=tag:theory")
+    assert found["total"] == 1 and found["entries"][0]["title"] == "Kernel Methods"
+    _, sets = get(conn, "/sets")
+    assert [s["name"] for s in sets] == ["Reading list"]
+    _, members = get(conn, "/sets/Reading%20list/entries?limit=5")
+    assert members["total"] == 12 and len(members["entries"]) == 5 and members["next"] == 5
+    _, by_id = get(conn, f"/sets/{set_id}/entries?offset=10")
+    assert {e["id"] for e in by_id["entries"]} <= set(ids[:12]) and len(by_id["entries"]) == 2
+    response, _ = get(conn, "/sets/Nope/entries")
+    assert response.status == 404
+
+def test_export_streams_bibtex_in_chunks(server, library, monkeypatch):
+    monkeypatch.setattr("src.main.server.EXPORT_CHUNK", 5)
+    conn = http.client.HTTPConnection("127.0.0.1", server.port)
+    response, body = get(conn, "/sets/Reading%20list/export.bib")
+    assert response.status == 200 and response.headers["Transfer-Encoding"] == "chunked"
+    assert body.decode().count("@") == 12 and "Graph Learning 0" in body.decode()
+    # The connection is reusable after a chunked body.
+    response, _ = get(conn, "/sets")
+    assert response.status == 200
+
+def test_metrics_and_errors(server, library):
+    conn = http.client.HTTPConnection("127.0.0.1", server.port)
+    get(conn, "/entries?limit=x")
+    get(conn, "/nowhere")
+    conn.request("POST", "/entries")
+    assert conn.getresponse().status == 405
+    conn = http.client.HTTPConnection("127.0.0.1", server.port)
+    for _ in range(3):
+        get(conn, "/search?q=graph")
+    _, metrics = get(conn, "/metrics")
+    routes = metrics["routes"]
+    assert routes["search"]["count"] == 3 and routes["search"]["p95_ms"] >= routes["search"]["p50_ms"] > 0
+    assert routes["list"]["statuses"] == {"400": 1, "405": 1} and routes["not_found"]["count"] == 1
+
+def test_requests_with_bodies_or_too_many_headers_close_the_connection(server, library, monkeypatch):
+    monkeypatch.setattr("src.main.server.MAX_HEADER_LINES", 5)
+    conn = http.client.HTTPConnection("127.0.0.1", server.port)
+    conn.request("POST", "/entries", body=b"GET /sets HTTP/1.1\r\n\r\n")
+    response = conn.getresponse()
+    assert response.status == 405 and response.headers["Connection"] == "close"
+    response.read()
+    conn = http.client.HTTPConnection("127.0.0.1", server.port)
+    conn.request("GET", "/sets", headers={f"X-Extra-{i}": "1" for i in range(8)})
+    response = conn.getresponse()
+    assert response.status == 431 and response.headers["Connection"] == "close"
+
+def test_entries_show_only_public_fields(server, library):
+    _, ids, _ = library
+    conn = http.client.HTTPConnection("127.0.0.1", server.port)
+    _, entry = get(conn, f"/entries/{ids[0]}")
+    _, page = get(conn, "/entries?limit=1")
+    assert "pub_sort" not in entry and "pub_sort" not in page["entries"][0]
+    assert set(page["entries"][0]) < set(entry)
+
+def test_changes_feed(server, library):
+    db, ids, _ = library
+    conn = http.client.HTTPConnection("127.0.0.1", server.port)
+    _, first = get(conn, "/changes?limit=10")
+    assert first["more"] and len(first["changes"]) == 10 and first["next"] == first["changes"][-1]["seq"]
+    _, rest = get(conn, f"/changes?since={first['next']}")
+    assert not rest["more"] and rest["changes"][-1]["table"] == "set_entries"
+    EntriesService(db).delete(ids[-1])
+    _, latest = get(conn, f"/changes?since={rest['next']}")
+    assert [(c["table"], c["op"], c["row_id"]) for c in latest["changes"]] == [("entries", "D", ids[-1])]